@@ -1,14 +1,35 @@
 # decky-ukr-badge/main.py
 
 import asyncio
+import cProfile
+import ctypes
+import ctypes.util
+import bisect
+import collections
+import contextvars
+import errno
+import hashlib
+import heapq
 import json
+import mmap
 import os
+import pstats
+import struct
+import sys
+import tempfile
 import urllib.parse
 import urllib.request
 import urllib.error
 import re
+import shutil
+import socket
 import time
-from typing import Dict, Any, TypedDict
+import threading
+import tracemalloc
+import zipfile
+import zlib
+from html import unescape
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Set, TypedDict, TypeVar
 
 import decky
 
@@ -25,6 +46,9 @@ class Settings(TypedDict):
     showOnStore: bool
     storeOffsetX: int
     storeOffsetY: int
+    targetLanguage: str
+    dataSaver: bool
+    dataSaverDailyMB: int
 
 
 DEFAULT_SETTINGS: Settings = {
@@ -35,17 +59,880 @@ DEFAULT_SETTINGS: Settings = {
     "showOnStore": True,
     "storeOffsetX": 0,
     "storeOffsetY": 20,
+    "targetLanguage": "ukrainian",
+    "dataSaver": False,
+    "dataSaverDailyMB": 20,
 }
 
-HTTP_TIMEOUT = 10
+HTTP_TIMEOUT = 10            # until a host has latency history; also the upper bound
+HTTP_BINARY_TIMEOUT = 30
 HTTP_USER_AGENT = "decky-ukr-badge/1.0"
 
+SEED_INDEX_FILE = "status_seed.bin"
+SEED_MAGIC = b"UKRSEED1"
+SEED_HEADER = struct.Struct("<8sII")     # magic, record count, string pool offset
+SEED_RECORD = struct.Struct("<IBxHI")    # appid, status, slug length, slug offset
+SEED_STATUSES = ("NONE", "OFFICIAL", "COMMUNITY")
+KULI_BASE_URL = "https://kuli.com.ua/"
+
+STEAM_APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+APP_INDEX_FILE = "steam_apps.bin"
+APP_INDEX_MAGIC = b"UKRAPPS1"
+APP_INDEX_HEADER = struct.Struct("<8sIId")     # magic, record count, string pool offset, built at
+APP_INDEX_RECORD = struct.Struct("<IIIHH")     # appid, key offset, name offset, key length, name length
+APP_INDEX_REFRESH_SECONDS = 7 * 24 * 3600
+APP_INDEX_RETRY_SECONDS = 600                # after a failed build; doubles per failure
+APP_INDEX_RETRY_MAX_SECONDS = 24 * 3600
+APP_INDEX_SCAN_LIMIT = 5000                  # keys looked at per prefix/fuzzy lookup
+APP_INDEX_SORT_RUN = 20000                   # apps sorted in memory at a time while building
+APP_LIST_READ_CHUNK = 256 * 1024
+
+STEAM_APPDETAILS_URL = "https://store.steampowered.com/api/appdetails?appids={app_id}&l=en"
+KULI_HEADERS = {
+    "Accept": "text/html",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+}
+KULI_MAX_MATCH_SCORE = 25
+# Translation detail fields and the kuli label fragments that name them.
+# Checked in order: "Дата оновлення перекладу" is a date, not an author.
+# Game pages also list the game's own version and release date, so bare
+# "Версія" / "Дата" labels are not enough.
+KULI_DETAIL_LABELS = (
+    ("version", ("версія перекладу", "версія українізатора", "версія локалізації", "translation version")),
+    ("updated", ("дата оновлення", "оновлено", "updated")),
+    ("install", ("встановлен", "інсталяц", "install")),
+    ("authors", ("автор", "перекла", "команда", "author")),
+)
+KULI_DETAIL_MAX_LENGTH = 200
+STATUS_CACHE_FILE = "status_cache.json"
+STATUS_FRESH_SECONDS = 24 * 3600
+# Lookups resolving at once; the rest queue and can still be cancelled for free
+STATUS_RESOLVE_CONCURRENCY = 4
+PREFETCH_HINT_BUDGET = 6          # speculative lookups per hint; the rest of the hint is ignored
+PREFETCH_HINT_MAX_AGE = 60        # seconds a hinted app may wait before it is dropped
+# Steam API language code and store display name. The position is the bit in
+# the cached language masks, so only ever append to this list.
+STEAM_LANGUAGES = (
+    ("english", "English"), ("french", "French"), ("italian", "Italian"), ("german", "German"),
+    ("spanish", "Spanish - Spain"), ("arabic", "Arabic"), ("bulgarian", "Bulgarian"),
+    ("schinese", "Simplified Chinese"), ("tchinese", "Traditional Chinese"), ("czech", "Czech"),
+    ("danish", "Danish"), ("dutch", "Dutch"), ("finnish", "Finnish"), ("greek", "Greek"),
+    ("hungarian", "Hungarian"), ("indonesian", "Indonesian"), ("japanese", "Japanese"), ("koreana", "Korean"),
+    ("norwegian", "Norwegian"), ("polish", "Polish"), ("portuguese", "Portuguese - Portugal"),
+    ("brazilian", "Portuguese - Brazil"), ("romanian", "Romanian"), ("russian", "Russian"),
+    ("latam", "Spanish - Latin America"), ("swedish", "Swedish"), ("thai", "Thai"), ("turkish", "Turkish"),
+    ("ukrainian", "Ukrainian"), ("vietnamese", "Vietnamese"),
+)
+
+GITHUB_RELEASES_API = "https://api.github.com/repos/yataktyni/decky-ukr-badge/releases"
+RELEASE_FEED_PAGE_SIZE = 10
+RELEASE_FEED_MAX_PAGES = 10
+RELEASE_ZIP_URL = "https://github.com/yataktyni/decky-ukr-badge/releases/latest/download/release.zip"
+RELEASE_CACHE_DIR = "release_cache"
+RELEASE_CACHE_MAX_BYTES = 25 * 1024 * 1024
+RELEASE_CACHE_FRESH_SECONDS = 15 * 60
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PREFETCH_RATE_LIMIT = 256 * 1024   # bytes/s for background update downloads
+PREFETCH_START_DELAY = 5
+UPDATE_CHECK_MAX_AGE = 6 * 3600   # bootstrap refreshes an older update check in the background
+
+HTTP_CACHE_DIR = "http_cache"
+HTTP_CACHE_MAX_BYTES = 20 * 1024 * 1024
+HTTP_CACHE_SAVE_EVERY = 20    # puts between index writes; also flushed every MEMORY_CHECK_INTERVAL
+# Seconds a response stays fresh, per host. Hosts not listed are never cached.
+HTTP_CACHE_TTL: Dict[str, int] = {
+    "store.steampowered.com": 6 * 3600,
+    "steamcommunity.com": 6 * 3600,
+    "kuli.com.ua": 24 * 3600,
+    "api.github.com": 10 * 60,
+    "github.com": 10 * 60,
+}
+
+CIRCUIT_FAILURE_THRESHOLD = 3     # consecutive failures before a host is skipped
+CIRCUIT_COOLDOWN_SECONDS = 30     # then one trial request is let through
+OFFLINE_FAILURE_THRESHOLD = 2     # connectivity errors (DNS, no route) before going offline
+HEALTH_PROBE_INTERVAL = 15
+HEALTH_PROBE_TIMEOUT = 3
+
+LATENCY_WINDOW = 64          # recent request durations kept per host
+LATENCY_MIN_SAMPLES = 8      # before timeouts and hedging adapt
+TIMEOUT_P95_FACTOR = 4       # adaptive timeout = p95 * factor, clamped
+HTTP_MIN_TIMEOUT = 2.0
+HTTP_HEDGING = True          # second request for idempotent GETs stuck past p95
+HEDGE_MIN_DELAY = 0.25
+
+MEMORY_BUDGET_BYTES = 8 * 1024 * 1024   # in-process caches, heap only
+MEMORY_CHECK_INTERVAL = 30
+MEMORY_PSI_SOME_AVG10 = 10.0     # % of the last 10 s some task stalled on memory
+MEMORY_MIN_AVAILABLE = 0.10      # MemAvailable / MemTotal
+MEMORY_PRESSURE_TRIM = 0.5       # share of each tier dropped under system pressure
+MEMORY_BUDGET_TRIM = 0.25        # step when only over our own budget
+
+LIBRARY_POLL_INTERVAL = 60        # seconds, only without inotify
+LIBRARY_RESCAN_INTERVAL = 600     # look for new library folders / Steam users
+LIBRARY_SETTLE_SECONDS = 2.0      # coalesce the burst of writes of one install
+LIBRARY_INOTIFY_MASK = 0x08 | 0x80 | 0x100 | 0x200   # CLOSE_WRITE, MOVED_TO, CREATE, DELETE
+
+DATA_USAGE_FILE = "data_usage.json"
+DATA_USAGE_KEEP_DAYS = 30
+DATA_USAGE_FLUSH_BYTES = 1024 * 1024   # persist counters after this much new traffic
+DATA_SAVER_DAILY_BYTES = 20 * 1024 * 1024
+
+LOG_RATE_WINDOW = 60.0       # seconds
+LOG_RATE_BURST = 5           # lines per message template per window
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+PROFILE_DEFAULT_SECONDS = 60
+PROFILE_MAX_SECONDS = 600
+PROFILE_TOP_N = 25
+
+T = TypeVar("T")
+
+
+# ============================================
+# Logging
+# ============================================
+
+class _LogWindow:
+    """Rate-limit state of one message template."""
+
+    __slots__ = ("start", "written", "suppressed")
+
+    def __init__(self, start: float, suppressed: int = 0):
+        self.start = start
+        self.written = 0
+        self.suppressed = suppressed
+
+
+class PluginLog:
+    """Lazy, rate-limited logging on top of decky.logger.
+
+    Messages take %-style args and keyword fields, and are only formatted
+    when the level is enabled and the line is actually written. Each message
+    template may be written `burst` times per `window` seconds; further
+    repeats are counted and reported on the next line that gets through.
+    `every=N` samples a hot path, writing one call in N.
+    """
+
+    LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+    def __init__(self, window: float = LOG_RATE_WINDOW, burst: int = LOG_RATE_BURST):
+        self.window = window
+        self.burst = burst
+        self._windows: Dict[str, _LogWindow] = {}
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _enabled(self, level: str) -> bool:
+        check = getattr(decky.logger, "isEnabledFor", None)
+        return check(self.LEVELS[level]) if callable(check) else True
+
+    def _admit(self, template: str, every: int) -> int | None:
+        """None to drop the line, else how many repeats were suppressed before it."""
+        now = time.monotonic()
+        with self._lock:
+            if every > 1:
+                calls = self._calls[template] = self._calls.get(template, 0) + 1
+                if (calls - 1) % every:
+                    return None
+            state = self._windows.get(template)
+            if state is None or now - state.start >= self.window:
+                state = self._windows[template] = _LogWindow(now, state.suppressed if state else 0)
+            if state.written >= self.burst:
+                state.suppressed += 1
+                return None
+            state.written += 1
+            suppressed, state.suppressed = state.suppressed, 0
+            return suppressed
+
+    def _write(self, level: str, template: str, args: tuple, fields: Dict[str, Any], every: int) -> None:
+        if not self._enabled(level):
+            return
+        suppressed = self._admit(template, every)
+        if suppressed is None:
+            return
+        method = getattr(decky.logger, level, None)
+        if method is None and level == "warning":
+            method = getattr(decky.logger, "warn", None)
+        if method is None:
+            return
+        text = template % args if args else template
+        if fields:
+            text += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if every > 1:
+            text += f" (sampled 1/{every})"
+        if suppressed:
+            text += f" (+{suppressed} similar suppressed)"
+        method(text)
+
+    def debug(self, template: str, *args: Any, every: int = 1, **fields: Any) -> None:
+        self._write("debug", template, args, fields, every)
+
+    def info(self, template: str, *args: Any, every: int = 1, **fields: Any) -> None:
+        self._write("info", template, args, fields, every)
+
+    def warning(self, template: str, *args: Any, every: int = 1, **fields: Any) -> None:
+        self._write("warning", template, args, fields, every)
+
+    def error(self, template: str, *args: Any, every: int = 1, **fields: Any) -> None:
+        self._write("error", template, args, fields, every)
+
+
+log = PluginLog()
+
+
+# ============================================
+# Thread Offloading
+# ============================================
+
+# Per-call profilers collected while a cProfile session is active.
+# cProfile only sees the thread that enabled it, so work pushed to the
+# thread pool is profiled separately and merged when the session stops.
+# From 3.12 cProfile runs on sys.monitoring, which allows one active
+# profiler per process and already sees every thread, so this is off there.
+PROFILE_THREADS = sys.version_info < (3, 12)
+_thread_profilers: List[cProfile.Profile] | None = None
+
+
+def _profiled_call(func: Callable[..., T], *args: Any) -> T:
+    profilers = _thread_profilers
+    if profilers is None:
+        return func(*args)
+    profiler = cProfile.Profile()
+    profilers.append(profiler)
+    return profiler.runcall(func, *args)
+
+
+async def to_thread(func: Callable[..., T], *args: Any) -> T:
+    """asyncio.to_thread() that stays visible to an active cProfile session."""
+    return await asyncio.to_thread(_profiled_call, func, *args)
+
+
+# ============================================
+# Frontend Events
+# ============================================
+
+async def emit_event(event: str, *args: Any) -> None:
+    """Push an event to the frontend (addEventListener in @decky/api).
+
+    Never raises: a missing listener or an older loader without decky.emit
+    just means the UI picks the result up on its next call.
+    """
+    emit = getattr(decky, "emit", None)
+    if emit is None:
+        return
+    try:
+        await emit(event, *args)
+    except Exception as e:
+        log.error("[EVENT] Emitting %s failed: %s", event, e)
+
+
+# ============================================
+# HTTP Response Cache
+# ============================================
+
+class HttpCacheEntry:
+    __slots__ = ("sha256", "size", "fetched_at", "last_used")
+
+    def __init__(self, sha256: str, size: int, fetched_at: float, last_used: float):
+        self.sha256 = sys.intern(sha256)   # shared by every URL with the same body
+        self.size = size
+        self.fetched_at = fetched_at
+        self.last_used = last_used
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"sha256": self.sha256, "size": self.size, "fetched_at": self.fetched_at, "last_used": self.last_used}
+
+
+class HttpCache:
+    """On-disk cache of raw GET response bodies.
+
+    Bodies are zlib-compressed and stored once per SHA-256 of their content
+    under objects/, so identical responses for different URLs share a file.
+    index.json maps url -> {sha256, size, fetched_at, last_used}. Freshness
+    is decided per host (HTTP_CACHE_TTL) and the object store is kept under
+    max_bytes by evicting least recently used URLs.
+
+    trim() only shrinks the in-memory index under memory pressure; what it
+    forgets stays on disk, is read back when that URL is asked for again
+    and is kept when the index is saved.
+    """
+
+    def __init__(self, root: str, max_bytes: int = HTTP_CACHE_MAX_BYTES, ttl: Dict[str, int] | None = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl = HTTP_CACHE_TTL if ttl is None else ttl
+        self.index_path = os.path.join(root, "index.json")
+        self.entries: Dict[str, HttpCacheEntry] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._trimmed: Set[str] = set()  # URLs in index.json that trim() forgot
+        self._removed: Set[str] = set()  # URLs dropped since the last save
+        self._orphans: Set[str] = set()  # bodies that may have lost their last URL
+        self._unsaved: Set[str] = set()  # URLs changed since the last save; trim() keeps them
+        self._puts = 0
+
+    def ttl_for(self, url: str) -> int:
+        host = (urllib.parse.urlsplit(url).hostname or "").lower()
+        return self.ttl.get(host, 0)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.z")
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.error("[HTTP_CACHE] Index unreadable, starting empty: %s", e)
+            return {}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        self.entries = {
+            url: HttpCacheEntry(e["sha256"], e["size"], e["fetched_at"], e["last_used"])
+            for url, e in self._read_index().items()
+        }
+
+    def _restore(self, url: str) -> HttpCacheEntry | None:
+        """Read back an entry trim() forgot. Other misses never touch the disk."""
+        if url not in self._trimmed:
+            return None
+        self._trimmed.discard(url)
+        e = self._read_index().get(url)
+        if not e:
+            return None
+        entry = self.entries[url] = HttpCacheEntry(e["sha256"], e["size"], e["fetched_at"], e["last_used"])
+        return entry
+
+    def _save(self) -> None:
+        """Write the index (merged with the on-disk one after a trim), evict
+        down to max_bytes and delete bodies no URL refers to any more."""
+        index = self._read_index() if self._trimmed else {}
+        before = {e["sha256"] for e in index.values()}
+        for url in self._removed:
+            index.pop(url, None)
+        index.update((url, e.to_json()) for url, e in self.entries.items())
+
+        objects = {e["sha256"]: e["size"] for e in index.values()}
+        total = sum(objects.values())
+        for url in sorted(index, key=lambda u: index[u]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            digest = index.pop(url)["sha256"]
+            self.entries.pop(url, None)
+            if not any(e["sha256"] == digest for e in index.values()):
+                total -= objects[digest]
+
+        self._trimmed.intersection_update(index)
+        referenced = {e["sha256"] for e in index.values()}
+        for digest in (before | self._orphans) - referenced:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+        self._removed.clear()
+        self._orphans.clear()
+        self._unsaved.clear()
+        self._puts = 0
+        self._dirty = False
+
+    def get(self, url: str, allow_stale: bool = False) -> bytes | None:
+        """Cached body for url if it is fresh (or any age, with allow_stale)."""
+        with self._lock:
+            self._load()
+            entry = self.entries.get(url) or self._restore(url)
+            if not entry:
+                return None
+            if not allow_stale and time.time() - entry.fetched_at > self.ttl_for(url):
+                return None
+            try:
+                with open(self._object_path(entry.sha256), "rb") as f:
+                    body = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                self._drop(url)
+                return None
+            entry.last_used = time.time()
+            self._unsaved.add(url)
+            self._dirty = True
+            return body
+
+    def put(self, url: str, body: bytes) -> None:
+        if self.ttl_for(url) <= 0:
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            self._load()
+            path = self._object_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.part"
+                with open(tmp_path, "wb") as f:
+                    f.write(zlib.compress(body, 6))
+                os.replace(tmp_path, path)
+            previous = self.entries.get(url) or self._restore(url)
+            if previous is not None and previous.sha256 != digest:
+                self._orphans.add(previous.sha256)
+            now = time.time()
+            self.entries[url] = HttpCacheEntry(digest, os.path.getsize(path), now, now)
+            self._removed.discard(url)
+            self._unsaved.add(url)
+            self._dirty = True
+            self._puts += 1
+            # The index is written in batches; going over max_bytes evicts right away
+            if self._puts >= HTTP_CACHE_SAVE_EVERY or self._bytes() > self.max_bytes:
+                self._save()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _bytes(self) -> int:
+        return sum({e.sha256: e.size for e in self.entries.values()}.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            objects = {e.sha256: e.size for e in self.entries.values()}
+            return {"entries": len(self.entries), "objects": len(objects), "bytes": sum(objects.values())}
+
+    def footprint(self) -> int:
+        """Bytes the in-memory index takes (bodies live on disk)."""
+        with self._lock:
+            return _footprint(self.entries)
+
+    def trim(self, fraction: float) -> int:
+        """Forget the least recently used `fraction` of URLs in memory only;
+        index.json and the bodies stay. Returns how many."""
+        with self._lock:
+            saved = [u for u in self.entries if u not in self._unsaved]
+            count = int(len(saved) * fraction)
+            for url in sorted(saved, key=lambda u: self.entries[u].last_used)[:count]:
+                del self.entries[url]
+                self._trimmed.add(url)
+            return count
+
+    def _drop(self, url: str) -> None:
+        """Remove url from the cache; its body goes at the next save if unshared."""
+        entry = self.entries.pop(url, None)
+        self._trimmed.discard(url)
+        self._removed.add(url)
+        if entry:
+            self._orphans.add(entry.sha256)
+        self._dirty = True
+
+
+# Set by Plugin._main(); None keeps http_get/http_get_binary uncached.
+_http_cache: HttpCache | None = None
+
+
+# ============================================
+# Host Health
+# ============================================
+
+def _is_connectivity_error(error: BaseException) -> bool:
+    """DNS failures and unreachable networks, as opposed to a host misbehaving."""
+    reason = getattr(error, "reason", error)
+    if isinstance(reason, socket.gaierror):
+        return True
+    return getattr(reason, "errno", None) in (errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ENETDOWN)
+
+
+class HostHealth:
+    """Circuit breaker per upstream host, plus a global offline flag.
+
+    A host is closed while requests succeed. After failure_threshold
+    consecutive failures it opens and requests to it fail fast, so callers
+    fall back to cached bodies. A background probe reaching the host, or
+    the cooldown running out, half-opens it: one trial request decides
+    whether it closes again. Connectivity errors count towards offline
+    mode, which skips the network for every host until a probe or a
+    request gets through.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+        offline_threshold: int = OFFLINE_FAILURE_THRESHOLD,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.offline_threshold = offline_threshold
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self.offline = False
+        self._network_failures = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+    def _host(self, host: str) -> Dict[str, Any]:
+        return self.hosts.setdefault(host, {"state": "closed", "failures": 0, "opened_at": 0.0, "trial": False})
+
+    def allow(self, url: str) -> bool:
+        """Whether a request to url should go out now."""
+        with self._lock:
+            if self.offline:
+                return False
+            health = self._host(self.host_of(url))
+            if health["state"] == "closed":
+                return True
+            if health["state"] == "open" and time.monotonic() - health["opened_at"] >= self.cooldown:
+                health["state"] = "half-open"
+            if health["state"] == "half-open" and not health["trial"]:
+                health["trial"] = True
+                return True
+            return False
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            health = self._host(self.host_of(url))
+            if health["state"] != "closed":
+                log.info("[HEALTH] %s recovered", self.host_of(url))
+            health.update(state="closed", failures=0, trial=False)
+            self._network_failures = 0
+            if self.offline:
+                log.info("[HEALTH] Connectivity restored, leaving offline mode")
+                self.offline = False
+
+    def record_error(self, url: str, error: BaseException) -> bool:
+        """Classify a failed request. Returns False if the host did answer (HTTP 4xx)."""
+        if isinstance(error, urllib.error.HTTPError) and error.code < 500:
+            self.record_success(url)
+            return False
+        host = self.host_of(url)
+        with self._lock:
+            health = self._host(host)
+            health["failures"] += 1
+            health["trial"] = False
+            if health["state"] == "half-open" or (
+                health["state"] == "closed" and health["failures"] >= self.failure_threshold
+            ):
+                log.error("[HEALTH] Opening circuit for %s after %d failures", host, health['failures'])
+                health.update(state="open", opened_at=time.monotonic())
+            if _is_connectivity_error(error):
+                self._network_failures += 1
+                if not self.offline and self._network_failures >= self.offline_threshold:
+                    log.error("[HEALTH] Network unreachable, entering offline mode")
+                    self.offline = True
+        return True
+
+    def release(self, url: str) -> None:
+        """A request was abandoned (cancelled) before it had an outcome: let
+        the next one be the half-open trial instead."""
+        with self._lock:
+            self._host(self.host_of(url))["trial"] = False
+
+    def mark_reachable(self, host: str) -> None:
+        """A probe reached host: leave offline mode and let one trial request through."""
+        with self._lock:
+            if self.offline:
+                log.info("[HEALTH] Probe succeeded, leaving offline mode")
+                self.offline = False
+                self._network_failures = 0
+            health = self._host(host)
+            if health["state"] != "closed":
+                health.update(state="half-open", trial=False)
+
+    def hosts_to_probe(self) -> List[str]:
+        with self._lock:
+            return [h for h, v in self.hosts.items() if self.offline or v["state"] == "open"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "offline": self.offline,
+                "hosts": {
+                    host: {
+                        "state": v["state"],
+                        "failures": v["failures"],
+                        "open_for": round(now - v["opened_at"], 1) if v["state"] != "closed" else 0,
+                    }
+                    for host, v in self.hosts.items()
+                },
+            }
+
+
+class HostLatency:
+    """Recent request durations per host, for adaptive timeouts and hedging.
+
+    Timeouts count as samples of their full duration, so a host that slows
+    down pushes its own timeout back up instead of failing over and over.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = LATENCY_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self.samples: Dict[str, collections.deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: str, seconds: float) -> None:
+        host = HostHealth.host_of(url)
+        with self._lock:
+            self.samples.setdefault(host, collections.deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, url: str, pct: float) -> float | None:
+        """pct-th percentile for url's host, or None without enough history."""
+        with self._lock:
+            samples = sorted(self.samples.get(HostHealth.host_of(url), ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(pct / 100.0 * len(samples)))]
+
+    def timeout_for(self, url: str, default: float) -> float:
+        p95 = self.percentile(url, 95)
+        if p95 is None:
+            return default
+        return min(default, max(HTTP_MIN_TIMEOUT, p95 * TIMEOUT_P95_FACTOR))
+
+    def hedge_delay(self, url: str) -> float | None:
+        p95 = self.percentile(url, 95)
+        return None if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+    def footprint(self) -> int:
+        with self._lock:
+            return sys.getsizeof(self.samples) + sum(
+                sys.getsizeof(d) + len(d) * sys.getsizeof(0.0) for d in self.samples.values()
+            )
+
+    def trim(self, fraction: float) -> int:
+        """Drop the oldest `fraction` of every host's samples."""
+        dropped = 0
+        with self._lock:
+            for d in self.samples.values():
+                for _ in range(int(len(d) * fraction)):
+                    d.popleft()
+                    dropped += 1
+        return dropped
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            hosts = list(self.samples)
+        report = {}
+        for host in hosts:
+            url = f"https://{host}/"
+            p50, p95 = self.percentile(url, 50), self.percentile(url, 95)
+            report[host] = {
+                "samples": len(self.samples[host]),
+                "p50_ms": round(p50 * 1000) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000) if p95 is not None else None,
+                "timeout_s": round(self.timeout_for(url, HTTP_TIMEOUT), 2),
+            }
+        return report
+
+
+def _probe_host(host: str) -> bool:
+    """Cheap reachability check: a TCP connection to the HTTPS port."""
+    try:
+        with socket.create_connection((host, 443), timeout=HEALTH_PROBE_TIMEOUT):
+            return True
+    except OSError:
+        return False
+
+
+_host_health = HostHealth()
+_host_latency = HostLatency()
+
+
+# ============================================
+# Data Usage
+# ============================================
+
+class BackgroundWork:
+    """Marks a task's HTTP requests as background work for data-saver mode.
+
+    Mutable so a task can be promoted once the UI starts waiting on it.
+    """
+
+    __slots__ = ("active",)
+
+    def __init__(self) -> None:
+        self.active = True
+
+    def promote(self) -> None:
+        self.active = False
+
+
+# Set inside background tasks (revalidation, prefetch, watchers)
+_background_work: contextvars.ContextVar[BackgroundWork | None] = contextvars.ContextVar("background_work", default=None)
+
+
+def mark_background() -> BackgroundWork:
+    """Flag the current task's HTTP requests as background work."""
+    work = BackgroundWork()
+    _background_work.set(work)
+    return work
+
+
+def is_background() -> bool:
+    work = _background_work.get()
+    return work is not None and work.active
+
+
+class DataUsage:
+    """Bytes fetched per host per day, and the data-saver gate.
+
+    Counted in the HTTP layer, so no request is missed. In data-saver mode
+    background work may not fetch at all and foreground work stops once
+    today's total reaches daily_bytes; both fall back to the response cache.
+    The lock only guards the counters: allow() runs on the event loop, so
+    the file is read by load() and written by flush() outside of it.
+    """
+
+    def __init__(self, path: str | None = None, keep_days: int = DATA_USAGE_KEEP_DAYS):
+        self.path = path
+        self.keep_days = keep_days
+        self.saver = False
+        self.daily_bytes = DATA_SAVER_DAILY_BYTES
+        self.days: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._loaded = False
+        self._unsaved = 0
+
+    @staticmethod
+    def today() -> str:
+        return time.strftime("%Y-%m-%d")
+
+    def configure(self, saver: bool, daily_bytes: int) -> None:
+        if saver != self.saver:
+            log.info("[DATA] Data saver %s", "on" if saver else "off")
+        self.saver = saver
+        self.daily_bytes = max(0, daily_bytes)
+
+    def load(self) -> None:
+        """Read the usage file (blocking). Counts recorded before it are kept."""
+        with self._write_lock:
+            if self._loaded:
+                return
+            data: Any = {}
+            if self.path:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    log.error("[DATA] Usage file unreadable, starting empty: %s", e)
+            with self._lock:
+                for day, hosts in (data.items() if isinstance(data, dict) else ()):
+                    counts = self.days.setdefault(day, {})
+                    for host, n in hosts.items():
+                        counts[host] = counts.get(host, 0) + int(n)
+                self._loaded = True
+
+    def record(self, url: str, size: int) -> None:
+        """Count size bytes fetched from url's host today. Thread-safe; call
+        from a worker thread, since it may flush."""
+        with self._lock:
+            hosts = self.days.setdefault(self.today(), {})
+            host = HostHealth.host_of(url)
+            hosts[host] = hosts.get(host, 0) + size
+            self._unsaved += size
+            due = self._unsaved >= DATA_USAGE_FLUSH_BYTES
+        if due:
+            self.flush()
+
+    def used_today(self) -> int:
+        with self._lock:
+            return sum(self.days.get(self.today(), {}).values())
+
+    def allow(self, url: str, background: bool) -> bool:
+        if not self.saver:
+            return True
+        if background or self.used_today() >= self.daily_bytes:
+            log.info("[DATA] Data saver: %s served from cache only", url, every=20)
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Write the counters if they changed (blocking)."""
+        # Never overwrite the file with counts that don't include it yet
+        self.load()
+        with self._write_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                self._unsaved = 0
+                for day in sorted(self.days)[:-self.keep_days]:
+                    del self.days[day]
+                data = {day: dict(hosts) for day, hosts in self.days.items()}
+            if not self.path:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                log.error("[DATA] Saving usage failed: %s", e)
+
+    def snapshot(self) -> Dict[str, Any]:
+        self.load()
+        with self._lock:
+            today = dict(self.days.get(self.today(), {}))
+            return {
+                "data_saver": self.saver,
+                "daily_budget": self.daily_bytes,
+                "used_today": sum(today.values()),
+                "today": today,
+                "days": {day: sum(hosts.values()) for day, hosts in sorted(self.days.items())},
+            }
+
+
+# Replaced with a persisted one by Plugin._main()
+_data_usage = DataUsage()
+
 
 # ============================================
 # HTTP Helpers
 # ============================================
 
-def _sync_http_get(url: str, headers: Dict[str, str] | None = None) -> str:
+# Requests the UI is waiting on (not background work); background downloads
+# step aside while > 0.
+_foreground_requests = 0
+
+
+class DownloadThrottle:
+    """Pacing for a background download. Can be lifted mid-transfer when the
+    user starts waiting on the result."""
+
+    def __init__(self, rate_limit: int | None = None, yield_to_foreground: bool = False):
+        self.rate_limit = rate_limit
+        self.yield_to_foreground = yield_to_foreground
+
+    def lift(self) -> None:
+        self.rate_limit = None
+        self.yield_to_foreground = False
+
+    def wait(self, sent: int, started: float) -> None:
+        """Called from the download thread after each chunk."""
+        while self.yield_to_foreground and _foreground_requests > 0:
+            time.sleep(0.1)
+        if self.rate_limit:
+            ahead = sent / self.rate_limit - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(min(ahead, 1.0))
+
+
+def _sync_http_get(url: str, headers: Dict[str, str] | None = None, timeout: float = HTTP_TIMEOUT) -> str:
     """Synchronous HTTP GET - to be called via asyncio.to_thread()."""
     headers = headers or {}
     if "User-Agent" not in headers:
@@ -54,20 +941,125 @@ def _sync_http_get(url: str, headers: Dict[str, str] | None = None) -> str:
     for key, value in headers.items():
         req.add_header(key, value)
 
-    with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT) as response:
+    with urllib.request.urlopen(req, timeout=timeout) as response:
         return response.read().decode("utf-8")
 
 
-async def http_get(url: str, headers: Dict[str, str] | None = None) -> str | None:
-    """Non-blocking HTTP GET using thread pool."""
+def _timed_fetch(fetch: Callable[..., T], url: str, headers: Dict[str, str] | None, timeout: float) -> T:
+    """Run fetch in a worker thread and record how long it took.
+
+    Timeouts are recorded too, at their full duration.
+    """
+    started = time.monotonic()
     try:
-        return await asyncio.to_thread(_sync_http_get, url, headers)
+        body = fetch(url, dict(headers) if headers else None, timeout)
     except Exception as e:
-        decky.logger.error(f"HTTP error for {url}: {e}")
+        if isinstance(e, TimeoutError) or isinstance(getattr(e, "reason", None), TimeoutError):
+            _host_latency.record(url, time.monotonic() - started)
+        raise
+    _host_latency.record(url, time.monotonic() - started)
+    # Hedged losers are counted too: their bytes crossed the network as well
+    _data_usage.record(url, len(body) if isinstance(body, bytes) else len(str(body).encode("utf-8")))
+    return body
+
+
+def _settle(task: "asyncio.Future[Any]") -> None:
+    """Cancel an attempt nobody awaits any more and consume its outcome, so
+    a late failure isn't reported as an exception that was never retrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _fetch_idempotent(
+    fetch: Callable[..., T], url: str, headers: Dict[str, str] | None, default_timeout: float, hedge: bool
+) -> T:
+    """Run a GET with the host's adaptive timeout. If it is still going after
+    the host's p95, fire one more and take whichever answers first."""
+    timeout = _host_latency.timeout_for(url, default_timeout)
+
+    def attempt() -> "asyncio.Future[T]":
+        return asyncio.ensure_future(to_thread(_timed_fetch, fetch, url, headers, timeout))
+
+    first = attempt()
+    delay = _host_latency.hedge_delay(url) if hedge and HTTP_HEDGING and not _data_usage.saver else None
+    if delay is None:
+        return await first
+    attempts = [first]
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        log.info("[HTTP] Hedging %s after %.2fs", url, delay)
+        attempts.append(attempt())
+        pending = set(attempts)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        assert error is not None
+        raise error
+    finally:
+        # Won, failed or cancelled: the loser's thread can't be interrupted
+        # and finishes within its timeout, so settle it rather than leak it
+        for task in attempts:
+            _settle(task)
+
+
+async def _stale_body(cache: HttpCache | None, url: str) -> bytes | None:
+    """Fallback when the network is skipped or failed: whatever body we last saw."""
+    if cache is None:
         return None
+    body = await to_thread(cache.get, url, True)
+    if body is not None:
+        log.info("[HEALTH] Serving cached %s", url, every=10)
+    return body
+
+
+async def http_get(
+    url: str, headers: Dict[str, str] | None = None, use_cache: bool = True, hedge: bool = True
+) -> str | None:
+    """Non-blocking HTTP GET using thread pool."""
+    global _foreground_requests
+    cache = _http_cache if use_cache else None
+    if cache:
+        cached = await to_thread(cache.get, url)
+        if cached is not None:
+            return cached.decode("utf-8")
+
+    if not _data_usage.allow(url, is_background()) or not _host_health.allow(url):
+        stale = await _stale_body(cache, url)
+        return stale.decode("utf-8") if stale is not None else None
+
+    foreground = not is_background()
+    _foreground_requests += foreground
+    try:
+        body = await _fetch_idempotent(_sync_http_get, url, headers, HTTP_TIMEOUT, hedge)
+    except asyncio.CancelledError:
+        _host_health.release(url)
+        raise
+    except Exception as e:
+        log.error("HTTP error for %s: %s", url, e)
+        if not _host_health.record_error(url, e):
+            return None
+        stale = await _stale_body(cache, url)
+        return stale.decode("utf-8") if stale is not None else None
+    finally:
+        _foreground_requests -= foreground
+
+    _host_health.record_success(url)
+    if cache:
+        try:
+            await to_thread(cache.put, url, body.encode("utf-8"))
+        except OSError as e:
+            log.error("[HTTP_CACHE] Storing %s failed: %s", url, e)
+    return body
 
 
-def _sync_http_get_binary(url: str, headers: Dict[str, str] | None = None) -> bytes:
+def _sync_http_get_binary(url: str, headers: Dict[str, str] | None = None, timeout: float = HTTP_BINARY_TIMEOUT) -> bytes:
     """Synchronous HTTP GET returning raw bytes."""
     headers = headers or {}
     if "User-Agent" not in headers:
@@ -76,17 +1068,1418 @@ def _sync_http_get_binary(url: str, headers: Dict[str, str] | None = None) -> by
     for key, value in headers.items():
         req.add_header(key, value)
 
-    with urllib.request.urlopen(req, timeout=30) as response:
+    with urllib.request.urlopen(req, timeout=timeout) as response:
         return response.read()
 
 
-async def http_get_binary(url: str, headers: Dict[str, str] | None = None) -> bytes | None:
+async def http_get_binary(
+    url: str, headers: Dict[str, str] | None = None, use_cache: bool = True, hedge: bool = True
+) -> bytes | None:
     """Non-blocking HTTP GET for binary data."""
+    global _foreground_requests
+    cache = _http_cache if use_cache else None
+    if cache:
+        cached = await to_thread(cache.get, url)
+        if cached is not None:
+            return cached
+
+    if not _data_usage.allow(url, is_background()) or not _host_health.allow(url):
+        return await _stale_body(cache, url)
+
+    foreground = not is_background()
+    _foreground_requests += foreground
+    try:
+        body = await _fetch_idempotent(_sync_http_get_binary, url, headers, HTTP_BINARY_TIMEOUT, hedge)
+    except asyncio.CancelledError:
+        _host_health.release(url)
+        raise
+    except Exception as e:
+        log.error("Binary download error for %s: %s", url, e)
+        if not _host_health.record_error(url, e):
+            return None
+        return await _stale_body(cache, url)
+    finally:
+        _foreground_requests -= foreground
+
+    _host_health.record_success(url)
+    if cache:
+        try:
+            await to_thread(cache.put, url, body)
+        except OSError as e:
+            log.error("[HTTP_CACHE] Storing %s failed: %s", url, e)
+    return body
+
+
+def _sync_http_download(
+    url: str,
+    path: str,
+    headers: Dict[str, str] | None = None,
+    throttle: DownloadThrottle | None = None,
+    timeout: float = HTTP_BINARY_TIMEOUT,
+) -> Dict[str, Any]:
+    """Stream url into path, hashing as it goes. Returns sha256, size and final (redirected) url."""
+    headers = headers or {}
+    if "User-Agent" not in headers:
+        headers["User-Agent"] = HTTP_USER_AGENT
+    req = urllib.request.Request(url)
+    for key, value in headers.items():
+        req.add_header(key, value)
+
+    digest = hashlib.sha256()
+    size = 0
+    started = time.monotonic()
+    with urllib.request.urlopen(req, timeout=timeout) as response, open(path, "wb") as out:
+        final_url = response.geturl()
+        while True:
+            chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+            if throttle:
+                throttle.wait(size, started)
+    return {"sha256": digest.hexdigest(), "size": size, "url": final_url}
+
+
+async def http_download(
+    url: str, path: str, headers: Dict[str, str] | None = None, throttle: DownloadThrottle | None = None
+) -> Dict[str, Any] | None:
+    """Non-blocking streamed download to a file."""
+    if not _data_usage.allow(url, is_background()):
+        return None
+    if not _host_health.allow(url):
+        log.info("[HEALTH] Skipping download of %s, host unavailable", url)
+        return None
     try:
-        return await asyncio.to_thread(_sync_http_get_binary, url, headers)
+        timeout = _host_latency.timeout_for(url, HTTP_BINARY_TIMEOUT)
+        info = await to_thread(_sync_http_download, url, path, headers, throttle, timeout)
+    except asyncio.CancelledError:
+        _host_health.release(url)
+        raise
     except Exception as e:
-        decky.logger.error(f"Binary download error for {url}: {e}")
+        log.error("Download error for %s: %s", url, e)
+        _host_health.record_error(url, e)
         return None
+    _host_health.record_success(url)
+    await to_thread(_data_usage.record, url, info["size"])
+    return info
+
+
+# ============================================
+# Seed Status Index
+# ============================================
+
+class _SeedRecords:
+    """Sequence view over the appid column of a seed index, for bisect."""
+
+    def __init__(self, buf: mmap.mmap, count: int):
+        self._buf = buf
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return struct.unpack_from("<I", self._buf, SEED_HEADER.size + i * SEED_RECORD.size)[0]
+
+
+class SeedIndex:
+    """Read-only appid -> (status, kuli slug) index shipped with each release.
+
+    The file is a header, fixed-size records sorted by appid and a UTF-8
+    string pool (see scripts/build_seed_index.py). It is memory-mapped and
+    binary-searched in place, so nothing is parsed up front.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buf: mmap.mmap | None = None
+        self._records: _SeedRecords | None = None
+        self._count = 0
+        self._pool = 0
+
+    def open(self) -> bool:
+        self.close()
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, pool = SEED_HEADER.unpack_from(buf, 0)
+            if magic != SEED_MAGIC or SEED_HEADER.size + count * SEED_RECORD.size > pool or pool > len(buf):
+                buf.close()
+                log.error("[SEED] Ignoring malformed index: %s", self.path)
+                return False
+        except (OSError, ValueError, struct.error) as e:
+            log.error("[SEED] Failed to open %s: %s", self.path, e)
+            return False
+        self._buf, self._count, self._pool = buf, count, pool
+        self._records = _SeedRecords(buf, count)
+        return True
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.close()
+        self._buf = None
+        self._records = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def mapped_bytes(self) -> int:
+        return len(self._buf) if self._buf is not None else 0
+
+    def lookup(self, appid: int) -> tuple[str, str] | None:
+        if self._buf is None or self._records is None:
+            return None
+        i = bisect.bisect_left(self._records, appid)
+        if i >= self._count or self._records[i] != appid:
+            return None
+        _, status, slug_len, slug_off = SEED_RECORD.unpack_from(self._buf, SEED_HEADER.size + i * SEED_RECORD.size)
+        start = self._pool + slug_off
+        slug = self._buf[start:start + slug_len].decode("utf-8")
+        return SEED_STATUSES[status] if status < len(SEED_STATUSES) else "NONE", slug
+
+
+# ============================================
+# Status Resolution
+# ============================================
+
+# Python port of the lookup in src/utils.ts (searchKuli) and
+# src/hooks/useBadgeStatus.ts, so results can be cached and pushed to the UI.
+
+KULI_PRODUCT_RE = re.compile(
+    r'href="/([a-z0-9-]+)"[^>]*>[\s\S]*?class="product-title[^"]*"[^>]*>[\s\S]*?([^<]+)<', re.IGNORECASE
+)
+
+
+def clean_non_steam_name(name: str) -> str:
+    """Strip shortcut tags, versions and edition suffixes from a game name."""
+    if not name:
+        return ""
+    name = re.sub(r"\s*\((Shortcut|Non-Steam|App|Game)\)$", "", name, count=1, flags=re.IGNORECASE)
+    name = re.sub(r"\s*(?:v|version|ver)\.?\s*\d+(?:\.\d+)*", "", name, count=1, flags=re.IGNORECASE)
+    name = re.sub(
+        r"\s*(?:Remastered|Definitive Edition|Director's Cut|Enhanced Edition|Game of the Year|GOTY|"
+        r"Special Edition|Legendary Edition|Complete Edition|Deluxe Edition|Ultimate Edition)$",
+        "", name, count=1, flags=re.IGNORECASE,
+    )
+    return name.strip()
+
+
+def is_steam_app_id(app_id: str) -> bool:
+    """Standard Steam appids are below 1e9; non-Steam shortcuts are larger."""
+    try:
+        return int(app_id) < 1000000000
+    except (TypeError, ValueError):
+        return False
+
+
+def urlify_game_name(name: str) -> str:
+    slug = clean_non_steam_name(name).lower()
+    slug = re.sub(r"[':’]", "", slug).replace("&", "and")
+    slug = re.sub(r"[^a-z0-9]+", "-", slug)
+    return slug.strip().strip("-")
+
+
+_LANGUAGE_BITS: Dict[str, int] = {}
+for _bit, (_code, _name) in enumerate(STEAM_LANGUAGES):
+    _LANGUAGE_BITS[_code] = _LANGUAGE_BITS[_name.lower()] = 1 << _bit
+# Older store pages use the bare names for these
+_LANGUAGE_BITS.setdefault("spanish", _LANGUAGE_BITS["spanish - spain"])
+_LANGUAGE_BITS.setdefault("portuguese", _LANGUAGE_BITS["portuguese - portugal"])
+
+
+def language_bit(language: str) -> int:
+    """Mask bit for a Steam language code or display name, 0 if unknown."""
+    return _LANGUAGE_BITS.get((language or "").strip().lower(), 0)
+
+
+def parse_supported_languages(html: str) -> tuple[int, int]:
+    """(listed, full audio) masks from appdetails `supported_languages`.
+
+    The field is e.g. "English<strong>*</strong>, Ukrainian<br><strong>*</strong>languages
+    with full audio support". appdetails has no separate subtitle column, so
+    "listed" covers interface and subtitles; "*" marks full audio.
+    """
+    listed = audio = 0
+    body = re.split(r"<br\s*/?>", html or "", maxsplit=1, flags=re.IGNORECASE)[0]
+    for part in body.split(","):
+        has_audio = "*" in part
+        bit = language_bit(re.sub(r"<[^>]+>|\*", "", part))
+        listed |= bit
+        if has_audio:
+            audio |= bit
+    return listed, audio
+
+
+def language_codes(mask: int) -> List[str]:
+    return [code for bit, (code, _name) in enumerate(STEAM_LANGUAGES) if mask & (1 << bit)]
+
+
+def kuli_covers(language: str) -> bool:
+    """Whether kuli (Ukrainian community translations) answers for `language`."""
+    return language_bit(language) == language_bit("ukrainian")
+
+
+def status_for_language(entry: "StatusRecord", language: str) -> str:
+    """Badge status of a status cache entry for `language`.
+
+    entry.status is the Ukrainian answer (Steam or kuli); other languages
+    are answered from the cached Steam masks alone.
+    """
+    if entry.languages and entry.languages[0] & language_bit(language):
+        return "OFFICIAL"
+    if kuli_covers(language):
+        return entry.status
+    return "NONE"
+
+
+def _levenshtein(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _is_valid_kuli_page(html: str) -> bool:
+    low = html.lower()
+    if "page-not-found" in low or "сторінку не знайдено" in low or "404" in low:
+        return False
+    return "product-details-page" in low or "product-essential" in low or "item__instruction-main" in low
+
+
+def _kuli_status_from_html(html: str) -> str:
+    return "COMMUNITY" if "item__instruction-main" in html.lower() else "OFFICIAL"
+
+
+KULI_LABELED_VALUE_RES = (
+    # Product specification table
+    re.compile(r'<td[^>]*class="spec-name"[^>]*>(.*?)</td>\s*<td[^>]*class="spec-value"[^>]*>(.*?)</td>', re.S | re.I),
+    re.compile(r"<dt[^>]*>(.*?)</dt>\s*<dd[^>]*>(.*?)</dd>", re.S | re.I),
+    # "<strong>Автори:</strong> ..." inside the description / instructions
+    re.compile(r"<(strong|b|span)[^>]*>\s*([^<:]{2,60}?)\s*:\s*</\1>(.*?)(?=<br|</p|</li|</div|<(?:strong|b)\b)", re.S | re.I),
+)
+KULI_LINK_RE = re.compile(r'<a\b[^>]*href="([^"#]+)"[^>]*>(.*?)</a>', re.S | re.I)
+KULI_DIV_TAG_RE = re.compile(r"<(/?)div\b", re.I)
+
+
+def _html_text(fragment: str) -> str:
+    return " ".join(unescape(re.sub(r"<[^>]+>", " ", fragment)).split())
+
+
+def _kuli_instruction_block(html: str) -> str:
+    """The translation's instruction div, up to its matching close tag ("" if absent)."""
+    start = html.find("item__instruction-main")
+    if start < 0:
+        return ""
+    start = html.rfind("<", 0, start)
+    depth = 0
+    for tag in KULI_DIV_TAG_RE.finditer(html, start):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[start:tag.start()]
+    return html[start:]
+
+
+def parse_kuli_details(html: str, page_url: str) -> Dict[str, Any]:
+    """Translation authors, version, date, install method and download link
+    from a verified kuli game page. Fields the page doesn't state are left out."""
+    details: Dict[str, Any] = {}
+    for pattern in KULI_LABELED_VALUE_RES:
+        for match in pattern.finditer(html):
+            label, value = _html_text(match.group(match.lastindex - 1)).lower(), _html_text(match.group(match.lastindex))
+            if not value:
+                continue
+            for field, fragments in KULI_DETAIL_LABELS:
+                if any(fragment in label for fragment in fragments):
+                    details.setdefault(field, value[:KULI_DETAIL_MAX_LENGTH])
+                    break
+    if "authors" in details:
+        details["authors"] = [a.strip() for a in re.split(r",|;| & ", details["authors"]) if a.strip()]
+    # Header and footer links ("Завантажити застосунок", ...) are not the translation
+    for href, text in KULI_LINK_RE.findall(_kuli_instruction_block(html)):
+        text = _html_text(text).lower()
+        if "завантаж" in text or "download" in text or "/download" in href.lower():
+            details["download_url"] = urllib.parse.urljoin(page_url, unescape(href))
+            break
+    return details
+
+
+def _best_kuli_match(html: str, query: str) -> Dict[str, Any] | None:
+    q = query.lower().strip()
+    results: List[Dict[str, Any]] = []
+    seen = set()
+    for match in KULI_PRODUCT_RE.finditer(html):
+        slug, title = match.group(1), match.group(2).strip()
+        if not title or not slug or slug == "games" or slug in seen:
+            continue
+        seen.add(slug)
+        t = title.lower().strip()
+        score = _levenshtein(q, t)
+        if t == q:
+            score = 0
+        elif t in q or q in t:
+            score = min(score, 10)
+        results.append({"slug": slug, "title": title, "score": score})
+    if not results:
+        return None
+    best = min(results, key=lambda r: r["score"])
+    if best["score"] > KULI_MAX_MATCH_SCORE:
+        log.info("[STATUS] Rejecting kuli match %r (score %d) for %r", best["title"], best["score"], query)
+        return None
+    return best
+
+
+def _kuli_result(html: str, slug: str) -> Dict[str, Any]:
+    return {"status": _kuli_status_from_html(html), "slug": slug, "details": parse_kuli_details(html, f"{KULI_BASE_URL}{slug}")}
+
+
+async def _search_kuli_once(query: str) -> Dict[str, Any] | None:
+    direct_slug = urlify_game_name(query)
+    if direct_slug:
+        # A missing slug page is a 404 (None) too, so only the search decides reachability
+        html = await http_get(f"{KULI_BASE_URL}{direct_slug}", dict(KULI_HEADERS))
+        if html and _is_valid_kuli_page(html):
+            return _kuli_result(html, direct_slug)
+
+    html = await http_get(f"{KULI_BASE_URL}games?query={urllib.parse.quote(query)}", dict(KULI_HEADERS))
+    if html is None:
+        return None
+    best = _best_kuli_match(html, query)
+    if not best:
+        return {}
+    html = await http_get(f"{KULI_BASE_URL}{best['slug']}", dict(KULI_HEADERS))
+    if html is None:
+        return None
+    return _kuli_result(html, best["slug"]) if _is_valid_kuli_page(html) else {}
+
+
+async def search_kuli(game_name: str) -> Dict[str, Any] | None:
+    """Direct slug, then site search; long names are retried with their first two words.
+
+    {} if kuli has no match, None if kuli could not be reached.
+    """
+    if not game_name:
+        return {}
+    result = await _search_kuli_once(game_name)
+    if result is None or result:
+        return result
+    words = clean_non_steam_name(game_name).split()
+    if len(words) > 2:
+        return await _search_kuli_once(" ".join(words[:2]))
+    return {}
+
+
+async def fetch_steam_app(app_id: str) -> Dict[str, Any] | None:
+    """Store appdetails data for app_id; {} if Steam has no such app, None if the request failed."""
+    body = await http_get(STEAM_APPDETAILS_URL.format(app_id=app_id))
+    if not body:
+        return None
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    entry = data.get(str(app_id)) if isinstance(data, dict) else None
+    if not isinstance(entry, dict) or not entry.get("success"):
+        return {}
+    return entry.get("data") or {}
+
+
+async def resolve_badge_status(app_id: str, app_name: str = "", with_kuli: bool = True) -> Dict[str, Any]:
+    """Steam store languages are the source of truth for OFFICIAL, kuli for the link.
+
+    The full Steam language support is returned as `languages` masks so other
+    target languages can be answered later without fetching again, and the
+    kuli page's translation `details` come from the same response that
+    verified it.
+    kuli only knows Ukrainian translations: pass with_kuli=False for other target
+    languages to answer from Steam alone.
+    `complete` is False when Steam or kuli could not be reached, so the
+    result should not be cached as if it were authoritative.
+    """
+    name = clean_non_steam_name(app_name)
+    official = False
+    complete = True
+    languages = None
+    if is_steam_app_id(app_id):
+        data = await fetch_steam_app(app_id)
+        if data is None:
+            complete = False
+        elif data:
+            name = data.get("name") or name
+            languages = parse_supported_languages(str(data.get("supported_languages") or ""))
+            official = bool(languages[0] & language_bit("ukrainian"))
+
+    kuli = await search_kuli(name) if with_kuli and name else {}
+    if kuli is None:
+        complete = False
+    status = "OFFICIAL" if official else (kuli["status"] if kuli else "NONE")
+    return {
+        "status": status,
+        "url": f"{KULI_BASE_URL}{kuli['slug']}" if kuli else None,
+        "name": name,
+        "languages": languages,
+        "details": (kuli.get("details") or None) if kuli else None,
+        "complete": complete,
+    }
+
+
+class StatusRecord:
+    """One app's cached answer. Status and source strings are interned, so
+    thousands of records share a handful of string objects."""
+
+    __slots__ = ("status", "url", "source", "resolved_at", "languages", "details", "last_used")
+
+    def __init__(
+        self,
+        status: str,
+        url: str | None,
+        source: str,
+        resolved_at: float,
+        languages: tuple[int, int] | None = None,
+        details: Dict[str, Any] | None = None,
+    ):
+        self.status = sys.intern(status)
+        self.url = url
+        self.source = sys.intern(source)
+        self.resolved_at = resolved_at
+        self.languages = languages
+        self.details = details or None
+        self.last_used = resolved_at
+
+    def to_json(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"status": self.status, "url": self.url, "source": self.source, "resolved_at": self.resolved_at}
+        if self.languages is not None:
+            data["languages"] = list(self.languages)
+        if self.details:
+            data["details"] = self.details
+        return data
+
+
+def _translation_version(entry: StatusRecord) -> tuple[str, str]:
+    details = entry.details or {}
+    return details.get("version", ""), details.get("updated", "")
+
+
+class StatusCache:
+    """Resolved badge statuses by app id, persisted as one JSON file.
+
+    Entries older than fresh_seconds are still served, but flagged stale so
+    the caller can revalidate them in the background. trim() only forgets
+    records in memory; restore() reads them back from the file, off the
+    event loop, before they are looked up again.
+    """
+
+    def __init__(self, path: str, fresh_seconds: int = STATUS_FRESH_SECONDS):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.entries: Dict[str, StatusRecord] = {}
+        self._loaded = False
+        self._dirty = False
+        self._trimmed: Set[str] = set()  # app ids in the file that trim() forgot
+        self._unsaved: Dict[str, StatusRecord] = {}  # put since the last flush; trim() keeps them
+
+    @staticmethod
+    def _record(e: Dict[str, Any]) -> StatusRecord:
+        languages = tuple(e["languages"]) if e.get("languages") else None
+        return StatusRecord(
+            e["status"], e.get("url"), e.get("source", "network"), e.get("resolved_at", 0), languages,  # type: ignore[arg-type]
+            e.get("details"),
+        )
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.error("[STATUS] Cache load failed, starting empty: %s", e)
+            return {}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        for app_id, e in self._read().items():
+            self.entries[sys.intern(app_id)] = self._record(e)
+
+    async def restore(self, app_ids: Iterable[str]) -> None:
+        """Read back the records trim() forgot among app_ids, in one read of
+        the file in a thread. Apps that were never trimmed cost nothing."""
+        self._load()
+        wanted = self._trimmed.intersection(app_ids)
+        if not wanted:
+            return
+        data = await to_thread(self._read)
+        for app_id in wanted:
+            # put() while the file was read wins over the saved record
+            if app_id in self._trimmed and app_id not in self.entries and data.get(app_id):
+                self.entries[sys.intern(app_id)] = self._record(data[app_id])
+            self._trimmed.discard(app_id)
+
+    def get(self, app_id: str) -> StatusRecord | None:
+        self._load()
+        entry = self.entries.get(app_id)
+        if entry is not None:
+            entry.last_used = time.time()
+        return entry
+
+    def peek(self, app_id: str) -> StatusRecord | None:
+        """Like get, without counting as a use for LRU trimming."""
+        self._load()
+        return self.entries.get(app_id)
+
+    def is_fresh(self, entry: StatusRecord) -> bool:
+        return time.time() - entry.resolved_at < self.fresh_seconds
+
+    def put(
+        self,
+        app_id: str,
+        status: str,
+        url: str | None,
+        source: str,
+        languages: tuple[int, int] | None = None,
+        details: Dict[str, Any] | None = None,
+    ) -> StatusRecord:
+        self._load()
+        entry = StatusRecord(status, url, source, time.time(), languages, details)
+        self.entries[sys.intern(app_id)] = entry
+        self._trimmed.discard(app_id)
+        self._unsaved[app_id] = entry
+        self._dirty = True
+        return entry
+
+    def footprint(self) -> int:
+        return _footprint(self.entries)
+
+    def trim(self, fraction: float) -> int:
+        """Forget the least recently used `fraction` of apps in memory; the
+        file keeps them and a later lookup reads them back."""
+        saved = [a for a in self.entries if a not in self._unsaved]
+        count = int(len(saved) * fraction)
+        for app_id in sorted(saved, key=lambda a: self.entries[a].last_used)[:count]:
+            del self.entries[app_id]
+            self._trimmed.add(app_id)
+        return count
+
+    def flush(self) -> None:
+        """Write pending changes, blocking. For shutdown; the loop uses save()."""
+        if not self._dirty:
+            return
+        written = dict(self._unsaved)
+        self._write({app_id: e.to_json() for app_id, e in self.entries.items()}, bool(self._trimmed))
+        self._dirty = False
+        self._written(written)
+
+    async def save(self) -> None:
+        """flush() from the event loop. Records are serialized here, where
+        put() and trim() run, and only the file write goes to a thread."""
+        if not self._dirty:
+            return
+        written = dict(self._unsaved)
+        records = {app_id: e.to_json() for app_id, e in self.entries.items()}
+        self._dirty = False
+        try:
+            await to_thread(self._write, records, bool(self._trimmed))
+        except BaseException:
+            self._dirty = True
+            raise
+        self._written(written)
+
+    def _write(self, records: Dict[str, Dict[str, Any]], merge: bool) -> None:
+        """Write records; with merge, over the file's records trim() forgot."""
+        data = self._read() if merge else {}
+        data.update(records)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def _written(self, written: Dict[str, StatusRecord]) -> None:
+        # Records put again while the file was being written stay unsaved
+        for app_id, entry in written.items():
+            if self._unsaved.get(app_id) is entry:
+                del self._unsaved[app_id]
+
+
+# ============================================
+# Steam App List Index
+# ============================================
+
+def app_name_key(name: str) -> str:
+    """Search key for an app name: cleaned like a shortcut name, lowercased,
+    punctuation and trademark signs folded to single spaces."""
+    key = clean_non_steam_name(name or "").lower()
+    key = re.sub(r"[™®©':’]", "", key)
+    return " ".join(re.sub(r"[\W_]+", " ", key).split())
+
+
+APP_LIST_START_RE = re.compile(r'"apps"\s*:\s*\[')
+
+
+def iter_app_list(path: str) -> Iterator[tuple[int, str]]:
+    """(appid, name) pairs streamed from a downloaded ISteamApps/GetAppList response.
+
+    Apps are decoded one object at a time, so the whole list is never held
+    in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        start = None
+        while start is None:
+            chunk = f.read(APP_LIST_READ_CHUNK)
+            buf += chunk
+            start = APP_LIST_START_RE.search(buf)
+            if start is None and not chunk:
+                raise ValueError("unexpected app list payload")
+        pos = start.end()
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            try:
+                if pos >= len(buf):
+                    raise ValueError
+                if buf[pos] == "]":
+                    return
+                app, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                # The object continues in the next chunk
+                chunk = f.read(APP_LIST_READ_CHUNK)
+                if not chunk:
+                    raise ValueError("truncated app list")
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            try:
+                appid, name = int(app["appid"]), str(app["name"]).strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+            if name and 0 < appid < 2 ** 32:
+                yield appid, name
+
+
+def _sorted_run(rows: List[tuple[str, int, str]], path: str) -> str:
+    rows.sort()
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    rows.clear()
+    return path
+
+
+def write_app_index(apps: Iterable[tuple[int, str]], path: str, built_at: float) -> int:
+    """Write an AppListIndex file of apps sorted by (search key, appid); returns the record count.
+
+    An external merge sort: APP_INDEX_SORT_RUN apps at a time are sorted
+    into temporary run files, which are merged while the records and the
+    string pool are written out, so memory stays flat however long Steam's
+    list gets.
+    """
+    with tempfile.TemporaryDirectory(prefix="apps-", dir=os.path.dirname(path) or None) as tmp:
+        runs: List[str] = []
+        rows: List[tuple[str, int, str]] = []
+        for appid, name in apps:
+            key = app_name_key(name)
+            if key:
+                rows.append((key, appid, name))
+                if len(rows) >= APP_INDEX_SORT_RUN:
+                    runs.append(_sorted_run(rows, os.path.join(tmp, f"run-{len(runs)}")))
+        if rows:
+            runs.append(_sorted_run(rows, os.path.join(tmp, f"run-{len(runs)}")))
+
+        run_files = [open(run, "r", encoding="utf-8") for run in runs]
+        try:
+            merged = heapq.merge(*((tuple(json.loads(line)) for line in f) for f in run_files))
+            count = pool_size = 0
+            previous = None
+            with open(path, "wb") as out, open(os.path.join(tmp, "pool"), "w+b") as pool:
+                out.write(bytes(APP_INDEX_HEADER.size))
+                for row in merged:
+                    if row == previous:
+                        continue
+                    previous = row
+                    key, appid, name = row
+                    raw_key = key.encode("utf-8")[:0xFFFF]
+                    raw_name = name.encode("utf-8")[:0xFFFF]
+                    key_off = name_off = pool_size
+                    pool.write(raw_key)
+                    pool_size += len(raw_key)
+                    if raw_name != raw_key:
+                        name_off = pool_size
+                        pool.write(raw_name)
+                        pool_size += len(raw_name)
+                    out.write(APP_INDEX_RECORD.pack(appid, key_off, name_off, len(raw_key), len(raw_name)))
+                    count += 1
+                pool.seek(0)
+                shutil.copyfileobj(pool, out)
+                out.seek(0)
+                out.write(APP_INDEX_HEADER.pack(
+                    APP_INDEX_MAGIC, count, APP_INDEX_HEADER.size + count * APP_INDEX_RECORD.size, built_at
+                ))
+        finally:
+            for f in run_files:
+                f.close()
+    return count
+
+
+class _AppIndexKeys:
+    """Sequence view over the search keys of an app index, for bisect."""
+
+    def __init__(self, index: "AppListIndex"):
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, i: int) -> str:
+        return self._index.key_at(i)
+
+
+class AppListIndex:
+    """Read-only name -> appid index over Steam's full app list.
+
+    Same layout idea as SeedIndex: a header, fixed-size records and a UTF-8
+    string pool, memory-mapped and binary-searched in place. Records are
+    sorted by app_name_key, so exact and prefix lookups are a bisect and a
+    short scan; fuzzy lookups rank the neighbourhood of the query's first
+    characters by edit distance.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.built_at = 0.0
+        self._buf: mmap.mmap | None = None
+        self._keys = _AppIndexKeys(self)
+        self._count = 0
+        self._pool = 0
+
+    def open(self) -> bool:
+        self.close()
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, pool, built_at = APP_INDEX_HEADER.unpack_from(buf, 0)
+            if magic != APP_INDEX_MAGIC or APP_INDEX_HEADER.size + count * APP_INDEX_RECORD.size > pool or pool > len(buf):
+                buf.close()
+                log.error("[APPS] Ignoring malformed index: %s", self.path)
+                return False
+        except (OSError, ValueError, struct.error) as e:
+            log.error("[APPS] Failed to open %s: %s", self.path, e)
+            return False
+        self._buf, self._count, self._pool, self.built_at = buf, count, pool, built_at
+        return True
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.close()
+        self._buf = None
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def mapped_bytes(self) -> int:
+        return len(self._buf) if self._buf is not None else 0
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int]:
+        return APP_INDEX_RECORD.unpack_from(self._buf, APP_INDEX_HEADER.size + i * APP_INDEX_RECORD.size)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._pool + offset
+        return self._buf[start:start + length].decode("utf-8", "ignore")
+
+    def key_at(self, i: int) -> str:
+        _, key_off, _, key_len, _ = self._record(i)
+        return self._string(key_off, key_len)
+
+    def app_at(self, i: int) -> Dict[str, Any]:
+        appid, _, name_off, _, name_len = self._record(i)
+        return {"appid": str(appid), "name": self._string(name_off, name_len)}
+
+    def exact(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        key = app_name_key(name)
+        if not key or self._buf is None:
+            return []
+        i = bisect.bisect_left(self._keys, key)
+        result = []
+        while i < self._count and len(result) < limit and self.key_at(i) == key:
+            result.append(self.app_at(i))
+            i += 1
+        return result
+
+    def prefix(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Apps whose key starts with name's key, shortest names first."""
+        key = app_name_key(name)
+        if not key or self._buf is None:
+            return []
+        i = bisect.bisect_left(self._keys, key)
+        found = []
+        while i < self._count and len(found) < APP_INDEX_SCAN_LIMIT:
+            candidate = self.key_at(i)
+            if not candidate.startswith(key):
+                break
+            found.append((len(candidate), i))
+            i += 1
+        return [self.app_at(i) for _, i in sorted(found)[:limit]]
+
+    def fuzzy(self, name: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Closest apps by edit distance among keys sharing the query's first
+        characters. A typo in those is not recovered."""
+        key = app_name_key(name)
+        if len(key) < 3 or self._buf is None:
+            return []
+        max_distance = max(2, len(key) // 4)
+        lead = key[:3]
+        i = bisect.bisect_left(self._keys, lead)
+        scored = []
+        scanned = 0
+        while i < self._count and scanned < APP_INDEX_SCAN_LIMIT:
+            candidate = self.key_at(i)
+            if not candidate.startswith(lead):
+                break
+            if abs(len(candidate) - len(key)) <= max_distance:
+                distance = _levenshtein(key, candidate)
+                if distance <= max_distance:
+                    scored.append((distance, i))
+            scanned += 1
+            i += 1
+        return [{**self.app_at(i), "distance": d} for d, i in sorted(scored)[:limit]]
+
+    def search(self, name: str, limit: int = 5) -> Dict[str, Any]:
+        """Exact matches if any, else prefix matches, else fuzzy ones."""
+        for match, lookup in (("exact", self.exact), ("prefix", self.prefix), ("fuzzy", self.fuzzy)):
+            results = lookup(name, limit)
+            if results:
+                return {"match": match, "results": results}
+        return {"match": None, "results": []}
+
+
+# ============================================
+# Library Watcher
+# ============================================
+
+APPMANIFEST_RE = re.compile(r"^appmanifest_(\d+)\.acf$")
+VDF_NAME_RE = re.compile(r'^\s*"name"\s+"((?:[^"\\]|\\.)*)"', re.MULTILINE | re.IGNORECASE)
+VDF_PATH_RE = re.compile(r'^\s*"path"\s+"((?:[^"\\]|\\.)*)"', re.MULTILINE | re.IGNORECASE)
+
+
+def find_steam_root(home: str) -> str | None:
+    for candidate in (os.path.join(home, ".steam", "steam"), os.path.join(home, ".local", "share", "Steam")):
+        if os.path.isdir(os.path.join(candidate, "steamapps")):
+            return os.path.realpath(candidate)
+    return None
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def read_appmanifest_name(path: str) -> str:
+    match = VDF_NAME_RE.search(_read_text(path))
+    return match.group(1).replace('\\"', '"') if match else ""
+
+
+def _read_binary_vdf(data: bytes, pos: int = 0) -> tuple[Dict[str, Any], int]:
+    """One nested map of a binary VDF file; keys are lowercased."""
+    result: Dict[str, Any] = {}
+    while pos < len(data):
+        kind = data[pos]
+        pos += 1
+        if kind == 0x08:
+            return result, pos
+        end = data.index(b"\0", pos)
+        key = data[pos:end].decode("utf-8", "replace").lower()
+        pos = end + 1
+        if kind == 0x00:
+            value, pos = _read_binary_vdf(data, pos)
+        elif kind == 0x01:
+            end = data.index(b"\0", pos)
+            value = data[pos:end].decode("utf-8", "replace")
+            pos = end + 1
+        elif kind == 0x02:
+            value = struct.unpack_from("<i", data, pos)[0]
+            pos += 4
+        elif kind == 0x07:
+            value = struct.unpack_from("<Q", data, pos)[0]
+            pos += 8
+        else:
+            raise ValueError(f"unknown binary VDF type {kind:#x} at {pos - 1}")
+        result[key] = value
+    return result, pos
+
+
+def parse_shortcuts_vdf(data: bytes) -> Dict[str, str]:
+    """Non-Steam shortcut appid (as the library routes it) -> AppName."""
+    shortcuts = _read_binary_vdf(data)[0].get("shortcuts") or {}
+    result = {}
+    for entry in shortcuts.values():
+        if isinstance(entry, dict) and "appid" in entry and entry.get("appname"):
+            result[str(entry["appid"] & 0xFFFFFFFF)] = str(entry["appname"])
+    return result
+
+
+class _Inotify:
+    """Just enough of inotify(7) through libc to be woken by directory changes."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._libc = libc
+        self.fd = fd
+        self.watched: Set[str] = set()
+
+    def watch(self, path: str) -> None:
+        if path in self.watched:
+            return
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(path), LIBRARY_INOTIFY_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.watched.add(path)
+
+    def drain(self) -> None:
+        """Discard queued events; the watcher rescans the directories instead."""
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class LibraryWatcher:
+    """Reports games installed or changed while the plugin runs.
+
+    Watches every library's steamapps/ (appmanifest_*.acf) and each user's
+    shortcuts.vdf. inotify wakes it up; without inotify it polls every
+    LIBRARY_POLL_INTERVAL. Either way a wake-up only stats those files and
+    re-reads the ones whose mtime moved, so nothing is resolved twice and an
+    idle library costs nothing. The first scan is the baseline.
+    """
+
+    def __init__(self, steam_root: str, on_change: Callable[[List[tuple[str, str]]], Any]):
+        self.steam_root = steam_root
+        self.on_change = on_change
+        self.mode = "idle"
+        self._mtimes: Dict[str, int] = {}
+        self._shortcuts: Dict[str, Dict[str, str]] = {}
+        self._primed = False
+
+    def library_dirs(self) -> List[str]:
+        """steamapps/ of the main install and of every extra library folder."""
+        main_dir = os.path.join(self.steam_root, "steamapps")
+        dirs = [main_dir]
+        try:
+            for raw in VDF_PATH_RE.findall(_read_text(os.path.join(main_dir, "libraryfolders.vdf"))):
+                path = os.path.join(raw.replace("\\\\", "\\"), "steamapps")
+                if os.path.isdir(path) and os.path.realpath(path) not in map(os.path.realpath, dirs):
+                    dirs.append(path)
+        except OSError:
+            pass
+        return dirs
+
+    def shortcut_dirs(self) -> List[str]:
+        userdata = os.path.join(self.steam_root, "userdata")
+        try:
+            users = sorted(os.listdir(userdata))
+        except OSError:
+            return []
+        return [d for d in (os.path.join(userdata, u, "config") for u in users) if os.path.isdir(d)]
+
+    def watch_dirs(self) -> List[str]:
+        return self.library_dirs() + self.shortcut_dirs()
+
+    def poll(self) -> List[tuple[str, str]]:
+        """(app_id, name) for every game added or changed since the last poll."""
+        files: Dict[str, int] = {}
+        for library in self.library_dirs():
+            try:
+                with os.scandir(library) as it:
+                    for item in it:
+                        if APPMANIFEST_RE.match(item.name):
+                            files[item.path] = item.stat().st_mtime_ns
+            except OSError:
+                continue
+        for config in self.shortcut_dirs():
+            path = os.path.join(config, "shortcuts.vdf")
+            try:
+                files[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+
+        changed: List[tuple[str, str]] = []
+        for path, mtime in files.items():
+            if self._mtimes.get(path) == mtime:
+                continue
+            try:
+                if path.endswith(".vdf"):
+                    with open(path, "rb") as f:
+                        shortcuts = parse_shortcuts_vdf(f.read())
+                    known = self._shortcuts.get(path, {})
+                    changed.extend((app_id, name) for app_id, name in shortcuts.items() if known.get(app_id) != name)
+                    self._shortcuts[path] = shortcuts
+                else:
+                    app_id = APPMANIFEST_RE.match(os.path.basename(path)).group(1)
+                    changed.append((app_id, read_appmanifest_name(path)))
+            except (OSError, ValueError, struct.error) as e:
+                # Often caught mid-write; the next change event retries it
+                log.warning("[LIBRARY] Skipping %s: %s", path, e)
+                continue
+            self._mtimes[path] = mtime
+        for path in set(self._mtimes) - set(files):
+            self._mtimes.pop(path)
+            self._shortcuts.pop(path, None)
+
+        if not self._primed:
+            self._primed = True
+            return []
+        return changed
+
+    async def run(self) -> None:
+        await to_thread(self.poll)
+        try:
+            inotify: _Inotify | None = _Inotify()
+        except (OSError, AttributeError) as e:
+            log.info("[LIBRARY] inotify unavailable (%s), polling every %ss", e, LIBRARY_POLL_INTERVAL)
+            inotify = None
+        self.mode = "inotify" if inotify else "polling"
+        wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def on_readable() -> None:
+            inotify.drain()
+            wake.set()
+
+        if inotify:
+            loop.add_reader(inotify.fd, on_readable)
+        try:
+            while True:
+                if inotify:
+                    for path in self.watch_dirs():
+                        try:
+                            inotify.watch(path)
+                        except OSError as e:
+                            log.warning("[LIBRARY] Not watching %s: %s", path, e, every=100)
+                try:
+                    # With inotify the timeout only picks up new library folders / users
+                    await asyncio.wait_for(wake.wait(), LIBRARY_RESCAN_INTERVAL if inotify else LIBRARY_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                if wake.is_set():
+                    # Steam writes several files per install; take them in one pass
+                    await asyncio.sleep(LIBRARY_SETTLE_SECONDS)
+                    wake.clear()
+                changed = await to_thread(self.poll)
+                if changed:
+                    log.info("[LIBRARY] %d games added or changed", len(changed))
+                    await self.on_change(changed)
+        finally:
+            if inotify:
+                loop.remove_reader(inotify.fd)
+                inotify.close()
+
+
+# ============================================
+# Release Artifact Cache
+# ============================================
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _release_tag_from_url(url: str) -> str | None:
+    """GitHub redirects releases/latest/download/... to releases/download/<tag>/..."""
+    m = re.search(r"/releases/download/([^/]+)/", url or "")
+    return urllib.parse.unquote(m.group(1)) if m else None
+
+
+def _release_tag_from_zip(path: str) -> str | None:
+    with zipfile.ZipFile(path) as zf:
+        for name in zf.namelist():
+            if name == "plugin.json" or (name.endswith("/plugin.json") and name.count("/") == 1):
+                version = json.loads(zf.read(name)).get("version")
+                return f"v{version}" if version else None
+    return None
+
+
+class ReleaseCache:
+    """Verified release.zip files kept on disk, keyed by tag and SHA-256.
+
+    index.json maps tag -> {sha256, size, file, fetched_at, last_used} and
+    remembers which tag `latest` resolved to most recently. The directory is
+    kept under RELEASE_CACHE_MAX_BYTES by evicting least recently used tags.
+    """
+
+    def __init__(self, root: str, max_bytes: int = RELEASE_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.json")
+        self.index: Dict[str, Any] = {"releases": {}, "latest": None}
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("releases"), dict):
+                self.index = {"releases": data["releases"], "latest": data.get("latest")}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.error("[CACHE] Release cache index unreadable, starting empty: %s", e)
+
+    def _save(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def staging_path(self) -> str:
+        os.makedirs(self.root, exist_ok=True)
+        return os.path.join(self.root, f"download-{os.getpid()}-{time.monotonic_ns()}.part")
+
+    def get(self, tag: str) -> str | None:
+        """Path of the cached artifact for tag, re-verified against its hash."""
+        self._load()
+        entry = self.index["releases"].get(tag)
+        if not entry:
+            return None
+        path = os.path.join(self.root, entry["file"])
+        if not os.path.exists(path) or _sha256_file(path) != entry["sha256"]:
+            log.error("[CACHE] Dropping corrupt or missing artifact for %s", tag)
+            self._remove(tag)
+            self._save()
+            return None
+        entry["last_used"] = time.time()
+        self._save()
+        return path
+
+    def has(self, tag: str) -> bool:
+        self._load()
+        return tag in self.index["releases"]
+
+    def fresh_latest(self) -> str | None:
+        """Tag that `latest` resolved to, if that was recent enough to trust."""
+        self._load()
+        latest = self.index.get("latest")
+        if not latest or time.time() - latest.get("resolved_at", 0) > RELEASE_CACHE_FRESH_SECONDS:
+            return None
+        return latest.get("tag")
+
+    def put(self, staged_path: str, tag: str, sha256: str, size: int, is_latest: bool = False) -> str:
+        """Move a verified download into the cache and enforce the size cap."""
+        self._load()
+        filename = f"{re.sub(r'[^A-Za-z0-9._-]', '_', tag)}-{sha256[:16]}.zip"
+        path = os.path.join(self.root, filename)
+        old = self.index["releases"].get(tag)
+        if old and old["file"] != filename:
+            self._remove(tag)
+        os.replace(staged_path, path)
+        now = time.time()
+        self.index["releases"][tag] = {
+            "sha256": sha256, "size": size, "file": filename, "fetched_at": now, "last_used": now,
+        }
+        if is_latest:
+            self.index["latest"] = {"tag": tag, "resolved_at": now}
+        self._evict(keep=tag)
+        self._save()
+        return path
+
+    def releases(self) -> List[Dict[str, Any]]:
+        self._load()
+        items = [{"tag": tag, **entry} for tag, entry in self.index["releases"].items()]
+        return sorted(items, key=lambda e: e["fetched_at"], reverse=True)
+
+    def _remove(self, tag: str) -> None:
+        entry = self.index["releases"].pop(tag, None)
+        if entry:
+            try:
+                os.remove(os.path.join(self.root, entry["file"]))
+            except FileNotFoundError:
+                pass
+        latest = self.index.get("latest")
+        if latest and latest.get("tag") == tag:
+            self.index["latest"] = None
+
+    def _evict(self, keep: str) -> None:
+        entries = self.index["releases"]
+        total = sum(e["size"] for e in entries.values())
+        for tag in sorted(entries, key=lambda t: entries[t]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if tag == keep:
+                continue
+            total -= entries[tag]["size"]
+            log.info("[CACHE] Evicting cached release %s", tag)
+            self._remove(tag)
+
+
+# ============================================
+# Profiling Helpers
+# ============================================
+
+def _profile_output_path(mode: str) -> str:
+    log_dir = getattr(decky, "DECKY_PLUGIN_LOG_DIR", "") or decky.DECKY_PLUGIN_SETTINGS_DIR
+    os.makedirs(log_dir, exist_ok=True)
+    ext = "pstats" if mode == "cprofile" else "tracemalloc"
+    # Nanoseconds, so back-to-back sessions don't overwrite each other
+    ns = time.time_ns()
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(ns // 1_000_000_000))
+    return os.path.join(log_dir, f"profile-{stamp}.{ns % 1_000_000_000:09d}.{ext}")
+
+
+def _summarize_pstats(stats: pstats.Stats, top_n: int) -> List[Dict[str, Any]]:
+    """Top entries by cumulative time."""
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _callers) in stats.stats.items():  # type: ignore[attr-defined]
+        rows.append({
+            "function": func,
+            "file": filename,
+            "line": line,
+            "calls": nc,
+            "primitive_calls": cc,
+            "tottime": round(tt, 6),
+            "cumtime": round(ct, 6),
+        })
+    rows.sort(key=lambda r: r["cumtime"], reverse=True)
+    return rows[:top_n]
+
+
+def _summarize_snapshot(snapshot: tracemalloc.Snapshot, top_n: int) -> List[Dict[str, Any]]:
+    """Top allocation sites by retained size."""
+    rows = []
+    for stat in snapshot.statistics("lineno")[:top_n]:
+        frame = stat.traceback[0]
+        rows.append({
+            "file": frame.filename,
+            "line": frame.lineno,
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        })
+    return rows
+
+
+# ============================================
+# Memory Budget
+# ============================================
+
+def _footprint(records: Dict[str, Any]) -> int:
+    """Bytes held by a dict of __slots__ records, counting shared objects once."""
+    seen = set()
+    total = sys.getsizeof(records)
+    for key, record in records.items():
+        for obj in (key, record, *(getattr(record, name) for name in record.__slots__)):
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                total += sys.getsizeof(obj)
+    return total
+
+
+def read_memory_pressure(meminfo_path: str = "/proc/meminfo", psi_path: str = "/proc/pressure/memory") -> Dict[str, Any]:
+    """System memory state from /proc/meminfo and PSI; missing files read as no pressure."""
+    available_ratio = None
+    psi_some = None
+    try:
+        with open(meminfo_path, "r", encoding="utf-8") as f:
+            info = {line.split(":")[0]: int(line.split()[1]) for line in f if ":" in line}
+        if info.get("MemTotal"):
+            available_ratio = round(info.get("MemAvailable", info["MemTotal"]) / info["MemTotal"], 3)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open(psi_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("some"):
+                    psi_some = float(line.split("avg10=")[1].split()[0])
+    except (OSError, ValueError, IndexError):
+        pass
+    under_pressure = (available_ratio is not None and available_ratio < MEMORY_MIN_AVAILABLE) or (
+        psi_some is not None and psi_some >= MEMORY_PSI_SOME_AVG10
+    )
+    return {"available_ratio": available_ratio, "psi_some_avg10": psi_some, "under_pressure": under_pressure}
+
+
+class MemoryBudget:
+    """Keeps the plugin's in-process caches small while games share the RAM.
+
+    Caches register as tiers, cheapest to rebuild first, each with a
+    footprint() and a trim(fraction) that drops its least recently used
+    part. enforce() trims everything when the system is under memory
+    pressure, and otherwise trims tiers in order only while the heap tiers
+    together exceed budget_bytes. Non-heap tiers (the mmap'd seed index)
+    are reported but only given up under pressure.
+    """
+
+    def __init__(self, budget_bytes: int = MEMORY_BUDGET_BYTES, pressure: Callable[[], Dict[str, Any]] = read_memory_pressure):
+        self.budget_bytes = budget_bytes
+        self.pressure = pressure
+        self.tiers: List[tuple[str, Callable[[], int], Callable[[float], int], bool]] = []
+        self.last_trim: Dict[str, Any] | None = None
+
+    def register(self, name: str, footprint: Callable[[], int], trim: Callable[[float], int], heap: bool = True) -> None:
+        self.tiers.append((name, footprint, trim, heap))
+
+    def footprint(self) -> Dict[str, int]:
+        return {name: footprint() for name, footprint, _trim, _heap in self.tiers}
+
+    def heap_bytes(self) -> int:
+        return sum(footprint() for _name, footprint, _trim, heap in self.tiers if heap)
+
+    def enforce(self) -> Dict[str, int]:
+        """Trim as needed. Returns what was dropped per tier."""
+        trimmed: Dict[str, int] = {}
+        pressure = self.pressure()
+        if pressure["under_pressure"]:
+            reason = "system memory pressure"
+            for name, _footprint, trim, _heap in self.tiers:
+                trimmed[name] = trim(MEMORY_PRESSURE_TRIM)
+        else:
+            reason = "over budget"
+            for name, _footprint, trim, heap in self.tiers:
+                while heap and self.heap_bytes() > self.budget_bytes:
+                    dropped = trim(MEMORY_BUDGET_TRIM)
+                    if not dropped:
+                        break
+                    trimmed[name] = trimmed.get(name, 0) + dropped
+        trimmed = {name: n for name, n in trimmed.items() if n}
+        if trimmed:
+            self.last_trim = {"at": int(time.time()), "reason": reason, "trimmed": trimmed, "pressure": pressure}
+            log.info("[MEMORY] Trimmed caches (%s): %s", reason, trimmed)
+        return trimmed
+
+    def report(self) -> Dict[str, Any]:
+        tiers = self.footprint()
+        return {
+            "budget_bytes": self.budget_bytes,
+            "heap_bytes": sum(tiers[name] for name, _f, _t, heap in self.tiers if heap),
+            "tiers": tiers,
+            "pressure": self.pressure(),
+            "last_trim": self.last_trim,
+        }
 
 
 # ============================================
@@ -96,17 +2489,82 @@ async def http_get_binary(url: str, headers: Dict[str, str] | None = None) -> by
 class Plugin:
     settings: Settings = DEFAULT_SETTINGS.copy()
     settings_file: str = ""
+    _profile: Dict[str, Any] | None = None
+    _last_profile: Dict[str, Any] | None = None
+    _seed: SeedIndex | None = None
+    _app_index: AppListIndex | None = None
+    _app_index_task: "asyncio.Task[bool] | None" = None
+    _app_index_failures: int = 0
+    _app_index_retry_at: float = 0.0
+    _release_cache: ReleaseCache | None = None
+    _background_enabled: bool = False
+    _prefetch: Dict[str, Any] | None = None
+    _status_cache: StatusCache | None = None
+    _status_tasks: Dict[str, "asyncio.Task[None]"] | None = None
+    _status_waiters: Dict[str, Set[str]] | None = None
+    _status_requests: Dict[str, str] | None = None
+    _status_background: Dict[str, BackgroundWork] | None = None
+    _status_slots: asyncio.Semaphore | None = None
+    _hints: "collections.deque[tuple[str, float]] | None" = None
+    _hint_generation: int = 0
+    _hint_requests: List[str] | None = None   # request ids the current hint's lookups wait on
+    _hint_task: "asyncio.Task[None] | None" = None
+    _health_task: "asyncio.Task[None] | None" = None
+    _last_update_check: Dict[str, Any] | None = None
+    _current_version: str | None = None
+    _update_check_task: "asyncio.Task[Any] | None" = None
+    _memory: MemoryBudget | None = None
+    _memory_task: "asyncio.Task[None] | None" = None
+    _library: LibraryWatcher | None = None
+    _library_task: "asyncio.Task[None] | None" = None
 
     # Lifecycle Methods
     async def _main(self):
         """Called when plugin loads."""
-        decky.logger.info("decky-ukr-badge: _main called")
+        global _http_cache, _data_usage
+        log.info("decky-ukr-badge: _main called")
+        runtime_dir = getattr(decky, "DECKY_PLUGIN_RUNTIME_DIR", "") or decky.DECKY_PLUGIN_SETTINGS_DIR
+        _data_usage = DataUsage(os.path.join(runtime_dir, DATA_USAGE_FILE))
+        await to_thread(_data_usage.load)
         self.settings_file = os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, "settings.json")
         self._load_settings()
+        self._background_enabled = True
+        _http_cache = HttpCache(os.path.join(runtime_dir, HTTP_CACHE_DIR))
+        self._health_task = asyncio.create_task(self._probe_hosts())
+        self._memory_task = asyncio.create_task(self._watch_memory())
+        self._library_task = asyncio.create_task(self._watch_library())
 
     async def _unload(self):
         """Called when plugin unloads."""
-        decky.logger.info("decky-ukr-badge: _unload called")
+        log.info("decky-ukr-badge: _unload called")
+        self._background_enabled = False
+        if self._prefetch:
+            self._prefetch["task"].cancel()
+        if self._health_task:
+            self._health_task.cancel()
+        if self._update_check_task:
+            self._update_check_task.cancel()
+        if self._memory_task:
+            self._memory_task.cancel()
+        if self._library_task:
+            self._library_task.cancel()
+        if self._profile:
+            await self.stop_profiling()
+        if self._hint_task:
+            self._hint_task.cancel()
+        for task in (self._status_tasks or {}).values():
+            task.cancel()
+        if self._status_cache:
+            self._status_cache.flush()
+        if self._seed:
+            self._seed.close()
+        if self._app_index_task:
+            self._app_index_task.cancel()
+        if self._app_index:
+            self._app_index.close()
+        if _http_cache:
+            _http_cache.flush()
+        _data_usage.flush()
 
     # Settings Management
     def _load_settings(self) -> Settings:
@@ -115,12 +2573,20 @@ class Plugin:
                 with open(self.settings_file, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     self.settings = {**DEFAULT_SETTINGS, **data}
-                    decky.logger.info(f"Settings loaded: {self.settings}")
+                    log.debug("Settings loaded", keys=len(self.settings))
+                    self._apply_data_saver()
                     return self.settings
             except Exception as e:
-                decky.logger.error(f"Settings load failed: {e}")
+                log.error("Settings load failed: %s", e)
         return self.settings
 
+    def _apply_data_saver(self) -> None:
+        try:
+            daily_mb = int(self.settings.get("dataSaverDailyMB") or DEFAULT_SETTINGS["dataSaverDailyMB"])
+        except (TypeError, ValueError):
+            daily_mb = DEFAULT_SETTINGS["dataSaverDailyMB"]
+        _data_usage.configure(bool(self.settings.get("dataSaver")), daily_mb * 1024 * 1024)
+
     def _save_settings(self) -> bool:
         try:
             os.makedirs(os.path.dirname(self.settings_file), exist_ok=True)
@@ -128,44 +2594,535 @@ class Plugin:
                 json.dump(self.settings, f, indent=2)
             return True
         except Exception as e:
-            decky.logger.error(f"Settings save failed: {e}")
+            log.error("Settings save failed: %s", e)
             return False
 
     # Public API Methods (called from frontend)
     async def get_settings(self) -> Settings:
-        decky.logger.info("get_settings called")
+        log.debug("get_settings called")
         return self._load_settings()
 
     async def set_settings(self, key: str, value: Any) -> bool:
-        decky.logger.info(f"set_settings: {key}={value}")
+        log.info("set_settings", key=key, value=value)
+        if key == "targetLanguage" and not language_bit(str(value)):
+            return False
         if key in DEFAULT_SETTINGS:
+            previous = self.settings.get(key)
             self.settings[key] = value  # type: ignore
-            return self._save_settings()
+            saved = self._save_settings()
+            if key in ("dataSaver", "dataSaverDailyMB"):
+                self._apply_data_saver()
+            if key == "targetLanguage" and previous != value:
+                await self._emit_language_switch(str(previous), str(value))
+            return saved
         return False
 
     async def get_current_version(self) -> str:
-        """Get current plugin version from plugin.json."""
+        """Get current plugin version from plugin.json.
+
+        Read once: an installed update only runs after a restart, so the
+        running version can't change underneath us.
+        """
+        if self._current_version is None:
+            version = await to_thread(self._read_current_version)
+            if version == "unknown":
+                return version
+            self._current_version = version
+        return self._current_version
+
+    def _read_current_version(self) -> str:
         try:
             plugin_dir = os.path.dirname(os.path.abspath(__file__))
             plugin_json_path = os.path.join(plugin_dir, "plugin.json")
-            decky.logger.info(f"[VERSION] Looking for: {plugin_json_path}")
+            log.debug("[VERSION] Looking for: %s", plugin_json_path)
 
             if os.path.exists(plugin_json_path):
                 with open(plugin_json_path, "r", encoding="utf-8") as f:
                     plugin_data = json.load(f)
                     version = plugin_data.get("version", "0.0.0")
-                    decky.logger.info(f"[VERSION] Read: {version}")
+                    log.debug("[VERSION] Read: %s", version)
                     return version
             else:
-                decky.logger.error("[VERSION] plugin.json not found!")
+                log.error("[VERSION] plugin.json not found!")
             return "0.0.0"
         except Exception as e:
-            decky.logger.error(f"get_current_version failed: {e}")
+            log.error("get_current_version failed: %s", e)
             return "unknown"
 
+    async def get_seed_status(self, app_id: str) -> Dict[str, Any] | None:
+        """Look up a Steam appid in the bundled seed index (no network)."""
+        try:
+            appid = int(app_id)
+        except (TypeError, ValueError):
+            return None
+        if self._seed is None:
+            plugin_dir = os.path.dirname(os.path.abspath(__file__))
+            self._seed = SeedIndex(os.path.join(plugin_dir, SEED_INDEX_FILE))
+            if self._seed.open():
+                log.info("[SEED] Loaded index: %d entries", len(self._seed))
+        hit = self._seed.lookup(appid)
+        if hit is None:
+            return None
+        status, slug = hit
+        return {"status": status, "slug": slug, "url": f"{KULI_BASE_URL}{slug}" if slug else None}
+
+    async def find_steam_app(self, name: str, limit: int = 5) -> Dict[str, Any]:
+        """Map a game name to Steam apps through the local app list index.
+
+        Exact matches win over prefix matches, which win over fuzzy ones.
+        The first call starts downloading Steam's app list in the background
+        and fails with `pending` until the index is built; lookups after that
+        never touch the network.
+        """
+        index = await self._get_app_index()
+        if index is None:
+            return {"success": False, "error": "Steam app list unavailable", "pending": self._app_index_task is not None}
+        found = await to_thread(index.search, name, max(1, min(int(limit), 50)))
+        return {"success": True, **found, "apps": len(index)}
+
+    def _app_index_path(self) -> str:
+        runtime_dir = getattr(decky, "DECKY_PLUGIN_RUNTIME_DIR", "") or decky.DECKY_PLUGIN_SETTINGS_DIR
+        return os.path.join(runtime_dir, APP_INDEX_FILE)
+
+    async def _get_app_index(self) -> AppListIndex | None:
+        """Open the app list index, or None while it is first being built.
+
+        Lookups never wait on Steam's app list: a missing index is built and
+        an old one refreshed in the background, which keeps serving the old one.
+        """
+        if self._app_index is None and self._app_index_task is None:
+            index = AppListIndex(self._app_index_path())
+            if await to_thread(index.open):
+                self._app_index = index
+                log.info("[APPS] Loaded index: %d apps", len(index))
+        if self._app_index is None or (
+            time.time() - self._app_index.built_at > APP_INDEX_REFRESH_SECONDS and not _data_usage.saver
+        ):
+            self._schedule_app_index_refresh()
+        return self._app_index
+
+    def _schedule_app_index_refresh(self) -> "asyncio.Task[bool] | None":
+        """Start a build unless one is running or the last one failed too recently."""
+        if self._app_index_task is None and time.time() >= self._app_index_retry_at:
+            self._app_index_task = asyncio.create_task(self._refresh_app_index())
+        return self._app_index_task
+
+    async def _refresh_app_index(self) -> bool:
+        """Download Steam's app list and swap in a freshly built index.
+
+        The public list has no delta endpoint, so a refresh fetches it whole;
+        the swap is atomic and lookups keep using the old mapping until then.
+        """
+        path = self._app_index_path()
+        download_path = f"{path}.json.part"
+        # Nobody waits on a build, not even the first one
+        mark_background()
+        built = False
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if await http_download(STEAM_APP_LIST_URL, download_path) is None:
+                return False
+            previous = len(self._app_index) if self._app_index else 0
+
+            def install() -> AppListIndex | None:
+                # Streamed from the download into the new file, never held whole
+                count = write_app_index(iter_app_list(download_path), f"{path}.part", time.time())
+                if count < previous // 2:
+                    # Steam occasionally serves a truncated list; keep what we have
+                    log.warning("[APPS] Ignoring app list with %d apps, index has %d", count, previous)
+                    os.remove(f"{path}.part")
+                    return None
+                os.replace(f"{path}.part", path)
+                index = AppListIndex(path)
+                index.open()
+                return index
+
+            index = await to_thread(install)
+            if index is None:
+                return False
+            # The old mapping may be mid-lookup in a worker thread; it is
+            # unmapped once the last reference goes away.
+            self._app_index = index
+            log.info("[APPS] Indexed %d apps (%+d)", len(self._app_index), len(self._app_index) - previous)
+            built = True
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("[APPS] App list refresh failed: %s", e)
+            return False
+        finally:
+            self._app_index_task = None
+            if built:
+                self._app_index_failures = 0
+                self._app_index_retry_at = 0.0
+            else:
+                self._app_index_failures += 1
+                delay = min(APP_INDEX_RETRY_SECONDS * 2 ** (self._app_index_failures - 1), APP_INDEX_RETRY_MAX_SECONDS)
+                self._app_index_retry_at = time.time() + delay
+                log.info("[APPS] Next app list build in %ds", delay)
+            try:
+                os.remove(download_path)
+            except OSError:
+                pass
+
+    def _get_status_cache(self) -> StatusCache:
+        if self._status_cache is None:
+            runtime_dir = getattr(decky, "DECKY_PLUGIN_RUNTIME_DIR", "") or decky.DECKY_PLUGIN_SETTINGS_DIR
+            self._status_cache = StatusCache(os.path.join(runtime_dir, STATUS_CACHE_FILE))
+        return self._status_cache
+
+    async def get_badge_status(self, app_id: str, app_name: str = "", request_id: str = "") -> Dict[str, Any]:
+        """Answer from the status cache or seed index right away.
+
+        Anything missing or stale is resolved in the background and pushed
+        to the frontend as a `badge_status` event, so the UI never waits on
+        Steam or kuli here. `pending` tells the caller an event will follow;
+        passing a request_id lets the caller `cancel` that work later.
+        """
+        key = str(app_id)
+        cache = self._get_status_cache()
+        await cache.restore([key])
+        entry = cache.get(key)
+        if entry is None and is_steam_app_id(key):
+            seed = await self.get_seed_status(key)
+            if seed:
+                entry = cache.put(key, seed["status"], seed["url"], "seed")
+        if entry is not None:
+            # Resolved for another language without asking kuli: only Steam's answer is known
+            stale = not cache.is_fresh(entry) or (entry.source == "steam" and kuli_covers(self._target_language()))
+            # Data saver: stale answers are served as they are
+            if stale and not _data_usage.saver:
+                self._schedule_status_resolution(key, app_name, revalidate=True, request_id=request_id)
+            status = status_for_language(entry, self._target_language())
+            return {"app_id": key, "status": status, "url": entry.url, "pending": False, "stale": stale}
+
+        self._schedule_status_resolution(key, app_name, revalidate=False, request_id=request_id)
+        return {"app_id": key, "status": None, "url": None, "pending": True, "stale": False}
+
+    async def get_language_support(self, app_id: str) -> Dict[str, Any] | None:
+        """Cached Steam language support for app_id (no network)."""
+        cache = self._get_status_cache()
+        await cache.restore([str(app_id)])
+        entry = cache.get(str(app_id))
+        if not entry or not entry.languages:
+            return None
+        listed, audio = entry.languages
+        return {"interface": language_codes(listed), "full_audio": language_codes(audio)}
+
+    async def get_translation_details(self, app_id: str) -> Dict[str, Any] | None:
+        """Cached kuli translation details for app_id (no network).
+
+        authors, version, updated, install and download_url, as far as the
+        kuli page states them.
+        """
+        cache = self._get_status_cache()
+        await cache.restore([str(app_id)])
+        entry = cache.get(str(app_id))
+        if not entry or not entry.details:
+            return None
+        return {"url": entry.url, **entry.details}
+
+    def _target_language(self) -> str:
+        return str(self.settings.get("targetLanguage") or DEFAULT_SETTINGS["targetLanguage"])
+
+    async def _emit_language_switch(self, previous: str, language: str) -> None:
+        """Re-answer every cached app for the new target language and push what changed."""
+        cache = self._get_status_cache()
+        cache._load()
+        await cache.restore(list(cache._trimmed))
+        changed = 0
+        for app_id, entry in list(cache.entries.items()):
+            status = status_for_language(entry, language)
+            if status != status_for_language(entry, previous):
+                changed += 1
+                await emit_event("badge_status", {"app_id": app_id, "status": status, "url": entry.url})
+        log.info("[STATUS] Target language %s -> %s: %d badges changed", previous, language, changed)
+
+    def _schedule_status_resolution(self, app_id: str, app_name: str, revalidate: bool, request_id: str = "") -> None:
+        """Resolve app_id once, however many badges asked for it, and emit the outcome.
+
+        Every caller is recorded as a waiter on the lookup; callers without a
+        request_id can't cancel, so their lookups always run to the end.
+        Revalidation and lookups started by background tasks are background
+        work, until a foreground caller joins them.
+        """
+        if self._status_tasks is None:
+            self._status_tasks = {}
+            self._status_waiters = {}
+            self._status_requests = {}
+            self._status_background = {}
+        request_id = str(request_id or "")
+        self._status_waiters.setdefault(app_id, set()).add(request_id)
+        if request_id:
+            self._status_requests[request_id] = app_id
+        background = revalidate or is_background()
+        if app_id in self._status_tasks:
+            work = self._status_background.get(app_id)
+            if work is not None and not background:
+                work.promote()
+            return
+        if self._status_slots is None:
+            self._status_slots = asyncio.Semaphore(STATUS_RESOLVE_CONCURRENCY)
+        slots = self._status_slots
+        if background:
+            self._status_background[app_id] = BackgroundWork()
+
+        async def resolve() -> None:
+            _background_work.set(self._status_background.get(app_id))
+            try:
+                language = self._target_language()
+                with_kuli = kuli_covers(language)
+                source = "network" if with_kuli else "steam"
+                async with slots:
+                    result = await resolve_badge_status(app_id, app_name, with_kuli)
+                cache = self._get_status_cache()
+                await cache.restore([app_id])
+                previous = cache.get(app_id)
+                if result["complete"]:
+                    entry = cache.put(
+                        app_id, result["status"], result["url"], source, result["languages"], result["details"]
+                    )
+                    await cache.save()
+                elif previous is not None:
+                    # Offline: keep serving what we had rather than downgrading it
+                    return
+                else:
+                    entry = StatusRecord(
+                        result["status"], result["url"], source, time.time(), result["languages"], result["details"]
+                    )
+                status = status_for_language(entry, language)
+                changed = previous is None or (status_for_language(previous, language), previous.url) != (status, entry.url)
+                if not changed and _translation_version(previous) != _translation_version(entry):
+                    log.info("[STATUS] Translation updated", app_id=app_id, version=_translation_version(entry))
+                    changed = True
+                if changed or not revalidate:
+                    log.info("[STATUS] Resolved", app_id=app_id, status=status)
+                    await emit_event("badge_status", {"app_id": app_id, "status": status, "url": entry.url})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("[STATUS] Resolving %s failed: %s", app_id, e)
+            finally:
+                if self._status_tasks is not None:
+                    self._status_tasks.pop(app_id, None)
+                    self._status_background.pop(app_id, None)
+                    for waiter in self._status_waiters.pop(app_id, ()):
+                        self._status_requests.pop(waiter, None)
+
+        self._status_tasks[app_id] = asyncio.create_task(resolve())
+
+    async def cancel(self, request_id: str) -> bool:
+        """Withdraw request_id from its lookup, aborting the lookup if nobody else waits on it.
+
+        Queued lookups never touch the network; in-flight ones stop at their
+        next await. Returns True when work was actually aborted.
+        """
+        request_id = str(request_id or "")
+        app_id = (self._status_requests or {}).pop(request_id, None) if request_id else None
+        if app_id is None:
+            return False
+        waiters = self._status_waiters.get(app_id, set())
+        waiters.discard(request_id)
+        task = self._status_tasks.get(app_id)
+        if waiters or task is None or task.done():
+            return False
+        task.cancel()
+        log.debug("[STATUS] Cancelled lookup", app_id=app_id, request_id=request_id)
+        return True
+
+    async def prefetch_hint(self, app_ids: List[str]) -> Dict[str, Any]:
+        """Resolve apps the user is likely to open next, at speculative priority.
+
+        Each hint replaces the previous one: its queued apps are dropped and
+        its in-flight lookup is cancelled unless a page is waiting on it.
+        Apps cached fresh, in the seed index or already being resolved are
+        skipped, and at most PREFETCH_HINT_BUDGET of the rest are looked up,
+        one at a time, so foreground lookups keep the other slots.
+        """
+        self._hint_generation += 1
+        previous, self._hint_requests = self._hint_requests or [], []
+        for request_id in previous:
+            await self.cancel(request_id)
+        if _data_usage.saver:
+            self._hints = None
+            return {"queued": []}
+        cache = self._get_status_cache()
+        # One read of the status file for the whole hint, if anything in it was trimmed
+        await cache.restore(str(raw) for raw in app_ids or [])
+        queued: List[str] = []
+        for raw in app_ids or []:
+            app_id = str(raw)
+            # Shortcuts need a name to resolve; hints only carry ids
+            if app_id in queued or not is_steam_app_id(app_id) or app_id in (self._status_tasks or {}):
+                continue
+            entry = cache.peek(app_id)
+            if entry is None:
+                # The seed answers the page when it opens; caching it here
+                # would only count an unopened app as used and fresh
+                if await self.get_seed_status(app_id):
+                    continue
+            elif cache.is_fresh(entry):
+                continue
+            queued.append(app_id)
+            if len(queued) >= PREFETCH_HINT_BUDGET:
+                break
+
+        now = time.time()
+        self._hints = collections.deque((app_id, now) for app_id in queued)
+        if queued and (self._hint_task is None or self._hint_task.done()):
+            self._hint_task = asyncio.create_task(self._run_hints())
+        log.debug("[PREFETCH] Hint", offered=len(app_ids or []), queued=len(queued))
+        return {"queued": queued}
+
+    async def _run_hints(self) -> None:
+        mark_background()
+        while self._hints:
+            app_id, hinted_at = self._hints.popleft()
+            if time.time() - hinted_at > PREFETCH_HINT_MAX_AGE:
+                continue
+            # One request id per app: a finished lookup releases only its own
+            request_id = f"hint:{self._hint_generation}:{app_id}"
+            self._hint_requests.append(request_id)
+            self._schedule_status_resolution(app_id, "", revalidate=True, request_id=request_id)
+            task = (self._status_tasks or {}).get(app_id)
+            if task is not None:
+                # wait() rather than await: cancelling this worker must not
+                # cancel a lookup a page may have joined
+                await asyncio.wait({task})
+
+    async def _probe_hosts(self) -> None:
+        """Background probe that closes circuits and ends offline mode once hosts are reachable."""
+        while self._background_enabled:
+            await asyncio.sleep(HEALTH_PROBE_INTERVAL)
+            for host in _host_health.hosts_to_probe():
+                if await to_thread(_probe_host, host):
+                    _host_health.mark_reachable(host)
+
+    def _get_memory_budget(self) -> MemoryBudget:
+        if self._memory is None:
+            budget = MemoryBudget()
+
+            def seed_footprint() -> int:
+                return self._seed.mapped_bytes if self._seed else 0
+
+            def seed_trim(_fraction: float) -> int:
+                # File-backed and reopened on the next lookup
+                if not self._seed or not self._seed.mapped_bytes:
+                    return 0
+                self._seed.close()
+                self._seed = None
+                return 1
+
+            budget.register("seed_index", seed_footprint, seed_trim, heap=False)
+
+            def app_index_trim(_fraction: float) -> int:
+                # Reopened by the next find_steam_app
+                if not self._app_index or not self._app_index.mapped_bytes:
+                    return 0
+                self._app_index = None
+                return 1
+
+            budget.register(
+                "app_index", lambda: self._app_index.mapped_bytes if self._app_index else 0, app_index_trim, heap=False
+            )
+            budget.register("latency", lambda: _host_latency.footprint(), lambda f: _host_latency.trim(f))
+            budget.register(
+                "http_index",
+                lambda: _http_cache.footprint() if _http_cache else 0,
+                lambda f: _http_cache.trim(f) if _http_cache else 0,
+            )
+            budget.register(
+                "status", lambda: self._get_status_cache().footprint(), lambda f: self._get_status_cache().trim(f)
+            )
+            self._memory = budget
+        return self._memory
+
+    async def _watch_memory(self) -> None:
+        while self._background_enabled:
+            await asyncio.sleep(MEMORY_CHECK_INTERVAL)
+            try:
+                if self._get_memory_budget().enforce() and self._status_cache:
+                    await self._status_cache.save()
+            except Exception as e:
+                log.error("[MEMORY] Budget check failed: %s", e)
+            if _http_cache:
+                try:
+                    await to_thread(_http_cache.flush)
+                except OSError as e:
+                    log.error("[HTTP_CACHE] Saving the index failed: %s", e)
+
+    async def _watch_library(self) -> None:
+        mark_background()
+        home = getattr(decky, "DECKY_USER_HOME", "") or os.path.expanduser("~")
+        root = find_steam_root(home)
+        if root is None:
+            log.info("[LIBRARY] No Steam install under %s, not watching", home)
+            return
+        self._library = LibraryWatcher(root, self._on_library_change)
+        try:
+            await self._library.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("[LIBRARY] Watcher stopped: %s", e)
+
+    async def _on_library_change(self, games: List[tuple[str, str]]) -> None:
+        """Warm the status cache for new or changed games; ones already
+        fresh in the cache cost nothing."""
+        if _data_usage.saver:
+            return
+        for app_id, name in games:
+            await self.get_badge_status(app_id, name)
+
+    async def get_memory_report(self) -> Dict[str, Any]:
+        """Footprint of the in-process caches, system memory pressure and the last trim."""
+        return self._get_memory_budget().report()
+
+    async def get_data_usage(self) -> Dict[str, Any]:
+        """Bytes fetched per host today, daily totals and the data-saver state."""
+        return await to_thread(_data_usage.snapshot)
+
+    async def get_network_status(self) -> Dict[str, Any]:
+        """Offline flag, per-host circuit state and observed latency of the HTTP layer."""
+        return {**_host_health.snapshot(), "latency": _host_latency.snapshot()}
+
     async def get_latest_version(self) -> Dict[str, Any]:
         """Check GitHub for latest version based on highest valid semver tag in recent releases."""
-        return await self._check_latest_version_internal(include_debug=False)
+        result = await self._check_latest_version_internal(include_debug=False)
+        self._last_update_check = result
+        await emit_event("update_check", result)
+        return result
+
+    async def bootstrap(self, app_id: str = "", app_name: str = "", request_id: str = "") -> Dict[str, Any]:
+        """Everything a page needs on load, in one call.
+
+        Settings are the in-memory ones _main loaded, the installed version
+        is read once and the update state is the last check's result. Nothing
+        here waits on the network: an unresolved badge or an old update check
+        is refreshed in the background and arrives as an event, and
+        request_id makes that status lookup cancellable.
+        """
+        async def badge_status() -> Dict[str, Any] | None:
+            return await self.get_badge_status(app_id, app_name, request_id) if app_id else None
+
+        version, status = await asyncio.gather(self.get_current_version(), badge_status())
+        settings = self.settings
+        update = self._last_update_check
+        if (update is None or time.time() - update.get("checked_at", 0) > UPDATE_CHECK_MAX_AGE) and (
+            self._background_enabled and self._update_check_task is None and not _data_usage.saver
+        ):
+            self._update_check_task = asyncio.create_task(self._background_update_check())
+        return {"settings": settings, "version": version, "update": update, "status": status}
+
+    async def _background_update_check(self) -> None:
+        mark_background()
+        try:
+            await self.get_latest_version()
+        except Exception as e:
+            log.error("[UPDATE] Background version check failed: %s", e)
+        finally:
+            self._update_check_task = None
 
     async def debug_version_check(self) -> Dict[str, Any]:
         """Temporary diagnostics endpoint for Steam Deck runtime troubleshooting."""
@@ -190,7 +3147,7 @@ class Plugin:
         current_version_raw = await self.get_current_version()
         current_version = normalize_semver_core(current_version_raw)
         current_tuple = parse_version_tuple(current_version)
-        github_api = "https://api.github.com/repos/yataktyni/decky-ukr-badge/releases?per_page=20"
+        github_api = GITHUB_RELEASES_API
 
         # Defensive sanitization in case runtime/plugin files accidentally mutate value
         github_api = (github_api or "").strip().split()[0]
@@ -211,25 +3168,8 @@ class Plugin:
             base_result["current_raw"] = current_version_raw
             base_result["github_api"] = github_api
 
-        try:
-            if not github_api.startswith("https://api.github.com/repos/yataktyni/decky-ukr-badge/releases"):
-                base_result["error"] = f"Misconfigured GitHub API URL: {github_api}"
-                return base_result
-
-            response = await http_get(github_api)
-            if not response:
-                base_result["error"] = "GitHub releases request failed or returned empty response"
-                return base_result
-
-            releases = json.loads(response)
-            if not isinstance(releases, list):
-                base_result["error"] = "GitHub releases API returned non-list JSON"
-                return base_result
-
-            best_tag = ""
-            best_version = "0.0.0"
-            best_tuple = (0, 0, 0)
-
+        def stable_candidates(releases: List[Any]) -> List[tuple[tuple[int, int, int], str, str]]:
+            found = []
             for release in releases:
                 if not isinstance(release, dict):
                     continue
@@ -241,25 +3181,74 @@ class Plugin:
                 tag_name = str(release.get("tag_name", "")).strip()
                 version = normalize_semver_core(tag_name)
                 version_tuple = parse_version_tuple(version)
-                if version_tuple > best_tuple:
-                    best_tuple = version_tuple
-                    best_version = version
-                    best_tag = tag_name
+                if version_tuple > (0, 0, 0):
+                    found.append((version_tuple, version, tag_name))
+            return found
 
-            if best_tag == "":
+        try:
+            if not github_api.startswith("https://api.github.com/repos/yataktyni/decky-ukr-badge/releases"):
+                base_result["error"] = f"Misconfigured GitHub API URL: {github_api}"
+                return base_result
+
+            sources: List[str] = []
+            payload_bytes = 0
+            candidates: List[tuple[tuple[int, int, int], str, str]] = []
+
+            # 1. releases/latest: a single release object, GitHub's newest stable release
+            response = await http_get(f"{github_api}/latest")
+            if response:
+                sources.append("latest")
+                payload_bytes += len(response)
+                try:
+                    latest = json.loads(response)
+                except ValueError:
+                    latest = None
+                if isinstance(latest, dict):
+                    candidates = stable_candidates([latest])
+
+            # 2. Fallback: page through the release list, newest first, and stop
+            #    at the first page that has a stable release on it
+            page = 1
+            while not candidates and page <= RELEASE_FEED_MAX_PAGES:
+                response = await http_get(f"{github_api}?per_page={RELEASE_FEED_PAGE_SIZE}&page={page}")
+                if not response:
+                    break
+                sources.append(f"page{page}")
+                payload_bytes += len(response)
+                releases = json.loads(response)
+                if not isinstance(releases, list):
+                    base_result["error"] = "GitHub releases API returned non-list JSON"
+                    return base_result
+                candidates = stable_candidates(releases)
+                if len(releases) < RELEASE_FEED_PAGE_SIZE:
+                    break
+                page += 1
+
+            if include_debug:
+                base_result["sources"] = sources
+                base_result["payload_bytes"] = payload_bytes
+
+            if not sources:
+                base_result["error"] = "GitHub releases request failed or returned empty response"
+                return base_result
+
+            if not candidates:
                 base_result["source_ok"] = True
                 base_result["error"] = "No stable releases found"
                 return base_result
 
+            best_tuple, best_version, best_tag = max(candidates)
+
             update_available = best_tuple > current_tuple
             base_result["source_ok"] = True
             base_result["latest"] = best_version
             base_result["latest_tag"] = best_tag
             base_result["update_available"] = update_available
+            if update_available:
+                base_result["update_staged"] = await self._schedule_update_prefetch(best_tag)
 
-            decky.logger.info(
-                f"Version check: current={current_version_raw} ({current_version}), "
-                f"selected_tag={best_tag} ({best_version}), update={update_available}"
+            log.info(
+                "Version check", current=current_version, selected_tag=best_tag, update=update_available
             )
 
             if include_debug:
@@ -270,82 +3259,313 @@ class Plugin:
 
         except Exception as e:
             err = f"Version check failed: {e}"
-            decky.logger.error(err)
+            log.error("%s", err)
             base_result["error"] = err
             return base_result
 
-    async def _download_and_extract_latest_release(self) -> Dict[str, Any]:
-        """Download and install latest release.zip from GitHub."""
-        import zipfile
-        import io
-
-        release_url = "https://github.com/yataktyni/decky-ukr-badge/releases/latest/download/release.zip"
-        plugin_dir = os.path.dirname(os.path.abspath(__file__))
-
+    def _get_release_cache(self) -> ReleaseCache:
+        if self._release_cache is None:
+            self._release_cache = ReleaseCache(os.path.join(decky.DECKY_PLUGIN_SETTINGS_DIR, RELEASE_CACHE_DIR))
+        return self._release_cache
+
+    async def _fetch_release_zip(
+        self, tag: str | None = None, throttle: DownloadThrottle | None = None
+    ) -> tuple[str, str] | Dict[str, Any]:
+        """Return (tag, path) of a verified release.zip, from the cache when possible.
+
+        With a tag, only that release is acceptable. Without one, `latest` is
+        used and served from cache if it was resolved recently.
+        """
+        cache = self._get_release_cache()
+        cached_tag = tag or await to_thread(cache.fresh_latest)
+        if cached_tag:
+            path = await to_thread(cache.get, cached_tag)
+            if path:
+                log.info("[UPDATE] Using cached release.zip for %s", cached_tag)
+                return cached_tag, path
+
+        url = RELEASE_ZIP_URL if tag is None else (
+            f"https://github.com/yataktyni/decky-ukr-badge/releases/download/{urllib.parse.quote(tag)}/release.zip"
+        )
+        staged = cache.staging_path()
         try:
-            decky.logger.info("[UPDATE] Downloading release.zip...")
-            zip_data = await http_get_binary(release_url)
-            if not zip_data:
+            log.info("[UPDATE] Downloading release.zip...")
+            info = await http_download(url, staged, throttle=throttle)
+            if not info:
                 return {"success": False, "error": "Download failed"}
+            log.info("[UPDATE] Downloaded %d bytes (sha256 %s)", info['size'], info['sha256'][:12])
+
+            def verify(path: str) -> str | None:
+                with zipfile.ZipFile(path) as zf:
+                    bad = zf.testzip()
+                    if bad:
+                        raise zipfile.BadZipFile(f"Corrupt member: {bad}")
+                return _release_tag_from_zip(path)
+
+            zip_tag = await to_thread(verify, staged)
+            resolved = tag or _release_tag_from_url(info["url"]) or zip_tag or f"sha256-{info['sha256'][:12]}"
+            path = await to_thread(cache.put, staged, resolved, info["sha256"], info["size"], tag is None)
+            return resolved, path
+        finally:
+            if os.path.exists(staged):
+                os.remove(staged)
+
+    @staticmethod
+    def _extract_release_zip(path: str, target_dir: str) -> int:
+        with zipfile.ZipFile(path) as zf:
+            # check if all files share a common root directory
+            paths = [info.filename for info in zf.infolist() if not info.is_dir()]
+            if not paths:
+                return 0
+
+            first_parts = [p.split('/')[0] for p in paths if '/' in p]
+            has_root_dir = len(set(first_parts)) == 1 and all('/' in p for p in paths)
+
+            count = 0
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
 
-            decky.logger.info(f"[UPDATE] Downloaded {len(zip_data)} bytes")
+                target_name = info.filename
+                if has_root_dir:
+                    # Strip the root directory safely
+                    parts = target_name.split("/", 1)
+                    target_name = parts[1] if len(parts) > 1 else parts[0]
 
-            def extract_zip(data: bytes, target_dir: str) -> int:
-                with zipfile.ZipFile(io.BytesIO(data)) as zf:
-                    # check if all files share a common root directory
-                    paths = [info.filename for info in zf.infolist() if not info.is_dir()]
-                    if not paths:
-                        return 0
+                if not target_name:
+                    continue
 
-                    first_parts = [p.split('/')[0] for p in paths if '/' in p]
-                    has_root_dir = len(set(first_parts)) == 1 and all('/' in p for p in paths)
+                target_path = os.path.join(target_dir, target_name)
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                # Write aside and swap in, so files that are open or
+                # memory-mapped (the seed index) are never truncated
+                tmp_path = f"{target_path}.part"
+                with zf.open(info) as src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, DOWNLOAD_CHUNK_SIZE)
+                os.replace(tmp_path, target_path)
+                count += 1
+            return count
+
+    async def _schedule_update_prefetch(self, tag: str) -> bool:
+        """Stage release `tag` in the cache in the background. Returns True if it is already staged."""
+        if await to_thread(self._get_release_cache().has, tag):
+            return True
+        if not self._background_enabled or _data_usage.saver or (self._prefetch and self._prefetch["tag"] == tag):
+            return False
+        if self._prefetch:
+            self._prefetch["task"].cancel()
 
-                    count = 0
-                    for info in zf.infolist():
-                        if info.is_dir():
-                            continue
+        throttle = DownloadThrottle(rate_limit=PREFETCH_RATE_LIMIT, yield_to_foreground=True)
+        start_now = asyncio.Event()
 
-                        target_name = info.filename
-                        if has_root_dir:
-                            # Strip the root directory safely
-                            parts = target_name.split("/", 1)
-                            target_name = parts[1] if len(parts) > 1 else parts[0]
+        async def prefetch() -> None:
+            mark_background()
+            try:
+                try:
+                    await asyncio.wait_for(start_now.wait(), PREFETCH_START_DELAY)
+                except asyncio.TimeoutError:
+                    pass
+                log.info("[PREFETCH] Staging %s in the background", tag)
+                fetched = await self._fetch_release_zip(tag, throttle=throttle)
+                if isinstance(fetched, dict):
+                    log.error("[PREFETCH] %s failed: %s", tag, fetched.get('error'))
+                else:
+                    log.info("[PREFETCH] %s staged, update can be applied offline", tag)
+                    await emit_event("update_staged", {"tag": tag})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error("[PREFETCH] %s failed: %s", tag, e)
+            finally:
+                if self._prefetch and self._prefetch["tag"] == tag:
+                    self._prefetch = None
+
+        self._prefetch = {
+            "tag": tag,
+            "throttle": throttle,
+            "start_now": start_now,
+            "task": asyncio.create_task(prefetch()),
+        }
+        return False
+
+    async def _await_prefetch(self, tag: str | None) -> None:
+        """If `tag` is being staged, finish it at full speed instead of starting over."""
+        prefetch = self._prefetch
+        if not prefetch or (tag is not None and prefetch["tag"] != tag):
+            return
+        prefetch["throttle"].lift()
+        prefetch["start_now"].set()
+        log.info("[UPDATE] Waiting for background download of %s", prefetch['tag'])
+        try:
+            await asyncio.shield(prefetch["task"])
+        except asyncio.CancelledError:
+            if prefetch["task"].cancelled():
+                return
+            raise
+
+    async def _download_and_extract_latest_release(self, tag: str | None = None) -> Dict[str, Any]:
+        """Install release.zip (latest, or a specific tag) from the cache or GitHub."""
+        try:
+            await self._await_prefetch(tag)
+            fetched = await self._fetch_release_zip(tag)
+        except zipfile.BadZipFile:
+            return {"success": False, "error": "Invalid zip file"}
+        except Exception as e:
+            log.error("Update failed: %s", e)
+            return {"success": False, "error": str(e)}
+        if isinstance(fetched, dict):
+            return fetched
+        return await self._install_release_zip(*fetched)
+
+    async def _install_release_zip(self, resolved_tag: str, zip_path: str) -> Dict[str, Any]:
+        """Extract an already verified release.zip over the plugin directory."""
+        plugin_dir = os.path.dirname(os.path.abspath(__file__))
 
-                        if not target_name:
-                            continue
+        try:
+            log.info("[UPDATE] Extracting...")
+            file_count = await to_thread(self._extract_release_zip, zip_path, plugin_dir)
 
-                        target_path = os.path.join(target_dir, target_name)
-                        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                        with zf.open(info) as src, open(target_path, 'wb') as dst:
-                            dst.write(src.read())
-                        count += 1
-                    return count
+            log.info("[UPDATE] Complete! Extracted %d files from %s", file_count, resolved_tag)
 
-            decky.logger.info("[UPDATE] Extracting...")
-            file_count = await asyncio.to_thread(extract_zip, zip_data, plugin_dir)
+            if self._seed is not None and self._seed.open():
+                log.info("[SEED] Refreshed index: %d entries", len(self._seed))
 
-            decky.logger.info(f"[UPDATE] Complete! Extracted {file_count} files")
-            return {"success": True, "message": "Update complete. Restart Decky.", "needs_restart": True}
+            return {"success": True, "message": "Update complete. Restart Decky.", "needs_restart": True, "tag": resolved_tag}
 
         except zipfile.BadZipFile:
             return {"success": False, "error": "Invalid zip file"}
         except Exception as e:
-            decky.logger.error(f"Update failed: {e}")
+            log.error("Update failed: %s", e)
             return {"success": False, "error": str(e)}
 
     async def update_plugin(self) -> Dict[str, Any]:
         """Download and install latest release from GitHub (with version check)."""
         # Check if update is needed
-        decky.logger.info("[UPDATE] Checking if update is needed...")
+        log.info("[UPDATE] Checking if update is needed...")
         version_info = await self.get_latest_version()
 
         if not version_info.get("update_available"):
-            decky.logger.info("[UPDATE] Already up to date")
+            log.info("[UPDATE] Already up to date")
             return {"success": True, "message": "Already up to date", "already_current": True}
 
-        return await self._download_and_extract_latest_release()
+        return await self._download_and_extract_latest_release(version_info.get("latest_tag") or None)
 
     async def force_update_plugin(self) -> Dict[str, Any]:
         """Force update by downloading latest release.zip without version check."""
-        decky.logger.info("[FORCE_UPDATE] Starting forced update without version check...")
+        log.info("[FORCE_UPDATE] Starting forced update without version check...")
         return await self._download_and_extract_latest_release()
+
+    async def rollback_plugin(self, tag: str) -> Dict[str, Any]:
+        """Reinstall a previously downloaded release from the local cache (no network)."""
+        path = await to_thread(self._get_release_cache().get, tag)
+        if not path:
+            return {"success": False, "error": f"Release {tag} is not in the local cache"}
+        log.info("[ROLLBACK] Reinstalling %s", tag)
+        # The artifact was just verified; never fall through to a download
+        return await self._install_release_zip(tag, path)
+
+    async def get_cached_releases(self) -> List[Dict[str, Any]]:
+        """Releases available for offline reinstall or rollback."""
+        return await to_thread(self._get_release_cache().releases)
+
+    # Profiling
+    async def start_profiling(self, mode: str = "cprofile", duration: int = PROFILE_DEFAULT_SECONDS) -> Dict[str, Any]:
+        """Start a cProfile or tracemalloc session that stops itself after `duration` seconds."""
+        global _thread_profilers
+
+        if mode not in PROFILE_MODES:
+            return {"success": False, "error": f"Unknown profiling mode: {mode}"}
+        if self._profile:
+            return {"success": False, "error": f"Profiling already running ({self._profile['mode']})"}
+
+        duration = max(1, min(int(duration), PROFILE_MAX_SECONDS))
+        profiler: cProfile.Profile | None = None
+
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            _thread_profilers = [] if PROFILE_THREADS else None
+            profiler.enable()
+        else:
+            if tracemalloc.is_tracing():
+                return {"success": False, "error": "tracemalloc is already tracing in this process"}
+            tracemalloc.start()
+
+        async def auto_stop() -> None:
+            await asyncio.sleep(duration)
+            log.info("[PROFILE] %s window of %ss elapsed, stopping", mode, duration)
+            await self.stop_profiling()
+
+        started_at = time.time()
+        self._last_profile = None
+        self._profile = {
+            "mode": mode,
+            "profiler": profiler,
+            "started_at": started_at,
+            "duration": duration,
+            "timer": asyncio.create_task(auto_stop()),
+        }
+        log.info("[PROFILE] Started %s for up to %ss", mode, duration)
+        return {"success": True, "mode": mode, "duration": duration, "started_at": int(started_at)}
+
+    async def stop_profiling(self, top_n: int = PROFILE_TOP_N) -> Dict[str, Any]:
+        """Stop the running session, write its data under the log dir and return a top-N summary.
+
+        If the window already elapsed, the summary of that session is returned
+        instead, once; after that there is nothing to stop.
+        """
+        global _thread_profilers
+
+        session = self._profile
+        if not session:
+            last, self._last_profile = self._last_profile, None
+            if last:
+                return last
+            return {"success": False, "error": "Profiling is not running"}
+        self._profile = None
+
+        timer = session["timer"]
+        auto_stopped = timer is asyncio.current_task()
+        if not auto_stopped:
+            timer.cancel()
+
+        mode = session["mode"]
+        elapsed = time.time() - session["started_at"]
+        result: Dict[str, Any] = {"success": True, "mode": mode, "elapsed": round(elapsed, 3)}
+
+        try:
+            path = _profile_output_path(mode)
+            if mode == "cprofile":
+                thread_profilers = _thread_profilers or []
+                _thread_profilers = None
+                profiler: cProfile.Profile = session["profiler"]
+                profiler.disable()
+                stats = pstats.Stats(profiler)
+                for thread_profiler in thread_profilers:
+                    stats.add(thread_profiler)
+                await to_thread(stats.dump_stats, path)
+                result["total_calls"] = stats.total_calls  # type: ignore[attr-defined]
+                result["total_time"] = round(stats.total_tt, 6)  # type: ignore[attr-defined]
+                result["top"] = _summarize_pstats(stats, top_n)
+            else:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                await to_thread(snapshot.dump, path)
+                result["current_kb"] = round(current / 1024, 1)
+                result["peak_kb"] = round(peak / 1024, 1)
+                result["top"] = _summarize_snapshot(snapshot, top_n)
+            result["path"] = path
+            log.info("[PROFILE] Stopped %s after %.1fs, wrote %s", mode, elapsed, path)
+        except Exception as e:
+            log.error("[PROFILE] Failed to finalize %s session: %s", mode, e)
+            result = {"success": False, "mode": mode, "error": str(e)}
+        finally:
+            if mode == "cprofile":
+                _thread_profilers = None
+            elif tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+        if auto_stopped:
+            # Kept for the caller's own stop_profiling(), which finds nothing running
+            self._last_profile = result
+        return result
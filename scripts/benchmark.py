@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Offline backend benchmark suite
+
+Runs the plugin backend (main.py) against local stand-in servers that imitate
+the upstream endpoints it talks to, so numbers are repeatable and need no
+network:
+
+- Steam appdetails   (https://store.steampowered.com/api/appdetails)
+- kuli.com.ua        (game pages and /games?query= search)
+- GitHub             (releases API and releases/latest/download/release.zip)
+
+Every upstream URL is rewritten to the local server inside main's HTTP layer,
+so the real urllib stack, JSON parsing and zip extraction are exercised.
+
+Measured:
+- version check latency        (Plugin.get_latest_version)
+- update download + extract    (Plugin.force_update_plugin, time + peak memory,
+                                cold and from the local release cache)
+- settings write throughput    (Plugin.set_settings)
+- badge status resolution      (Plugin.get_badge_status: cold background
+                                resolution of many games at once, then
+                                cached reads)
+- page-load bootstrap          (Plugin.bootstrap: settings, version, update
+                                state and cached status in one call)
+
+Results are written as JSON so runs can be compared between commits.
+
+Usage:
+  python3 scripts/benchmark.py
+  python3 scripts/benchmark.py --latency-ms 80 --payload-kb 256 --output bench.json
+  python3 scripts/benchmark.py --baseline bench-main.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+import urllib.parse
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UPSTREAMS = {
+    "https://store.steampowered.com/": "/steam/",
+    "https://kuli.com.ua/": "/kuli/",
+    "https://api.github.com/": "/github-api/",
+    "https://github.com/": "/github/",
+}
+
+KULI_COMMUNITY_PAGE = '<html><body class="html-product-details-page"><div class="item__instruction-main">{pad}</div></body></html>'
+KULI_OFFICIAL_PAGE = '<html><body class="html-product-details-page"><div class="product-essential">{pad}</div></body></html>'
+KULI_SEARCH_PAGE = '<html><body>{items}</body></html>'
+KULI_SEARCH_ITEM = '<div class="product-item"><a href="/{slug}"><h2 class="product-title">{title}</h2></a></div>'
+
+
+# ============================================
+# Stand-in Servers
+# ============================================
+
+class StandInConfig:
+    def __init__(self, latency_ms: float, payload_kb: int, zip_kb: int, releases: int):
+        self.latency = latency_ms / 1000.0
+        self.payload_kb = payload_kb
+        self.releases = releases
+        self.release_zip = build_release_zip(zip_kb)
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+
+def build_release_zip(size_kb: int) -> bytes:
+    """A release.zip shaped like the real one, padded with incompressible data."""
+    bio = io.BytesIO()
+    with zipfile.ZipFile(bio, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("decky-ukr-badge/plugin.json", json.dumps({"version": "99.0.0"}))
+        zf.writestr("decky-ukr-badge/main.py", "# benchmark backend\n")
+        zf.writestr("decky-ukr-badge/dist/index.js", "// benchmark frontend\n" * 64)
+        zf.writestr("decky-ukr-badge/dist/assets.bin", os.urandom(size_kb * 1024))
+    return bio.getvalue()
+
+
+def _padding(kb: int) -> str:
+    return "x" * (kb * 1024)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    config: StandInConfig
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        time.sleep(self.config.latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.config.lock:
+            self.config.requests += 1
+            self.config.bytes_sent += len(body)
+
+    def _releases(self) -> List[Dict[str, Any]]:
+        """Newest first, like the GitHub API; every third release is a prerelease."""
+        return [{
+            "tag_name": f"v1.{i}.0",
+            "draft": False,
+            "prerelease": i % 3 == 0,
+            "body": _padding(self.config.payload_kb // max(1, self.config.releases)),
+            "assets": [{"name": "release.zip", "size": len(self.config.release_zip)}],
+        } for i in reversed(range(self.config.releases))]
+
+    def do_GET(self) -> None:
+        parsed = urllib.parse.urlsplit(self.path)
+        path, query = parsed.path, urllib.parse.parse_qs(parsed.query)
+
+        if path.startswith("/steam/api/appdetails"):
+            appid = query.get("appids", ["0"])[0]
+            languages = "English, French, German" + (", Ukrainian" if int(appid or 0) % 2 == 0 else "")
+            data = {appid: {"success": True, "data": {
+                "name": f"Benchmark Game {appid}",
+                "supported_languages": languages,
+                "detailed_description": _padding(self.config.payload_kb),
+            }}}
+            self._send(200, json.dumps(data).encode(), "application/json")
+        elif path.startswith("/github-api/repos/") and path.endswith("/releases/latest"):
+            stable = [r for r in self._releases() if not r["prerelease"]]
+            if not stable:
+                self._send(404, b'{"message": "Not Found"}', "application/json")
+                return
+            self._send(200, json.dumps(stable[0]).encode(), "application/json")
+        elif path.startswith("/github-api/repos/") and path.endswith("/releases"):
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            releases = self._releases()[(page - 1) * per_page:page * per_page]
+            self._send(200, json.dumps(releases).encode(), "application/json")
+        elif path.startswith("/github/") and path.endswith("/release.zip"):
+            self._send(200, self.config.release_zip, "application/zip")
+        elif path == "/kuli/games":
+            title = query.get("query", [""])[0]
+            slug = "-".join(title.lower().split())
+            items = "".join(KULI_SEARCH_ITEM.format(slug=f"{slug}-{i}" if i else slug, title=title) for i in range(10))
+            self._send(200, KULI_SEARCH_PAGE.format(items=items).encode(), "text/html")
+        elif path.startswith("/kuli/"):
+            slug = path[len("/kuli/"):]
+            if slug.startswith("missing"):
+                self._send(404, b"<html>page-not-found</html>", "text/html")
+                return
+            page = KULI_COMMUNITY_PAGE if len(slug) % 2 else KULI_OFFICIAL_PAGE
+            self._send(200, page.format(pad=_padding(self.config.payload_kb)).encode(), "text/html")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+
+def start_stand_in_server(config: StandInConfig) -> ThreadingHTTPServer:
+    handler = type("BoundStandInHandler", (StandInHandler,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ============================================
+# Backend Under Test
+# ============================================
+
+def load_backend(work_dir: str):
+    """Import main.py with a stub decky module, routed to the stand-in server."""
+    logger = types.SimpleNamespace(
+        info=lambda *a, **k: None,
+        error=lambda *a, **k: None,
+        warn=lambda *a, **k: None,
+        warning=lambda *a, **k: None,
+        debug=lambda *a, **k: None,
+    )
+    sys.modules["decky"] = types.SimpleNamespace(
+        logger=logger,
+        DECKY_PLUGIN_SETTINGS_DIR=os.path.join(work_dir, "settings"),
+        DECKY_PLUGIN_RUNTIME_DIR=os.path.join(work_dir, "runtime"),
+        DECKY_PLUGIN_LOG_DIR=os.path.join(work_dir, "logs"),
+        DECKY_PLUGIN_DIR=os.path.join(work_dir, "plugin"),
+    )
+    sys.path.insert(0, PROJECT_DIR)
+    import main  # noqa: E402
+
+    # Updates extract next to main.__file__; keep them inside the work dir.
+    plugin_dir = os.path.join(work_dir, "plugin")
+    os.makedirs(plugin_dir, exist_ok=True)
+    with open(os.path.join(plugin_dir, "plugin.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": "1.0.0"}, f)
+    main.__file__ = os.path.join(plugin_dir, "main.py")
+    return main
+
+
+def route_to(main, base_url: str) -> None:
+    def rewrite(url: str) -> str:
+        for upstream, prefix in UPSTREAMS.items():
+            if url.startswith(upstream):
+                return base_url + prefix + url[len(upstream):]
+        return url
+
+    original_text = main._sync_http_get
+    original_binary = main._sync_http_get_binary
+    original_download = main._sync_http_download
+    main._sync_http_get = lambda url, *args, **kwargs: original_text(rewrite(url), *args, **kwargs)
+    main._sync_http_get_binary = lambda url, *args, **kwargs: original_binary(rewrite(url), *args, **kwargs)
+    main._sync_http_download = lambda url, *args, **kwargs: original_download(rewrite(url), *args, **kwargs)
+
+
+# ============================================
+# Measurements
+# ============================================
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    ms = [s * 1000.0 for s in samples]
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "max_ms": round(max(ms), 3) if ms else 0.0,
+    }
+
+
+async def timed(runs: int, func: Callable[[], Any]) -> List[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench_version_check(plugin, runs: int) -> Dict[str, Any]:
+    last: Dict[str, Any] = {}
+
+    async def once():
+        nonlocal last
+        last = await plugin.get_latest_version()
+
+    samples = await timed(runs, once)
+    return {**latency_summary(samples), "source_ok": bool(last.get("source_ok")), "latest": last.get("latest")}
+
+
+async def bench_update(plugin, runs: int, cold: bool) -> Dict[str, Any]:
+    """Force-update timings; cold runs empty the release cache first."""
+    cache_root = plugin._get_release_cache().root
+    rss_before_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    ok = True
+
+    async def once():
+        nonlocal ok
+        if cold:
+            shutil.rmtree(cache_root, ignore_errors=True)
+            plugin._release_cache = None
+        result = await plugin.force_update_plugin()
+        ok = ok and bool(result.get("success"))
+
+    samples = await timed(runs, once)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        **latency_summary(samples),
+        "success": ok,
+        "peak_python_alloc_kb": round(peak / 1024, 1),
+        "peak_rss_kb": rss_after_kb,
+        "peak_rss_growth_kb": rss_after_kb - rss_before_kb,
+    }
+
+
+async def bench_settings(plugin, runs: int) -> Dict[str, Any]:
+    counter = 0
+
+    async def once():
+        nonlocal counter
+        counter += 1
+        await plugin.set_settings("offsetX", counter % 200)
+
+    samples = await timed(runs, once)
+    total = sum(samples)
+    return {**latency_summary(samples), "ops_per_sec": round(runs / total, 1) if total else 0.0}
+
+
+async def bench_status(plugin, apps: int) -> Dict[str, Any]:
+    """Cold: ask for `apps` uncached games and wait for every background
+    resolution. Warm: the same lookups answered from the status cache."""
+    app_ids = [str(1000 + i) for i in range(apps)]
+    start = time.perf_counter()
+    for app_id in app_ids:
+        await plugin.get_badge_status(app_id, "")
+    await asyncio.gather(*list((plugin._status_tasks or {}).values()))
+    cold = time.perf_counter() - start
+
+    index = 0
+
+    async def once():
+        nonlocal index
+        await plugin.get_badge_status(app_ids[index % apps], "")
+        index += 1
+
+    samples = await timed(apps * 10, once)
+    total = sum(samples)
+    return {
+        "apps": apps,
+        "cold_total_ms": round(cold * 1000.0, 3),
+        "cold_apps_per_sec": round(apps / cold, 1) if cold else 0.0,
+        "cached": {**latency_summary(samples), "ops_per_sec": round(len(samples) / total, 1) if total else 0.0},
+    }
+
+
+async def bench_bootstrap(plugin, runs: int) -> Dict[str, Any]:
+    async def once():
+        await plugin.bootstrap("1000", "")
+
+    samples = await timed(runs, once)
+    total = sum(samples)
+    return {**latency_summary(samples), "ops_per_sec": round(runs / total, 1) if total else 0.0}
+
+
+async def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    config = StandInConfig(args.latency_ms, args.payload_kb, args.zip_kb, args.releases)
+    server = start_stand_in_server(config)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory(prefix="decky-ukr-badge-bench-") as work_dir:
+        main = load_backend(work_dir)
+        route_to(main, base_url)
+
+        plugin = main.Plugin()
+        plugin.settings = main.DEFAULT_SETTINGS.copy()
+        plugin.settings_file = os.path.join(work_dir, "settings", "settings.json")
+
+        results = {
+            "version_check": await bench_version_check(plugin, args.runs),
+            "update": await bench_update(plugin, max(1, args.runs // 4), cold=True),
+            "update_cached": await bench_update(plugin, max(1, args.runs // 4), cold=False),
+            "settings_write": await bench_settings(plugin, args.runs * 10),
+            "badge_status": await bench_status(plugin, args.apps),
+            "bootstrap": await bench_bootstrap(plugin, args.runs * 10),
+        }
+
+    server.shutdown()
+    results["server"] = {"requests": config.requests, "bytes_sent": config.bytes_sent}
+    return results
+
+
+# ============================================
+# Reporting
+# ============================================
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print("\n=== Compared to baseline "
+          f"({baseline.get('meta', {}).get('git_revision', '?')}) ===")
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name, {})
+        for key in ("p50_ms", "p95_ms", "ops_per_sec", "cold_apps_per_sec", "peak_python_alloc_kb"):
+            if key not in current or not previous.get(key):
+                continue
+            delta = (current[key] - previous[key]) / previous[key] * 100.0
+            print(f"{name:16} {key:22} {previous[key]:>12} -> {current[key]:>12} ({delta:+.1f}%)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark for the decky-ukr-badge backend")
+    parser.add_argument("--runs", type=int, default=20, help="Iterations per network benchmark")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Added latency per stand-in response")
+    parser.add_argument("--payload-kb", type=int, default=64, help="Padding added to JSON/HTML responses")
+    parser.add_argument("--zip-kb", type=int, default=512, help="Size of the served release.zip payload")
+    parser.add_argument("--releases", type=int, default=20, help="Releases returned by the GitHub stand-in")
+    parser.add_argument("--apps", type=int, default=50, help="Games resolved by the status benchmark")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write JSON results")
+    parser.add_argument("--baseline", default=None, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_suite(args))
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
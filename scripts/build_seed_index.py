@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Build the read-only seed status index shipped in release.zip
+
+Input is JSONL, one record per game, with at least an "appid" and a "status"
+(OFFICIAL / COMMUNITY / NONE; null counts as NONE) plus either a kuli "slug" or
+a kuli "url". validate_kuli.py output qualifies when its game list carried
+appids. Lines starting with '#' are ignored; later records win for an appid.
+
+Records whose lookup failed (validate_kuli.py notes an HTTP error, an
+exception or a cassette miss) say nothing about the game and are skipped, so
+a network hiccup during the audit never ships as NONE.
+
+Output layout (little-endian), read by SeedIndex in main.py, which also
+defines the SEED_* constants used here:
+  header   8s magic "UKRSEED1", u32 record count, u32 string pool offset
+  records  u32 appid, u8 status, pad, u16 slug length, u32 slug offset
+           (sorted by appid, 12 bytes each)
+  pool     UTF-8 slugs, concatenated
+
+Usage:
+  python3 scripts/build_seed_index.py data/status_seed.jsonl status_seed.bin
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import types
+from typing import Dict, Iterable, Tuple
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+# main.py only imports outside Decky Loader with a stand-in decky module
+sys.modules.setdefault("decky", types.SimpleNamespace(logger=logging.getLogger("decky")))
+from main import KULI_BASE_URL, SEED_HEADER, SEED_MAGIC, SEED_RECORD, SEED_STATUSES  # noqa: E402
+
+# validate_kuli.py notes for lookups that never got an answer
+FAILED_LOOKUP_NOTE = re.compile(r"HTTP \d+|^exception:|^not in cassette")
+
+
+def lookup_failed(item: Dict) -> bool:
+    return not item.get("status") and bool(FAILED_LOOKUP_NOTE.search(str(item.get("note") or "")))
+
+
+def read_records(lines: Iterable[str]) -> Dict[int, Tuple[str, str]]:
+    records: Dict[int, Tuple[str, str]] = {}
+    skipped = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        item = json.loads(line)
+        try:
+            appid = int(item["appid"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if lookup_failed(item):
+            skipped += 1
+            continue
+        status = str(item.get("status") or "NONE").upper()
+        if status not in SEED_STATUSES:
+            status = "NONE"
+        slug = item.get("slug") or ""
+        url = item.get("url") or ""
+        if not slug and url.startswith(KULI_BASE_URL):
+            slug = url[len(KULI_BASE_URL):].strip("/")
+        records[appid] = (status, slug)
+    if skipped:
+        print(f"Skipped {skipped} records whose lookup failed", file=sys.stderr)
+    return records
+
+
+def build_index(records: Dict[int, Tuple[str, str]]) -> bytes:
+    pool = bytearray()
+    body = bytearray()
+    slug_offsets: Dict[str, int] = {}
+
+    for appid in sorted(records):
+        status, slug = records[appid]
+        raw = slug.encode("utf-8")
+        if slug not in slug_offsets:
+            slug_offsets[slug] = len(pool)
+            pool += raw
+        body += SEED_RECORD.pack(appid, SEED_STATUSES.index(status), len(raw), slug_offsets[slug])
+
+    pool_offset = SEED_HEADER.size + len(body)
+    return SEED_HEADER.pack(SEED_MAGIC, len(records), pool_offset) + bytes(body) + bytes(pool)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build status_seed.bin from JSONL records")
+    parser.add_argument("source", help="JSONL input, '-' for stdin")
+    parser.add_argument("output", help="Index file to write")
+    args = parser.parse_args()
+
+    if args.source == "-":
+        records = read_records(sys.stdin)
+    else:
+        with open(args.source, "r", encoding="utf-8") as f:
+            records = read_records(f)
+
+    data = build_index(records)
+    with open(args.output, "wb") as f:
+        f.write(data)
+
+    counts = {s: sum(1 for st, _ in records.values() if st == s) for s in SEED_STATUSES}
+    print(f"Wrote {args.output}: {len(records)} entries, {len(data)} bytes "
+          f"(official={counts['OFFICIAL']}, community={counts['COMMUNITY']}, none={counts['NONE']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,17 +12,186 @@ Setup on Steam Deck:
 Usage:
     python cef_debug.py <DECK_IP>
     python cef_debug.py 192.168.1.100
+    python cef_debug.py 192.168.1.100 --profile 3 --seconds 10
 """
 
 import argparse
+import base64
+import hashlib
 import json
+import os
+import socket
+import struct
 import sys
+import time
+import urllib.parse
 import urllib.request
 import urllib.error
-from typing import Any
+from typing import Any, Callable
 
 CEF_PORT = 8081
 TIMEOUT = 5
+PROFILE_SECONDS = 5
+TRACE_CATEGORIES = ",".join([
+    "devtools.timeline",
+    "v8.execute",
+    "blink.user_timing",
+    "disabled-by-default-devtools.timeline",
+])
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class CDPError(Exception):
+    """Protocol or transport failure while talking to a CEF target."""
+
+
+class CDPClient:
+    """Minimal Chrome DevTools Protocol client over a built-in WebSocket.
+
+    Only what profiling needs: text frames, fragmentation, ping/pong and close.
+    """
+
+    def __init__(self, ws_url: str, timeout: float = TIMEOUT):
+        parsed = urllib.parse.urlsplit(ws_url)
+        if parsed.scheme != "ws":
+            raise CDPError(f"Unsupported WebSocket URL: {ws_url}")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 80
+        self.path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        self.timeout = timeout
+        self.sock: socket.socket | None = None
+        self._buffer = b""
+        self._next_id = 1
+
+    # --- transport ---
+
+    def connect(self) -> "CDPClient":
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f"GET {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode())
+
+        while b"\r\n\r\n" not in self._buffer:
+            self._fill()
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        lines = head.decode("latin-1").split("\r\n")
+        if " 101 " not in lines[0] + " ":
+            raise CDPError(f"WebSocket handshake rejected: {lines[0]}")
+        headers = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in lines[1:] if ":" in l)}
+        expected = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        if headers.get("sec-websocket-accept") != expected:
+            raise CDPError("WebSocket handshake returned a bad accept key")
+        return self
+
+    def close(self) -> None:
+        if self.sock:
+            try:
+                self._send_frame(0x8, b"")
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self) -> "CDPClient":
+        return self.connect()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _fill(self) -> None:
+        assert self.sock is not None
+        chunk = self.sock.recv(65536)
+        if not chunk:
+            raise CDPError("Connection closed by target")
+        self._buffer += chunk
+
+    def _read_exact(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            self._fill()
+        data, self._buffer = self._buffer[:n], self._buffer[n:]
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        assert self.sock is not None
+        self.sock.sendall(encode_frame(opcode, payload, mask=True))
+
+    def _recv_message(self) -> str:
+        parts: list[bytes] = []
+        while True:
+            b1, b2 = self._read_exact(2)
+            fin, opcode = b1 & 0x80, b1 & 0x0F
+            length = b2 & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", self._read_exact(8))[0]
+            mask = self._read_exact(4) if b2 & 0x80 else None
+            payload = self._read_exact(length)
+            if mask:
+                payload = bytes(c ^ mask[i % 4] for i, c in enumerate(payload))
+
+            if opcode == 0x8:
+                raise CDPError("Connection closed by target")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            parts.append(payload)
+            if fin:
+                return b"".join(parts).decode("utf-8")
+
+    # --- protocol ---
+
+    def call(self, method: str, params: dict[str, Any] | None = None,
+             on_event: Callable[[dict[str, Any]], None] | None = None) -> dict[str, Any]:
+        """Send a command and return its result; events seen meanwhile go to on_event."""
+        msg_id = self._next_id
+        self._next_id += 1
+        self._send_frame(0x1, json.dumps({"id": msg_id, "method": method, "params": params or {}}).encode())
+        while True:
+            message = json.loads(self._recv_message())
+            if message.get("id") == msg_id:
+                if "error" in message:
+                    raise CDPError(f"{method}: {message['error'].get('message', message['error'])}")
+                return message.get("result", {})
+            if on_event and "method" in message:
+                on_event(message)
+
+    def wait_for(self, event: str, on_event: Callable[[dict[str, Any]], None] | None = None,
+                 timeout: float = 60) -> dict[str, Any]:
+        """Read events until `event` arrives, passing earlier ones to on_event."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            message = json.loads(self._recv_message())
+            if message.get("method") == event:
+                return message
+            if on_event and "method" in message:
+                on_event(message)
+        raise CDPError(f"Timed out waiting for {event}")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    """Encode a single final WebSocket frame (clients must mask, servers must not)."""
+    header = bytes([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if len(payload) < 126:
+        header += bytes([mask_bit | len(payload)])
+    elif len(payload) < 1 << 16:
+        header += bytes([mask_bit | 126]) + struct.pack(">H", len(payload))
+    else:
+        header += bytes([mask_bit | 127]) + struct.pack(">Q", len(payload))
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    return header + key + bytes(c ^ key[i % 4] for i, c in enumerate(payload))
 
 
 def get_tabs(deck_ip: str) -> list[dict[str, Any]]:
@@ -64,6 +233,104 @@ def get_devtools_url(tab: dict[str, Any], deck_ip: str) -> str:
     return ""
 
 
+def _metrics(result: dict[str, Any]) -> dict[str, float]:
+    return {m["name"]: m["value"] for m in result.get("metrics", [])}
+
+
+def summarize_profile(before: dict[str, float], after: dict[str, float],
+                      events: list[dict[str, Any]], seconds: float) -> dict[str, Any]:
+    """Script time, layout work and heap size over the capture window."""
+    def delta(name: str) -> float:
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    durations: dict[str, float] = {}
+    counts: dict[str, int] = {}
+    for event in events:
+        name = event.get("name", "")
+        counts[name] = counts.get(name, 0) + 1
+        if event.get("ph") == "X" and "dur" in event:
+            durations[name] = durations.get(name, 0.0) + event["dur"] / 1000.0
+
+    def trace_ms(*names: str) -> float:
+        return round(sum(durations.get(n, 0.0) for n in names), 3)
+
+    return {
+        "seconds": seconds,
+        "script_time_ms": round(delta("ScriptDuration") * 1000, 3),
+        "task_time_ms": round(delta("TaskDuration") * 1000, 3),
+        "layout_count": int(delta("LayoutCount")),
+        "recalc_style_count": int(delta("RecalcStyleCount")),
+        "layout_time_ms": round(delta("LayoutDuration") * 1000, 3),
+        "js_heap_used_mb": round(after.get("JSHeapUsedSize", 0.0) / (1024 * 1024), 2),
+        "js_heap_total_mb": round(after.get("JSHeapTotalSize", 0.0) / (1024 * 1024), 2),
+        "js_heap_growth_mb": round(delta("JSHeapUsedSize") / (1024 * 1024), 2),
+        "dom_nodes": int(after.get("Nodes", 0)),
+        "trace_events": len(events),
+        "trace_script_ms": trace_ms("FunctionCall", "EvaluateScript", "v8.compile", "V8.Execute"),
+        "trace_layout_ms": trace_ms("Layout", "UpdateLayoutTree"),
+        "timer_fires": counts.get("TimerFire", 0),
+        "top_events": sorted(
+            ({"name": n, "total_ms": round(d, 3), "count": counts[n]} for n, d in durations.items()),
+            key=lambda e: e["total_ms"], reverse=True,
+        )[:10],
+    }
+
+
+def profile_tab(tab: dict[str, Any], deck_ip: str, seconds: float = PROFILE_SECONDS,
+                out_dir: str = ".") -> dict[str, Any]:
+    """Capture Performance metrics and a trace for `seconds`; save trace + summary files."""
+    ws_url = tab.get("webSocketDebuggerUrl", "")
+    if not ws_url:
+        raise CDPError("No WebSocket URL available for this tab")
+    ws_url = ws_url.replace("127.0.0.1", deck_ip).replace("localhost", deck_ip)
+
+    events: list[dict[str, Any]] = []
+
+    def collect(message: dict[str, Any]) -> None:
+        if message.get("method") == "Tracing.dataCollected":
+            events.extend(message.get("params", {}).get("value", []))
+
+    with CDPClient(ws_url, timeout=max(TIMEOUT, seconds + TIMEOUT)) as client:
+        client.call("Performance.enable")
+        before = _metrics(client.call("Performance.getMetrics"))
+        client.call("Tracing.start", {"categories": TRACE_CATEGORIES, "transferMode": "ReportEvents"})
+        time.sleep(seconds)
+        after = _metrics(client.call("Performance.getMetrics"))
+        client.call("Tracing.end", on_event=collect)
+        client.wait_for("Tracing.tracingComplete", on_event=collect)
+        client.call("Performance.disable")
+
+    summary = summarize_profile(before, after, events, seconds)
+    summary["tab"] = tab.get("title", "Untitled")
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    safe_title = "".join(c if c.isalnum() else "_" for c in summary["tab"])[:40] or "tab"
+    trace_path = os.path.join(out_dir, f"trace-{safe_title}-{stamp}.json")
+    summary_path = os.path.join(out_dir, f"trace-{safe_title}-{stamp}.summary.json")
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events}, f)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    summary["trace_path"] = trace_path
+    summary["summary_path"] = summary_path
+    return summary
+
+
+def print_profile(summary: dict[str, Any]) -> None:
+    print(f"\n📈 {summary['tab']} over {summary['seconds']}s")
+    print(f"   Script time:   {summary['script_time_ms']} ms (trace: {summary['trace_script_ms']} ms)")
+    print(f"   Layouts:       {summary['layout_count']} ({summary['layout_time_ms']} ms), "
+          f"style recalcs: {summary['recalc_style_count']}")
+    print(f"   Timer fires:   {summary['timer_fires']}")
+    print(f"   JS heap:       {summary['js_heap_used_mb']} / {summary['js_heap_total_mb']} MB "
+          f"({summary['js_heap_growth_mb']:+} MB)")
+    for event in summary["top_events"][:5]:
+        print(f"   {event['name']:<28} {event['total_ms']:>10} ms  x{event['count']}")
+    print(f"💾 Trace:   {summary['trace_path']}")
+    print(f"💾 Summary: {summary['summary_path']}\n")
+
+
 def interactive_mode(tabs: list[dict[str, Any]], deck_ip: str) -> None:
     """Interactive tab selection."""
     print_tabs(tabs)
@@ -87,6 +354,7 @@ def interactive_mode(tabs: list[dict[str, Any]], deck_ip: str) -> None:
     print("📋 Quick commands:")
     print("   tabs     - Refresh tab list")
     print("   url <n>  - Get DevTools URL for tab #n")
+    print(f"   profile <n> [seconds] - Capture metrics + trace for tab #n (default {PROFILE_SECONDS}s)")
     print("   quit     - Exit")
     print()
     
@@ -115,8 +383,22 @@ def interactive_mode(tabs: list[dict[str, Any]], deck_ip: str) -> None:
                     print(f"Invalid tab index. Use 0-{len(tabs)-1}")
             except (ValueError, IndexError):
                 print("Usage: url <tab_number>")
+        elif cmd.startswith("profile "):
+            try:
+                parts = cmd.split()
+                idx = int(parts[1])
+                seconds = float(parts[2]) if len(parts) > 2 else PROFILE_SECONDS
+                if not 0 <= idx < len(tabs):
+                    print(f"Invalid tab index. Use 0-{len(tabs)-1}")
+                    continue
+                print(f"⏱️  Profiling [{idx}] for {seconds}s...")
+                print_profile(profile_tab(tabs[idx], deck_ip, seconds))
+            except (ValueError, IndexError):
+                print("Usage: profile <tab_number> [seconds]")
+            except (CDPError, OSError) as e:
+                print(f"❌ Profiling failed: {e}")
         elif cmd:
-            print("Unknown command. Use: tabs, url <n>, quit")
+            print("Unknown command. Use: tabs, url <n>, profile <n> [seconds], quit")
 
 
 def main():
@@ -126,13 +408,24 @@ def main():
     )
     parser.add_argument("deck_ip", help="Steam Deck IP address")
     parser.add_argument("--json", action="store_true", help="Output tabs as JSON")
+    parser.add_argument("--profile", type=int, metavar="N", help="Profile tab #N and exit")
+    parser.add_argument("--seconds", type=float, default=PROFILE_SECONDS, help="Profiling window")
     
     args = parser.parse_args()
     
     print(f"🔌 Connecting to Steam Deck at {args.deck_ip}:{CEF_PORT}...")
     tabs = get_tabs(args.deck_ip)
     
-    if args.json:
+    if args.profile is not None:
+        if not 0 <= args.profile < len(tabs):
+            print(f"Invalid tab index. Use 0-{len(tabs)-1}")
+            sys.exit(1)
+        try:
+            print_profile(profile_tab(tabs[args.profile], args.deck_ip, args.seconds))
+        except (CDPError, OSError) as e:
+            print(f"❌ Profiling failed: {e}")
+            sys.exit(1)
+    elif args.json:
         print(json.dumps(tabs, indent=2))
     else:
         interactive_mode(tabs, args.deck_ip)
@@ -10,6 +10,10 @@ Purpose:
 Usage:
   python3 scripts/debug-release-version.py
   python3 scripts/debug-release-version.py --repo yataktyni/decky-ukr-badge --per-page 50
+  python3 scripts/debug-release-version.py --no-cache
+
+Responses are kept in the plugin's HTTP cache format (see main.HttpCache), so
+repeated runs reuse them while they are fresh.
 """
 
 import argparse
@@ -17,6 +21,7 @@ import json
 import os
 import re
 import sys
+import tempfile
 import urllib.request
 from typing import Any, Dict, List, Tuple
 
@@ -46,11 +51,33 @@ def read_local_version(plugin_json_path: str) -> str:
     return str(data.get("version", "0.0.0"))
 
 
-def fetch_releases(repo: str, per_page: int) -> List[Dict[str, Any]]:
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "decky-ukr-badge-http-cache")
+
+
+def load_http_cache(cache_dir: str):
+    """Reuse the plugin's on-disk response cache (main.HttpCache) outside Decky."""
+    import logging
+    import types
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.modules.setdefault("decky", types.SimpleNamespace(logger=logging.getLogger("decky")))
+    from main import HttpCache
+
+    return HttpCache(cache_dir)
+
+
+def fetch_releases(repo: str, per_page: int, cache=None) -> List[Dict[str, Any]]:
     url = f"https://api.github.com/repos/{repo}/releases?per_page={per_page}"
-    req = urllib.request.Request(url, headers={"User-Agent": "decky-ukr-badge-debug/1.0"})
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        body = resp.read().decode("utf-8")
+    cached = cache.get(url) if cache else None
+    if cached is not None:
+        print(f"(cached response for {url})")
+        body = cached.decode("utf-8")
+    else:
+        req = urllib.request.Request(url, headers={"User-Agent": "decky-ukr-badge-debug/1.0"})
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            body = resp.read().decode("utf-8")
+        if cache:
+            cache.put(url, body.encode("utf-8"))
     data = json.loads(body)
     if not isinstance(data, list):
         return []
@@ -67,8 +94,19 @@ def main() -> int:
         default=None,
         help="Override local installed version for simulation (e.g. 1.6.7)",
     )
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="HTTP response cache location")
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch from GitHub")
     args = parser.parse_args()
+    cache = None if args.no_cache else load_http_cache(args.cache_dir)
+    try:
+        return report(args, cache)
+    finally:
+        # The cache only writes its index every few puts; keep this run's responses
+        if cache:
+            cache.flush()
+
 
+def report(args: argparse.Namespace, cache) -> int:
     local_raw = args.installed_version if args.installed_version else read_local_version(args.plugin_json)
     local_norm = normalize_semver_core(local_raw)
     local_tuple = parse_version_tuple(local_norm)
@@ -80,7 +118,7 @@ def main() -> int:
     print(f"local tuple      : {local_tuple}")
     print()
 
-    releases = fetch_releases(args.repo, args.per_page)
+    releases = fetch_releases(args.repo, args.per_page, cache)
     print(f"=== GitHub Releases (repo={args.repo}, count={len(releases)}) ===")
 
     best_tag = ""
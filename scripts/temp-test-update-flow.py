@@ -12,12 +12,18 @@ What it does:
 
 Usage:
   python3 scripts/temp-test-update-flow.py
+  python3 scripts/temp-test-update-flow.py --no-cache
+
+Responses (including release.zip) are kept in the plugin's HTTP cache format
+(see main.HttpCache), so repeated runs reuse them while they are fresh.
 """
 
+import argparse
 import io
 import json
 import os
 import re
+import sys
 import tempfile
 import urllib.request
 import zipfile
@@ -25,6 +31,22 @@ from typing import Any, Dict, List, Tuple
 
 
 HTTP_USER_AGENT = "decky-ukr-badge-temp-update-test/1.0"
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "decky-ukr-badge-http-cache")
+
+# HttpCache instance, or None to always download
+http_cache = None
+
+
+def load_http_cache(cache_dir: str):
+    """Reuse the plugin's on-disk response cache (main.HttpCache) outside Decky."""
+    import logging
+    import types
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.modules.setdefault("decky", types.SimpleNamespace(logger=logging.getLogger("decky")))
+    from main import HttpCache
+
+    return HttpCache(cache_dir)
 
 
 def normalize_semver_core(value: str) -> str:
@@ -45,15 +67,20 @@ def parse_version_tuple(value: str) -> Tuple[int, int, int]:
 
 
 def http_get_text(url: str) -> str:
-    req = urllib.request.Request(url, headers={"User-Agent": HTTP_USER_AGENT})
-    with urllib.request.urlopen(req, timeout=20) as response:
-        return response.read().decode("utf-8")
+    return http_get_bytes(url, timeout=20).decode("utf-8")
 
 
-def http_get_bytes(url: str) -> bytes:
+def http_get_bytes(url: str, timeout: int = 30) -> bytes:
+    cached = http_cache.get(url) if http_cache else None
+    if cached is not None:
+        print(f"(cached response for {url})")
+        return cached
     req = urllib.request.Request(url, headers={"User-Agent": HTTP_USER_AGENT})
-    with urllib.request.urlopen(req, timeout=30) as response:
-        return response.read()
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        body = response.read()
+    if http_cache:
+        http_cache.put(url, body)
+    return body
 
 
 def get_current_version_from_plugin_json(path: str = "plugin.json") -> str:
@@ -124,6 +151,22 @@ def extract_like_plugin(zip_data: bytes, target_dir: str) -> int:
 
 
 def main() -> int:
+    global http_cache
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="HTTP response cache location")
+    parser.add_argument("--no-cache", action="store_true", help="Always download")
+    args = parser.parse_args()
+    http_cache = None if args.no_cache else load_http_cache(args.cache_dir)
+    try:
+        return run_update_flow()
+    finally:
+        # The cache only writes its index every few puts; keep this run's responses
+        if http_cache:
+            http_cache.flush()
+
+
+def run_update_flow() -> int:
     print("=== TEMP update flow test ===")
 
     current_raw = get_current_version_from_plugin_json("plugin.json")
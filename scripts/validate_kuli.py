@@ -1,7 +1,37 @@
-import requests
+"""
+Validate kuli.com.ua lookups using the same rules as the plugin.
+
+Without arguments the built-in GAMES list is checked. For library audits, pass
+a game list (one title per line, or JSONL with a "game"/"name" field) and an
+output file; checks run concurrently with a per-host connection limit over a
+shared session, results are appended to JSONL as they finish, and a rerun
+with --resume skips titles already present in the output. Titles whose
+lookup failed (HTTP error, exception, cassette miss) are checked again.
+
+--record saves every response to a gzip cassette; --replay serves a cassette
+from memory with no network, so matching/normalization changes can be scored
+offline against an earlier results file with --expect.
+
+Usage:
+  python3 scripts/validate_kuli.py
+  python3 scripts/validate_kuli.py --games library.txt --output kuli.jsonl --workers 16
+  cat library.txt | python3 scripts/validate_kuli.py --games - --output kuli.jsonl --resume
+  python3 scripts/validate_kuli.py --games library.txt --record kuli.cassette.gz --output base.jsonl
+  python3 scripts/validate_kuli.py --games library.txt --replay kuli.cassette.gz --expect base.jsonl --quiet
+"""
+
+import argparse
+import gzip
+import json
 import re
+import sys
+import threading
 import time
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Color codes
 GREEN = "\033[92m"
@@ -10,6 +40,11 @@ RED = "\033[91m"
 CYAN = "\033[96m"
 RESET = "\033[0m"
 
+BROWSER_HEADERS = {
+    "Accept": "text/html",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
 GAMES = [
     # Popular
     "Cyberpunk 2077",
@@ -65,141 +100,405 @@ def urlify_game_name(name):
     name = name.strip("-")
     return name
 
-def search_kuli_for_game(game_name):
-    """Search kuli.com.ua and return (status, url) tuple"""
-    try:
-        search_url = f"https://kuli.com.ua/games?query={urllib.parse.quote(game_name)}"
-        # Add headers to mimic browser/check_kuli behavior
-        headers = {
-            "Accept": "text/html",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        res = requests.get(search_url, timeout=10, headers=headers)
-        
-        if res.status_code != 200:
-            print(f"    {RED}Search HTTP {res.status_code}{RESET}")
-            return None, None
-        
-        html = res.text
-        # Regex to match product-item link. Uses DOTALL to handle newlines between attributes.
-        match = re.search(r'class="product-item[^"]*".*?href="([^"]+)"', html, re.DOTALL)
-        
-        if not match:
-            # Try finding ANY product link if the strict class match fails
-            match = re.search(r'class="product-item-full[^"]*".*?href="([^"]+)"', html, re.DOTALL)
-            
-        if not match:
-             # Last resort: just find the first link inside a product-grid item
-            match = re.search(r'class="item-grid".*?href="([^"]+)"', html, re.DOTALL)
-
-        if not match:
-            # Debug: check if we actually got the search page
-            if "Horizon" in game_name and "Horizon" not in html:
-                 print(f"    {RED}Search page seem empty/blocked{RESET}")
-            return None, None
-        
-        href = match.group(1)
-        if not href.startswith("http"):
-            href = urllib.parse.urljoin("https://kuli.com.ua", href)
-        
-        # Now verify the found game page
-        game_res = requests.get(href, timeout=10, headers=headers)
-        if game_res.status_code != 200:
-            return None, None
-        
-        game_html = game_res.text
-        if "item__instruction-main" in game_html:
-            return "COMMUNITY", href
-        
-        if any(m in game_html for m in ["html-product-details-page", "game-page", "item__title"]):
-            return "OFFICIAL", href
-        
-        return None, None
-    except Exception as e:
-        print(f"    {RED}Search error: {e}{RESET}")
-        return None, None
+class CassetteMiss(Exception):
+    """Replay mode asked for a request that was never recorded."""
+
+
+# Request headers that can change kuli's answer; the rest (User-Agent) don't split recordings
+CASSETTE_KEY_HEADERS = ("accept", "accept-language")
+
+
+def cassette_key(method, url, headers=None):
+    """method + URL + the CASSETTE_KEY_HEADERS the request carried."""
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    varying = [f"{name}={headers[name]}" for name in CASSETTE_KEY_HEADERS if name in headers]
+    return " ".join([method.upper(), url, *varying])
+
+
+class Cassette:
+    """Gzip-compressed JSONL store of recorded responses, keyed by
+    cassette_key() (method, URL and the headers that vary the response).
+
+    Record mode appends every response as it arrives; replay mode loads the
+    whole file into memory and serves from it without touching the network.
+    Cassettes recorded before requests were keyed this way still replay by
+    URL alone.
+    """
+
+    def __init__(self, path, mode):
+        self.path = path
+        self.mode = mode
+        self.entries = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._out = None
+        if mode == "replay":
+            self._load()
+        else:
+            self._out = gzip.open(path, "at", encoding="utf-8")
+
+    def _load(self):
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    if "method" in entry:
+                        key = cassette_key(entry["method"], entry["url"], entry.get("headers"))
+                    else:
+                        key = entry["url"]
+                    self.entries[key] = (entry["status"], entry["body"])
+        except EOFError:
+            pass  # recording was interrupted; keep what was written
+
+    def lookup(self, method, url, headers=None):
+        key = cassette_key(method, url, headers)
+        response = self.entries.get(key) or self.entries.get(url)
+        if response is None:
+            raise CassetteMiss(key)
+        with self._lock:
+            self.hits += 1
+        return response
+
+    def record(self, method, url, headers, status, body):
+        varying = {k: v for k, v in (headers or {}).items() if k.lower() in CASSETTE_KEY_HEADERS}
+        line = json.dumps(
+            {"method": method, "url": url, "headers": varying, "status": status, "body": body}, ensure_ascii=False
+        )
+        with self._lock:
+            self.entries[cassette_key(method, url, varying)] = (status, body)
+            self._out.write(line + "\n")
+
+    def close(self):
+        if self._out:
+            self._out.close()
+            self._out = None
+
+
+class Fetcher:
+    """Shared HTTP session with a per-host concurrency limit and latency log."""
+
+    def __init__(self, per_host=4, delay=0.5, timeout=10, cassette=None):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(per_host, 1) * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.per_host = max(per_host, 1)
+        self.delay = delay
+        self.timeout = timeout
+        self.cassette = cassette
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.latencies = []
 
-def check_kuli(game_name):
-    """Check kuli.com.ua and return (status, url) tuple"""
+    def _host_slot(self, url):
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def get(self, url, headers=None):
+        """GET url, returning (status_code, text)."""
+        if self.cassette and self.cassette.mode == "replay":
+            start = time.perf_counter()
+            response = self.cassette.lookup("GET", url, headers)
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+            return response
+
+        with self._host_slot(url):
+            start = time.perf_counter()
+            try:
+                res = self.session.get(url, timeout=self.timeout, headers=headers)
+                if self.cassette:
+                    self.cassette.record("GET", url, headers, res.status_code, res.text)
+                return res.status_code, res.text
+            finally:
+                with self._lock:
+                    self.latencies.append(time.perf_counter() - start)
+                if self.delay:
+                    time.sleep(self.delay)  # Be nice to the server
+
+
+def search_kuli_for_game(game_name, fetcher):
+    """Search kuli.com.ua and return (status, url, note) tuple"""
+    search_url = f"https://kuli.com.ua/games?query={urllib.parse.quote(game_name)}"
+    status_code, html = fetcher.get(search_url, BROWSER_HEADERS)
+
+    if status_code != 200:
+        return None, None, f"search HTTP {status_code}"
+
+    # Regex to match product-item link. Uses DOTALL to handle newlines between attributes.
+    match = re.search(r'class="product-item[^"]*".*?href="([^"]+)"', html, re.DOTALL)
+
+    if not match:
+        # Try finding ANY product link if the strict class match fails
+        match = re.search(r'class="product-item-full[^"]*".*?href="([^"]+)"', html, re.DOTALL)
+
+    if not match:
+        # Last resort: just find the first link inside a product-grid item
+        match = re.search(r'class="item-grid".*?href="([^"]+)"', html, re.DOTALL)
+
+    if not match:
+        return None, None, "no search results"
+
+    href = match.group(1)
+    if not href.startswith("http"):
+        href = urllib.parse.urljoin("https://kuli.com.ua", href)
+
+    # Now verify the found game page
+    status_code, game_html = fetcher.get(href, BROWSER_HEADERS)
+    if status_code != 200:
+        return None, None, f"search hit HTTP {status_code}"
+
+    status = status_from_html(game_html)
+    return status, (href if status else None), None if status else "search hit has no status"
+
+
+def status_from_html(html):
+    if "item__instruction-main" in html:
+        return "COMMUNITY"
+    if any(m in html for m in ["html-product-details-page", "game-page", "item__title"]):
+        return "OFFICIAL"
+    return None
+
+
+def check_kuli(game_name, fetcher):
+    """Check kuli.com.ua and return a result record for game_name"""
     slug = urlify_game_name(game_name)
     url = f"https://kuli.com.ua/{slug}"
-    print(f"Checking {game_name} -> {url} ... ", end="", flush=True)
-    
+    record = {"game": game_name, "status": None, "url": None, "via": None, "note": None}
+    start = time.perf_counter()
+
     try:
-        r = requests.get(url, timeout=10, headers={"Accept": "text/html"})
-        
-        if r.status_code == 404:
-            print(f"{YELLOW}Direct 404. Searching...{RESET}", end="", flush=True)
-            status, found_url = search_kuli_for_game(game_name)
-            if status:
-                print(f" {GREEN}Found via search ({status}){RESET}")
-                print(f"    {CYAN}URL: {found_url}{RESET}")
-                return status, found_url
-            else:
-                print(f" {RED}Not found in search{RESET}")
-                return None, None
-        
-        if r.status_code != 200:
-            print(f" {RED}HTTP {r.status_code}{RESET}")
-            return None, None
-        
-        html = r.text
-        if "item__instruction-main" in html:
-            print(f" {GREEN}FOUND (COMMUNITY){RESET}")
-            print(f"    {CYAN}URL: {url}{RESET}")
-            return "COMMUNITY", url
-        
-        if any(m in html for m in ["html-product-details-page", "game-page", "item__title"]):
-            print(f" {GREEN}FOUND (OFFICIAL){RESET}")
-            print(f"    {CYAN}URL: {url}{RESET}")
-            return "OFFICIAL", url
-        
-        print(f" {RED}Page found but no status detected{RESET}")
-        return None, None
-        
+        status_code, html = fetcher.get(url, {"Accept": "text/html"})
+
+        if status_code == 404:
+            status, found_url, note = search_kuli_for_game(game_name, fetcher)
+            record.update(status=status, url=found_url, via="search", note=note)
+        elif status_code != 200:
+            record["note"] = f"HTTP {status_code}"
+        else:
+            status = status_from_html(html)
+            record.update(status=status, url=url if status else None, via="direct",
+                          note=None if status else "page found but no status detected")
+    except CassetteMiss as e:
+        record["note"] = f"not in cassette: {e}"
     except Exception as e:
-        print(f" {RED}Exception: {e}{RESET}")
-        return None, None
+        record["note"] = f"exception: {e}"
 
-def main():
-    print("Validating Kuli Integration (Production Logic)")
-    print("=" * 60)
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+def print_record(record):
+    status = record["status"]
+    if status:
+        via = " via search" if record["via"] == "search" else ""
+        print(f"{record['game']:40} {GREEN}{status}{via}{RESET} {CYAN}{record['url']}{RESET}")
+    else:
+        note = f" ({record['note']})" if record.get("note") else ""
+        print(f"{record['game']:40} {RED}NOT_FOUND{RESET}{YELLOW}{note}{RESET}")
+
+
+# ============================================
+# Bulk mode
+# ============================================
+
+def read_games(path):
+    """Read titles from a text/JSONL file, or stdin when path is '-'.
+
+    Returns (titles, appids); JSONL lines may carry an "appid" that is copied
+    into the result records, which is what build_seed_index.py keys on.
+    """
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        games = []
+        appids = {}
+        for line in stream:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                line = str(item.get("game") or item.get("name") or "").strip()
+                if line and item.get("appid"):
+                    appids.setdefault(line, int(item["appid"]))
+            if line:
+                games.append(line)
+        # Keep first occurrence order, drop duplicates
+        return list(dict.fromkeys(games)), appids
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+# Notes of lookups that never got an answer; build_seed_index.py skips these too
+FAILED_LOOKUP_NOTE = re.compile(r"HTTP \d+|^exception:|^not in cassette")
+
+
+def lookup_failed(record):
+    """True if the record says nothing about the game: the lookup itself failed."""
+    return not record.get("status") and bool(FAILED_LOOKUP_NOTE.search(record.get("note") or ""))
+
+
+def read_done(path):
+    """Titles already answered in a previous output file.
+
+    Failed lookups don't count, so --resume retries them.
+    """
+    done = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                if "game" in record and not lookup_failed(record):
+                    done[record["game"]] = record
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_checks(games, fetcher, workers, output=None, verbose=True, appids=None):
+    """Check games concurrently, appending each record to output as it completes."""
+    appids = appids or {}
     results = {}
-    
-    for game in GAMES:
-        status, url = check_kuli(game)
-        results[game] = (status, url)
-        time.sleep(0.5)  # Be nice to the server
-    
+    out = open(output, "a", encoding="utf-8") if output else None
+    write_lock = threading.Lock()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            futures = {pool.submit(check_kuli, game, fetcher): game for game in games}
+            for future in as_completed(futures):
+                record = future.result()
+                if record["game"] in appids:
+                    record["appid"] = appids[record["game"]]
+                results[record["game"]] = record
+                with write_lock:
+                    if out:
+                        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        out.flush()
+                    if verbose:
+                        print_record(record)
+    finally:
+        if out:
+            out.close()
+    return results
+
+
+def print_summary(games, results, checked_now, fetcher, wall_time):
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    
-    official = 0
-    community = 0
-    not_found = 0
-    
-    for game, (status, url) in results.items():
-        status_str = status or "NOT_FOUND"
-        color = GREEN if status else RED
-        url_str = f" -> {url}" if url else ""
-        print(f"{game:40} {color}{status_str}{RESET}{url_str}")
-        
-        if status == "OFFICIAL":
-            official += 1
-        elif status == "COMMUNITY":
-            community += 1
-        else:
-            not_found += 1
-    
-    total = len(GAMES)
+
+    official = sum(1 for g in games if (results.get(g) or {}).get("status") == "OFFICIAL")
+    community = sum(1 for g in games if (results.get(g) or {}).get("status") == "COMMUNITY")
+    total = len(games)
     found = official + community
-    
-    print("=" * 60)
+    not_found = total - found
+
     print(f"Official:   {official}/{total}")
     print(f"Community:  {community}/{total}")
     print(f"Not Found:  {not_found}/{total}")
-    print(f"Total Success Rate: {found}/{total} ({found*100//total}%)")
+    if total:
+        print(f"Total Success Rate: {found}/{total} ({found*100//total}%)")
+
+    checked = [r["elapsed_ms"] for r in checked_now.values() if "elapsed_ms" in r]
+    requests_ms = [s * 1000 for s in fetcher.latencies]
+    print("=" * 60)
+    if wall_time > 0 and checked:
+        print(f"Throughput: {len(checked) / wall_time:.2f} games/s, "
+              f"{len(requests_ms) / wall_time:.2f} requests/s over {wall_time:.1f}s")
+    for label, values in (("Per game", checked), ("Per request", requests_ms)):
+        if values:
+            print(f"{label + ' latency':22} p50={percentile(values, 50):.1f}ms "
+                  f"p90={percentile(values, 90):.1f}ms p99={percentile(values, 99):.1f}ms "
+                  f"max={max(values):.1f}ms")
+
+
+def score_against(expected, results):
+    """Compare status/url per title with a previous results file."""
+    common = [g for g in results if g in expected]
+    if not common:
+        print("No titles in common with the expected results")
+        return
+    same_status = [g for g in common if results[g]["status"] == expected[g].get("status")]
+    same_url = [g for g in common if results[g]["url"] == expected[g].get("url")]
+
+    print("=" * 60)
+    print(f"Accuracy vs expected: status {len(same_status)}/{len(common)} "
+          f"({len(same_status)*100//len(common)}%), url {len(same_url)}/{len(common)} "
+          f"({len(same_url)*100//len(common)}%)")
+    for game in common:
+        if game in same_status and game in same_url:
+            continue
+        was, now = expected[game], results[game]
+        print(f"  {game:38} {YELLOW}{was.get('status')} {was.get('url')}{RESET} -> "
+              f"{CYAN}{now['status']} {now['url']}{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate kuli.com.ua lookups (production logic)")
+    parser.add_argument("--games", default=None,
+                        help="File with one title per line (or JSONL), '-' for stdin. Default: built-in list")
+    parser.add_argument("--output", default=None, help="Append results to this JSONL file")
+    parser.add_argument("--resume", action="store_true", help="Skip titles already in --output")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent game checks")
+    parser.add_argument("--per-host", type=int, default=4, help="Max concurrent requests per host")
+    parser.add_argument("--delay", type=float, default=0.5,
+                        help="Pause after each network request, per host slot (replays never wait)")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE", help="Save all responses to a gzip cassette")
+    cassette_group.add_argument("--replay", metavar="CASSETTE", help="Serve responses from a cassette, offline")
+    parser.add_argument("--expect", metavar="JSONL", help="Score results against a previous output file")
+    args = parser.parse_args()
+
+    games, appids = read_games(args.games) if args.games else (GAMES, {})
+
+    previous = {}
+    if args.resume:
+        if not args.output:
+            parser.error("--resume requires --output")
+        previous = read_done(args.output)
+
+    pending = [g for g in games if g not in previous]
+    print("Validating Kuli Integration (Production Logic)")
+    print(f"{len(games)} titles, {len(games) - len(pending)} already done, {len(pending)} to check")
+    print("=" * 60)
+
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay")
+        print(f"Replaying {len(cassette.entries)} recorded responses from {args.replay}")
+
+    fetcher = Fetcher(per_host=args.per_host, delay=args.delay, cassette=cassette)
+    start = time.perf_counter()
+    try:
+        results = run_checks(pending, fetcher, args.workers, args.output,
+                             verbose=not args.quiet, appids=appids)
+    finally:
+        if cassette:
+            cassette.close()
+    wall_time = time.perf_counter() - start
+
+    print_summary(games, {**previous, **results}, results, fetcher, wall_time)
+    if args.expect:
+        score_against(read_done(args.expect), results)
+
 
 if __name__ == "__main__":
     main()
@@ -3,11 +3,9 @@ import React, { FC, useState, useEffect } from "react";
 import { PanelSection, PanelSectionRow, ButtonItem } from "@decky/ui";
 import { FaSteam, FaYoutube, FaGithub, FaQrcode, FaGamepad, FaBitcoin } from "react-icons/fa";
 import { FaXTwitter } from "react-icons/fa6";
-import { call } from "@decky/api";
+import { addEventListener, removeEventListener } from "@decky/api";
 import { t } from "../translations";
-import { logger } from "../logger";
-
-const log = logger.component("LinksSection");
+import { VersionContext } from "../hooks/useSettings";
 
 interface LinksSectionProps {
     lang: "en" | "uk";
@@ -56,41 +54,31 @@ export const LinksSection: FC<LinksSectionProps> = ({ lang, openUrl }) => {
     const [showCryptoQR, setShowCryptoQR] = useState(false);
     const [versionInfo, setVersionInfo] = useState<VersionInfo | null>(null);
 
-    // Check for updates on mount
+    // Version and last update check come with bootstrap; a stale check is
+    // refreshed by the backend and pushed as an update_check event
     useEffect(() => {
-        const checkVersion = async () => {
-            // First, get current version immediately
-            try {
-                const current = await call<[], string>("get_current_version");
-                setVersionInfo(prev => prev ? { ...prev, current } : {
-                    current,
+        const sub = VersionContext.subscribe(({ version, update }) => {
+            if (update) {
+                setVersionInfo(update as unknown as VersionInfo);
+            } else if (version) {
+                setVersionInfo(prev => prev ?? {
+                    current: version,
                     latest: null,
                     update_available: false,
                     source_ok: false,
                     error: null
                 });
-            } catch (e) {
-                log.warn("Failed to get immediate version:", e);
             }
+        });
 
-            // Then check for latest on GitHub
-            try {
-                const info = await call<[], VersionInfo>("get_latest_version");
-                log.info("Full version info:", info);
-                setVersionInfo(info);
-            } catch (e) {
-                log.error("Failed to check version from GitHub:", e);
-                // Preserve current version if we already fetched it
-                setVersionInfo(prev => prev ? { ...prev, update_available: false, source_ok: false, error: "Version check failed" } : {
-                    current: "unknown",
-                    latest: null,
-                    update_available: false,
-                    source_ok: false,
-                    error: "Version check failed"
-                });
-            }
+        const onUpdateCheck = (info: VersionInfo) => {
+            if (info) setVersionInfo(info);
+        };
+        addEventListener<[VersionInfo]>("update_check", onUpdateCheck);
+        return () => {
+            sub.unsubscribe();
+            removeEventListener("update_check", onUpdateCheck);
         };
-        checkVersion();
     }, []);
 
 
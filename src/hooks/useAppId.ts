@@ -1,12 +1,42 @@
 // decky-ukr-badge/src/hooks/useAppId.ts
 import { useEffect, useState } from "react";
 import { useParams } from "./useParams";
-import { fetchNoCors } from "@decky/api";
+import { call, fetchNoCors } from "@decky/api";
 import { cleanNonSteamName, isSteamAppId } from "../utils";
 import { logger } from "../logger";
 
 const log = logger.component("useAppId");
 
+type SteamAppLookup = {
+    success: boolean;
+    match?: "exact" | "prefix" | "fuzzy" | null;
+    results?: { appid: string; name: string }[];
+    error?: string;
+    pending?: boolean;
+};
+
+type SteamApp = { appid: string; name: string };
+
+/**
+ * Exact (cleaned) name match through the backend's app list index, or
+ * through the store's search while that index is unavailable.
+ */
+async function findSteamApp(cleanedName: string): Promise<SteamApp | undefined> {
+    const lookup = await call<[string], SteamAppLookup>("find_steam_app", cleanedName);
+    if (lookup?.success) {
+        // Only an exact (normalized) name match is trusted
+        return lookup.match === "exact" ? lookup.results?.[0] : undefined;
+    }
+    log.info(`Steam app index unavailable (${lookup?.pending ? "building" : lookup?.error}), searching the store`);
+    const searchRes = await fetchNoCors(
+        `https://steamcommunity.com/actions/SearchApps/${encodeURIComponent(cleanedName)}`,
+        { method: "GET" }
+    );
+    if (!searchRes.ok) return undefined;
+    const options = await searchRes.json() as SteamApp[];
+    return options.find(o => cleanNonSteamName(o.name).toLowerCase() === cleanedName.toLowerCase());
+}
+
 // Declare appStore for TypeScript
 declare const appStore: {
     GetAppOverviewByGameID: (id: number) => {
@@ -108,22 +138,12 @@ export function useAppId(): {
                     if (cleanedName && cleanedName.length > 2) {
                         log.info(`Resolving non-Steam game: ${cleanedName} (ID: ${pathId})`);
                         try {
-                            const searchRes = await fetchNoCors(
-                                `https://steamcommunity.com/actions/SearchApps/${encodeURIComponent(cleanedName)}`,
-                                { method: "GET" }
-                            );
-                            if (searchRes.ok) {
-                                const options = await searchRes.json() as { appid: string; name: string }[];
-                                // Simple match: first result where name roughly matches
-                                const match = options.find(o =>
-                                    cleanNonSteamName(o.name).toLowerCase() === cleanedName.toLowerCase()
-                                );
-
-                                if (match) {
-                                    log.info(`Resolved ${cleanedName} -> ${match.name} (AppID: ${match.appid})`);
-                                    setAppId(match.appid); // Treat as this Steam game!
-                                    setAppName(match.name);
-                                }
+                            const match = await findSteamApp(cleanedName);
+                            if (ignore) return;
+                            if (match) {
+                                log.info(`Resolved ${cleanedName} -> ${match.name} (AppID: ${match.appid})`);
+                                setAppId(match.appid); // Treat as this Steam game!
+                                setAppName(match.name);
                             }
                         } catch (err) {
                             log.warn("Failed to resolve non-Steam game name:", err);
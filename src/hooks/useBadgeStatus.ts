@@ -1,12 +1,13 @@
 // decky-ukr-badge/src/hooks/useBadgeStatus.ts
 import { useState, useEffect } from "react";
-import { fetchNoCors } from "@decky/api";
-import { callBackend } from "./useSettings";
+import { addEventListener, fetchNoCors, removeEventListener } from "@decky/api";
+import { bootstrap, cancelRequest, SettingsContext } from "./useSettings";
 import {
     cleanNonSteamName,
     searchKuli,
     fetchWithTimeout,
     isSteamAppId,
+    supportsLanguage,
 } from "../utils";
 import { logger } from "../logger";
 
@@ -16,6 +17,28 @@ export type BadgeStatus = "OFFICIAL" | "COMMUNITY" | "NONE";
 
 const statusCache: Record<string, { status: BadgeStatus; url: string | null }> = {};
 
+// Statuses are per target language; the backend re-answers from cached
+// language data, so dropping ours only costs a local call per badge.
+let cachedLanguage = SettingsContext.value.targetLanguage;
+SettingsContext.subscribe((settings) => {
+    if (settings.targetLanguage === cachedLanguage) return;
+    cachedLanguage = settings.targetLanguage;
+    for (const key of Object.keys(statusCache)) delete statusCache[key];
+});
+
+type BackendStatus = {
+    app_id: string;
+    status: BadgeStatus | null;
+    url: string | null;
+    pending?: boolean;
+    stale?: boolean;
+};
+
+// How long to wait for a pushed badge_status before resolving here instead
+const BACKEND_EVENT_TIMEOUT_MS = 20000;
+
+let requestCounter = 0;
+
 /**
  * Hook to manage fetching of Ukrainian localization status
  */
@@ -26,6 +49,27 @@ export function useBadgeStatus(appId: string | undefined, appName: string | unde
 
     useEffect(() => {
         let cancelled = false;
+        let fallbackTimer: ReturnType<typeof setTimeout> | undefined;
+        // Lets the backend drop this page's lookup once we navigate away
+        const requestId = `${appId}:${++requestCounter}`;
+        let backendPending = false;
+
+        function applyStatus(id: string, next: BadgeStatus, nextUrl: string | null) {
+            statusCache[id] = { status: next, url: nextUrl };
+            setStatus(next);
+            setUrl(nextUrl);
+            setLoading(false);
+        }
+
+        // Results of background resolution / revalidation pushed by the backend
+        const onBadgeStatus = (event: BackendStatus) => {
+            if (cancelled || !appId || !event?.status || String(event.app_id) !== appId) return;
+            if (fallbackTimer) clearTimeout(fallbackTimer);
+            backendPending = false;
+            log.info(`Pushed status for ${appId}:`, event);
+            applyStatus(appId, event.status, event.url);
+        };
+        addEventListener<[BackendStatus]>("badge_status", onBadgeStatus);
 
         async function fetchStatus() {
             if (!appId) {
@@ -42,7 +86,37 @@ export function useBadgeStatus(appId: string | undefined, appName: string | unde
                 return;
             }
 
+            // 0. Backend status cache / seed index (with settings, in one call);
+            //    anything else arrives as a badge_status event
+            try {
+                const backend = (await bootstrap<BackendStatus>(appId, appName || "", requestId))?.status;
+                if (cancelled) {
+                    // Navigated away while bootstrap was in flight
+                    if (backend?.pending) cancelRequest(requestId);
+                    return;
+                }
+                if (backend?.status) {
+                    log.info(`Backend status for ${appId}:`, backend);
+                    applyStatus(appId, backend.status, backend.url);
+                    return;
+                }
+                if (backend?.pending) {
+                    backendPending = true;
+                    fallbackTimer = setTimeout(() => {
+                        if (!cancelled) resolveLocally(appId);
+                    }, BACKEND_EVENT_TIMEOUT_MS);
+                    return;
+                }
+            } catch (e) {
+                log.warn(`Backend status lookup failed for ${appId}:`, e);
+            }
+
+            await resolveLocally(appId);
+        }
+
+        async function resolveLocally(appId: string) {
             try {
+                const language = SettingsContext.value.targetLanguage;
                 let currentAppName = cleanNonSteamName(appName || "");
                 const isSteamId = isSteamAppId(appId);
 
@@ -64,7 +138,7 @@ export function useBadgeStatus(appId: string | undefined, appName: string | unde
                             storeName = steamData[appId].data.name;
                             currentAppName = storeName || currentAppName;
                             const languages = steamData[appId].data.supported_languages || "";
-                            if (languages.toLowerCase().includes("ukrainian")) {
+                            if (supportsLanguage(languages, language)) {
                                 steamStatus = "OFFICIAL";
                             }
                         }
@@ -73,14 +147,15 @@ export function useBadgeStatus(appId: string | undefined, appName: string | unde
                     }
                 }
 
-                // 2. Kuli Community Support (via consolidated searchKuli)
+                // 2. Kuli Community Support (via consolidated searchKuli);
+                //    kuli only lists Ukrainian translations
                 let kuliStatus: BadgeStatus | null = null;
                 let kuliUrl: string | null = null;
 
                 // Priority: Steam Store Name > Initial appName
                 const searchName = storeName || currentAppName;
 
-                if (!cancelled && searchName) {
+                if (!cancelled && searchName && language === "ukrainian") {
                     log.info(`Resolving Kuli for: ${searchName} (AppID: ${appId})`);
                     try {
                         const response = await searchKuli(searchName);
@@ -125,7 +200,12 @@ export function useBadgeStatus(appId: string | undefined, appName: string | unde
         setLoading(true);
         fetchStatus();
 
-        return () => { cancelled = true; };
+        return () => {
+            cancelled = true;
+            if (fallbackTimer) clearTimeout(fallbackTimer);
+            if (backendPending) cancelRequest(requestId);
+            removeEventListener("badge_status", onBadgeStatus);
+        };
     }, [appId, appName]);
 
     return { status, url, loading };
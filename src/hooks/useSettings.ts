@@ -25,6 +25,11 @@ export type Settings = {
     showOnStore: boolean;
     storeOffsetX: number;
     storeOffsetY: number;
+    // Steam language code the badge answers for
+    targetLanguage: string;
+    // Pause background fetching and cap foreground traffic per day
+    dataSaver: boolean;
+    dataSaverDailyMB: number;
 };
 
 const DEFAULT_SETTINGS: Settings = {
@@ -35,11 +40,23 @@ const DEFAULT_SETTINGS: Settings = {
     showOnStore: true,
     storeOffsetX: 0,
     storeOffsetY: 20,
+    targetLanguage: "ukrainian",
+    dataSaver: false,
+    dataSaverDailyMB: 20,
 };
 
 const SettingsContext = new BehaviorSubject<Settings>(DEFAULT_SETTINGS);
 const LoadingContext = new BehaviorSubject<boolean>(true);
 
+export type VersionState = {
+    // Installed version; null until the first bootstrap answers
+    version: string | null;
+    // Last update check (get_latest_version result), if any
+    update: Record<string, unknown> | null;
+};
+
+const VersionContext = new BehaviorSubject<VersionState>({ version: null, update: null });
+
 async function updateSetting<K extends keyof Settings>(key: K, value: Settings[K]) {
     const oldSettings = SettingsContext.value;
     const newSettings = { ...oldSettings, [key]: value };
@@ -55,23 +72,66 @@ async function updateSetting<K extends keyof Settings>(key: K, value: Settings[K
     }
 }
 
+export type BootstrapResult<S> = {
+    settings: Settings;
+    version: string;
+    update: Record<string, unknown> | null;
+    status: S | null;
+};
+
+function publishVersion(result: BootstrapResult<unknown> | null) {
+    if (!result?.version) return;
+    VersionContext.next({ version: result.version, update: result.update ?? VersionContext.value.update });
+}
+
+/**
+ * One backend round trip for page load: settings, installed version,
+ * last update check and the cached badge status for appId.
+ * Settings received here also satisfy loadSettings(), and the version
+ * and update state feed VersionContext.
+ * requestId tags the status lookup so cancelRequest() can abort it.
+ */
+export async function bootstrap<S>(appId: string, appName: string, requestId = ""): Promise<BootstrapResult<S> | null> {
+    const result = await callBackend<BootstrapResult<S> | null>("bootstrap", appId, appName, requestId);
+    if (result?.settings && typeof result.settings === "object" && LoadingContext.value) {
+        SettingsContext.next({ ...DEFAULT_SETTINGS, ...result.settings });
+        LoadingContext.next(false);
+    }
+    publishVersion(result);
+    return result;
+}
+
+/**
+ * Tell the backend nobody is waiting on requestId any more. Lookups other
+ * pages still wait on keep running.
+ */
+export async function cancelRequest(requestId: string): Promise<void> {
+    try {
+        await call<[string], boolean>("cancel", requestId);
+    } catch (error) {
+        log.warn(`Cancelling ${requestId} failed:`, error);
+    }
+}
+
 export function loadSettings() {
     if (!LoadingContext.value && SettingsContext.value !== DEFAULT_SETTINGS) return;
 
     LoadingContext.next(true);
     log.info("Loading settings via call...");
 
-    // Retry function with backoff
+    // Retry function with backoff. bootstrap without an app brings the
+    // version and update state along with the settings.
     const tryLoad = async (attempt: number, maxAttempts: number): Promise<Settings> => {
         const timeout = 3000 + (attempt * 2000); // 3s, 5s, 7s...
         log.info(`Settings load attempt ${attempt + 1}/${maxAttempts} (timeout: ${timeout}ms)`);
 
         try {
             const result = await Promise.race([
-                call<[], Settings>("get_settings"),
+                call<[string, string, string], BootstrapResult<null>>("bootstrap", "", "", ""),
                 new Promise<never>((_, reject) => setTimeout(() => reject(new Error("Timeout")), timeout))
             ]);
-            return result;
+            publishVersion(result);
+            return result?.settings ?? DEFAULT_SETTINGS;
         } catch (error) {
             if (attempt < maxAttempts - 1) {
                 log.warn(`Attempt ${attempt + 1} failed, retrying...`, error);
@@ -118,7 +178,10 @@ export function useSettings() {
         setShowOnStore: (v: Settings["showOnStore"]) => updateSetting("showOnStore", v),
         setStoreOffsetX: (v: Settings["storeOffsetX"]) => updateSetting("storeOffsetX", v),
         setStoreOffsetY: (v: Settings["storeOffsetY"]) => updateSetting("storeOffsetY", v),
+        setTargetLanguage: (v: Settings["targetLanguage"]) => updateSetting("targetLanguage", v),
+        setDataSaver: (v: Settings["dataSaver"]) => updateSetting("dataSaver", v),
+        setDataSaverDailyMB: (v: Settings["dataSaverDailyMB"]) => updateSetting("dataSaverDailyMB", v),
     };
 }
 
-export { SettingsContext };
+export { SettingsContext, VersionContext };
@@ -0,0 +1,46 @@
+// decky-ukr-badge/src/languages.ts
+
+/**
+ * Steam language codes the badge can be shown for, with the store display
+ * names appdetails (l=en) uses in `supported_languages`; the same languages
+ * as STEAM_LANGUAGES in main.py, Ukrainian first.
+ */
+export const STEAM_LANGUAGES: { code: string; name: string }[] = [
+    { code: "ukrainian", name: "Ukrainian" },
+    { code: "english", name: "English" },
+    { code: "french", name: "French" },
+    { code: "italian", name: "Italian" },
+    { code: "german", name: "German" },
+    { code: "spanish", name: "Spanish - Spain" },
+    { code: "arabic", name: "Arabic" },
+    { code: "bulgarian", name: "Bulgarian" },
+    { code: "schinese", name: "Simplified Chinese" },
+    { code: "tchinese", name: "Traditional Chinese" },
+    { code: "czech", name: "Czech" },
+    { code: "danish", name: "Danish" },
+    { code: "dutch", name: "Dutch" },
+    { code: "finnish", name: "Finnish" },
+    { code: "greek", name: "Greek" },
+    { code: "hungarian", name: "Hungarian" },
+    { code: "indonesian", name: "Indonesian" },
+    { code: "japanese", name: "Japanese" },
+    { code: "koreana", name: "Korean" },
+    { code: "norwegian", name: "Norwegian" },
+    { code: "polish", name: "Polish" },
+    { code: "portuguese", name: "Portuguese - Portugal" },
+    { code: "brazilian", name: "Portuguese - Brazil" },
+    { code: "romanian", name: "Romanian" },
+    { code: "russian", name: "Russian" },
+    { code: "latam", name: "Spanish - Latin America" },
+    { code: "swedish", name: "Swedish" },
+    { code: "thai", name: "Thai" },
+    { code: "turkish", name: "Turkish" },
+    { code: "vietnamese", name: "Vietnamese" },
+];
+
+/**
+ * Store display name of a Steam language code.
+ */
+export function steamLanguageName(code: string): string {
+    return STEAM_LANGUAGES.find(l => l.code === code)?.name || code;
+}
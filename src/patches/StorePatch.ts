@@ -1,5 +1,5 @@
 // decky-ukr-badge/src/patches/StorePatch.ts
-import { fetchNoCors } from "@decky/api";
+import { call, fetchNoCors } from "@decky/api";
 import { findModuleExport } from "@decky/ui";
 import { BehaviorSubject } from "rxjs";
 import { SettingsContext } from "../hooks/useSettings";
@@ -44,6 +44,46 @@ const History = HistoryModule?.m_history;
 // Track if WebSocket is ready for injection
 let wsReady = false;
 
+// Other apps linked from the store page (recommendations, bundles, DLC),
+// collected after it settles and sent to the backend as a prefetch hint
+const PREFETCH_HINT_DELAY_MS = 1500;
+let hintMessageId = 0;
+let hintTimer: ReturnType<typeof setTimeout> | undefined;
+
+const collectLinkedAppsScript = `
+(function() {
+  const ids = [];
+  for (const link of document.querySelectorAll('a[href*="/app/"]')) {
+    const m = link.href.match(/\\/app\\/(\\d+)/);
+    if (m && !ids.includes(m[1])) ids.push(m[1]);
+  }
+  return ids;
+})();
+`;
+
+function requestPrefetchHint(appId: string) {
+    if (hintTimer) clearTimeout(hintTimer);
+    hintTimer = setTimeout(() => {
+        if (!storeWebSocket || storeWebSocket.readyState !== WebSocket.OPEN || storeAppId$.value !== appId) return;
+        hintMessageId = messageId++;
+        storeWebSocket.send(JSON.stringify({
+            id: hintMessageId,
+            method: "Runtime.evaluate",
+            params: { expression: collectLinkedAppsScript, returnByValue: true }
+        }));
+    }, PREFETCH_HINT_DELAY_MS);
+}
+
+function sendPrefetchHint(ids: unknown) {
+    if (!Array.isArray(ids)) return;
+    // Page order is roughly how prominent each link is; the backend keeps the first few
+    const appIds = ids.map(String).filter((id) => id !== storeAppId$.value);
+    if (!appIds.length) return;
+    call<[string[]], { queued: string[] }>("prefetch_hint", appIds).catch((e) => {
+        log.warn("Prefetch hint failed:", e);
+    });
+}
+
 // Inject badge into store page via WebSocket debugger
 async function injectBadgeIntoStore(appId: string) {
     // Check if store badge is enabled in settings
@@ -240,6 +280,7 @@ function updateAppIdFromUrl(url: string) {
         // Inject or remove badge based on app ID
         if (appId) {
             injectBadgeIntoStore(appId);
+            requestPrefetchHint(appId);
         } else {
             removeBadgeFromStore();
         }
@@ -295,6 +336,11 @@ async function connectToStoreDebugger(retries = 3): Promise<void> {
 
             try {
                 const data = JSON.parse(event.data);
+                if (hintMessageId && data.id === hintMessageId) {
+                    hintMessageId = 0;
+                    sendPrefetchHint(data.result?.result?.value);
+                    return;
+                }
                 // Listen for frame navigation events
                 if (data.method === "Page.frameNavigated" && data.params?.frame?.url) {
                     // Delay injection to let the page load
@@ -335,6 +381,8 @@ function disconnectStoreDebugger() {
 
     isStoreMounted = false;
     wsReady = false;
+    if (hintTimer) clearTimeout(hintTimer);
+    hintMessageId = 0;
     storeAppId$.next("");
 
     if (storeWebSocket) {
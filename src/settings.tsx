@@ -10,6 +10,7 @@ import {
 } from "@decky/ui";
 import { t, getSupportedLanguage } from "./translations";
 import { useSettings } from "./hooks/useSettings";
+import { STEAM_LANGUAGES } from "./languages";
 import Spinner from "./components/Spinner";
 import { LinksSection } from "./components/LinksSection";
 
@@ -20,9 +21,10 @@ export const Settings: FC = () => {
     const {
         settings, loading, setBadgeType, setBadgePosition,
         setOffsetX, setOffsetY, setShowOnStore, setStoreOffsetX, setStoreOffsetY,
+        setDataSaver, setDataSaverDailyMB, setTargetLanguage,
     } = useSettings();
 
-    const [offsets, setOffsets] = useState({ x: 10, y: 10, sx: 0, sy: 0 });
+    const [offsets, setOffsets] = useState({ x: 10, y: 10, sx: 0, sy: 0, mb: 20 });
     const [timeouts, setTimeouts] = useState<Record<string, ReturnType<typeof setTimeout> | null>>({});
 
     // Sync local state with settings only when not actively dragging/debouncing
@@ -33,9 +35,10 @@ export const Settings: FC = () => {
                 y: settings.offsetY,
                 sx: settings.storeOffsetX,
                 sy: settings.storeOffsetY,
+                mb: settings.dataSaverDailyMB,
             });
         }
-    }, [settings.offsetX, settings.offsetY, settings.storeOffsetX, settings.storeOffsetY, timeouts]);
+    }, [settings.offsetX, settings.offsetY, settings.storeOffsetX, settings.storeOffsetY, settings.dataSaverDailyMB, timeouts]);
 
     // Cleanup timeouts on unmount
     useEffect(() => {
@@ -68,6 +71,11 @@ export const Settings: FC = () => {
         { data: 0, label: t("type_default", lang), value: "default" as const },
         { data: 1, label: t("type_full", lang), value: "full" as const }
     ];
+    const languageOptions = STEAM_LANGUAGES.map((l, i) => ({
+        data: i,
+        label: l.code === "ukrainian" ? t("ukrainian", lang) : l.name,
+        value: l.code,
+    }));
     const posOptions = [
         { data: 0, label: t("top_left", lang), value: "top-left" as const },
         { data: 1, label: t("top_right", lang), value: "top-right" as const }
@@ -93,6 +101,15 @@ export const Settings: FC = () => {
                             />
                         </PanelSectionRow>
 
+                        <PanelSectionRow>
+                            <DropdownItem
+                                label={t("target_language", lang)}
+                                rgOptions={languageOptions}
+                                selectedOption={languageOptions.findIndex(o => o.value === settings.targetLanguage)}
+                                onChange={(n: any) => setTargetLanguage(languageOptions.find(o => o.data === n.data)!.value)}
+                            />
+                        </PanelSectionRow>
+
                         <PanelSectionRow>
                             <DropdownItem
                                 label={t("badge_position", lang)}
@@ -115,6 +132,14 @@ export const Settings: FC = () => {
 
                         <PanelSectionRow><SliderField label={t("x_offset", lang)} value={offsets.x} min={0} max={300} onChange={v => debouncedSet("x", v, setOffsetX)} showValue /></PanelSectionRow>
                         <PanelSectionRow><SliderField label={t("y_offset", lang)} value={offsets.y} min={0} max={300} onChange={v => debouncedSet("y", v, setOffsetY)} showValue /></PanelSectionRow>
+
+                        <PanelSectionRow>
+                            <ToggleField label={t("data_saver", lang)} description={t("data_saver_description", lang)} checked={!!settings.dataSaver} onChange={setDataSaver} />
+                        </PanelSectionRow>
+
+                        {settings.dataSaver && (
+                            <PanelSectionRow><SliderField label={t("data_saver_daily_mb", lang)} value={offsets.mb} min={5} max={200} step={5} onChange={v => debouncedSet("mb", v, setDataSaverDailyMB)} showValue /></PanelSectionRow>
+                        )}
                     </>
                 )}
             </PanelSection>
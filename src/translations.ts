@@ -43,6 +43,10 @@ const translations: Record<string, TranslationDict> = {
     version_check_failed: "version check failed",
     already_up_to_date: "Already up to date",
     restart_to_apply: "Restart Decky to apply",
+    data_saver: "Data Saver",
+    data_saver_description: "No background fetching; lookups stop once the daily limit is used",
+    data_saver_daily_mb: "Daily Limit (MB)",
+    target_language: "Badge Language",
   },
   uk: {
     plugin_description:
@@ -84,6 +88,10 @@ const translations: Record<string, TranslationDict> = {
     version_check_failed: "помилка перевірки версії",
     already_up_to_date: "Вже оновлено",
     restart_to_apply: "Перезапустіть Decky для застосування",
+    data_saver: "Економія трафіку",
+    data_saver_description: "Без фонових завантажень; після денного ліміту перевірки зупиняються",
+    data_saver_daily_mb: "Денний ліміт (МБ)",
+    target_language: "Мова бейджа",
   },
 };
 
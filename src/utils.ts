@@ -2,6 +2,7 @@
 import { call } from "@decky/api";
 import { fetchNoCors } from "@decky/api";
 import { logger } from "./logger";
+import { steamLanguageName } from "./languages";
 import { callBackend } from "./hooks/useSettings";
 
 const log = logger.component("utils");
@@ -29,6 +30,10 @@ export function isSteamAppId(appId: string | undefined): boolean {
     return !isNaN(id) && id < 1000000000;
 }
 
+export function supportsLanguage(supportedLanguages: string, language: string): boolean {
+    return supportedLanguages.toLowerCase().includes(steamLanguageName(language).toLowerCase());
+}
+
 /**
  * Converts a game name to a URL-friendly format for kuli.com.ua
  */
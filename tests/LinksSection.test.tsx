@@ -1,11 +1,13 @@
 import React from "react";
-import { render, screen, waitFor } from "@testing-library/react";
+import { render, screen, waitFor, act } from "@testing-library/react";
 import { describe, it, expect, vi, beforeEach } from "vitest";
 
 const callMock = vi.fn();
 
 vi.mock("@decky/api", () => ({
   call: (...args: any[]) => callMock(...args),
+  addEventListener: vi.fn(),
+  removeEventListener: vi.fn(),
 }));
 
 vi.mock("@decky/ui", () => ({
@@ -30,6 +32,7 @@ vi.mock("../src/translations", () => ({
 }));
 
 import { LinksSection } from "../src/components/LinksSection";
+import { VersionContext } from "../src/hooks/useSettings";
 
 describe("LinksSection version-only view", () => {
   const openUrl = vi.fn();
@@ -37,17 +40,19 @@ describe("LinksSection version-only view", () => {
   beforeEach(() => {
     callMock.mockReset();
     openUrl.mockReset();
+    VersionContext.next({ version: null, update: null });
   });
 
   it("shows only current version and hides update/diagnostics actions", async () => {
-    callMock
-      .mockResolvedValueOnce("1.0.0")
-      .mockResolvedValueOnce({
+    VersionContext.next({
+      version: "1.0.0",
+      update: {
         current: "1.0.0",
         latest: "1.1.0",
         latest_tag: "v1.1.0",
         update_available: true,
-      });
+      },
+    });
 
     render(React.createElement(LinksSection, { lang: "en", openUrl }));
 
@@ -60,15 +65,17 @@ describe("LinksSection version-only view", () => {
     expect(screen.queryByText(/Force Update/i)).toBeNull();
   });
 
-  it("still renders version when get_latest_version fails", async () => {
-    callMock
-      .mockResolvedValueOnce("1.0.0")
-      .mockRejectedValueOnce(new Error("GitHub failed"));
-
+  it("takes the version from bootstrap instead of calling the backend", async () => {
     render(React.createElement(LinksSection, { lang: "en", openUrl }));
+    expect(screen.getByText(/Version: vunknown/i)).toBeTruthy();
+
+    act(() => {
+      VersionContext.next({ version: "1.0.0", update: null });
+    });
 
     await waitFor(() => {
       expect(screen.getByText(/Version: v1.0.0/i)).toBeTruthy();
     });
+    expect(callMock).not.toHaveBeenCalled();
   });
 });
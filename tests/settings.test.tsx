@@ -1,5 +1,5 @@
 import React from "react";
-import { render, screen } from "@testing-library/react";
+import { render, screen, fireEvent, act } from "@testing-library/react";
 import { describe, it, expect, vi, beforeEach } from "vitest";
 
 const useSettingsMock = vi.fn();
@@ -25,7 +25,8 @@ vi.mock("@decky/ui", () => ({
   PanelSection: ({ children, title }: any) => React.createElement("section", { "data-title": title }, children),
   PanelSectionRow: ({ children }: any) => React.createElement("div", {}, children),
   DropdownItem: ({ label }: any) => React.createElement("div", {}, `dropdown:${label}`),
-  SliderField: ({ label }: any) => React.createElement("div", {}, `slider:${label}`),
+  SliderField: ({ label, value, step, onChange }: any) =>
+    React.createElement("button", { onClick: () => onChange?.(value + (step ?? 1)) }, `slider:${label}`),
   ToggleField: ({ label, checked }: any) => React.createElement("div", {}, `toggle:${label}:${checked}`),
   Navigation: { NavigateToExternalWeb: vi.fn() },
 }));
@@ -88,6 +89,7 @@ describe("Settings component", () => {
 
     expect(screen.getByText("dropdown:badge_type")).toBeInTheDocument();
     expect(screen.getByText("dropdown:badge_position")).toBeInTheDocument();
+    expect(screen.getByText("dropdown:target_language")).toBeInTheDocument();
     expect(screen.getByText("toggle:show_on_store:true")).toBeInTheDocument();
     expect(screen.getByText("slider:store_x_offset")).toBeInTheDocument();
     expect(screen.getByText("slider:store_y_offset")).toBeInTheDocument();
@@ -124,4 +126,80 @@ describe("Settings component", () => {
     expect(screen.getByText("slider:x_offset")).toBeInTheDocument();
     expect(screen.getByText("slider:y_offset")).toBeInTheDocument();
   });
+
+  it("shows the daily limit only in data-saver mode", () => {
+    const state = {
+      settings: {
+        badgeType: "full",
+        badgePosition: "top-right",
+        offsetX: 20,
+        offsetY: 90,
+        showOnStore: true,
+        storeOffsetX: 0,
+        storeOffsetY: 20,
+        dataSaver: false,
+        dataSaverDailyMB: 20,
+      },
+      loading: false,
+      setBadgeType: vi.fn(),
+      setBadgePosition: vi.fn(),
+      setOffsetX: vi.fn(),
+      setOffsetY: vi.fn(),
+      setShowOnStore: vi.fn(),
+      setStoreOffsetX: vi.fn(),
+      setStoreOffsetY: vi.fn(),
+      setDataSaver: vi.fn(),
+      setDataSaverDailyMB: vi.fn(),
+    };
+    useSettingsMock.mockReturnValue(state);
+
+    const view = render(React.createElement(Settings));
+    expect(screen.getByText("toggle:data_saver:false")).toBeInTheDocument();
+    expect(screen.queryByText("slider:data_saver_daily_mb")).not.toBeInTheDocument();
+
+    useSettingsMock.mockReturnValue({ ...state, settings: { ...state.settings, dataSaver: true } });
+    view.rerender(React.createElement(Settings));
+    expect(screen.getByText("toggle:data_saver:true")).toBeInTheDocument();
+    expect(screen.getByText("slider:data_saver_daily_mb")).toBeInTheDocument();
+  });
+
+  it("debounces the daily limit slider like the offsets", () => {
+    vi.useFakeTimers();
+    const setDataSaverDailyMB = vi.fn();
+    useSettingsMock.mockReturnValue({
+      settings: {
+        badgeType: "full",
+        badgePosition: "top-right",
+        offsetX: 20,
+        offsetY: 90,
+        showOnStore: false,
+        storeOffsetX: 0,
+        storeOffsetY: 20,
+        dataSaver: true,
+        dataSaverDailyMB: 20,
+      },
+      loading: false,
+      setBadgeType: vi.fn(),
+      setBadgePosition: vi.fn(),
+      setOffsetX: vi.fn(),
+      setOffsetY: vi.fn(),
+      setShowOnStore: vi.fn(),
+      setStoreOffsetX: vi.fn(),
+      setStoreOffsetY: vi.fn(),
+      setDataSaver: vi.fn(),
+      setDataSaverDailyMB,
+    });
+
+    render(React.createElement(Settings));
+    fireEvent.click(screen.getByText("slider:data_saver_daily_mb"));
+    fireEvent.click(screen.getByText("slider:data_saver_daily_mb"));
+    expect(setDataSaverDailyMB).not.toHaveBeenCalled();
+
+    act(() => {
+      vi.advanceTimersByTime(300);
+    });
+    expect(setDataSaverDailyMB).toHaveBeenCalledTimes(1);
+    expect(setDataSaverDailyMB).toHaveBeenCalledWith(30);
+    vi.useRealTimers();
+  });
 });
@@ -0,0 +1,122 @@
+import base64
+import hashlib
+import importlib.util
+import json
+import socket
+import struct
+import threading
+from pathlib import Path
+
+spec = importlib.util.spec_from_file_location(
+    "cef_debug", Path(__file__).resolve().parent.parent / "scripts" / "cef_debug.py"
+)
+cef_debug = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cef_debug)
+
+
+# ---- Fake CDP target ----
+class FakeCDPServer:
+    """Single-connection WebSocket server answering the Performance/Tracing calls."""
+
+    METRICS = [
+        {"ScriptDuration": 1.0, "LayoutCount": 10, "RecalcStyleCount": 4, "JSHeapUsedSize": 8 * 1024 * 1024},
+        {"ScriptDuration": 1.25, "LayoutCount": 13, "RecalcStyleCount": 6, "JSHeapUsedSize": 9 * 1024 * 1024,
+         "JSHeapTotalSize": 16 * 1024 * 1024},
+    ]
+    TRACE = [
+        {"name": "FunctionCall", "ph": "X", "dur": 1500},
+        {"name": "TimerFire", "ph": "I"},
+        {"name": "Layout", "ph": "X", "dur": 700},
+        {"name": "FunctionCall", "ph": "X", "dur": 500},
+    ]
+
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(1)
+        self.port = self.listener.getsockname()[1]
+        self.methods = []
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.listener.accept()
+        buf = b""
+        while b"\r\n\r\n" not in buf:
+            buf += conn.recv(4096)
+        head, buf = buf.split(b"\r\n\r\n", 1)
+        key = [l.split(":", 1)[1].strip() for l in head.decode().split("\r\n") if l.lower().startswith("sec-websocket-key")][0]
+        accept = base64.b64encode(hashlib.sha1((key + cef_debug.WS_GUID).encode()).digest()).decode()
+        conn.sendall(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+
+        def read(n):
+            nonlocal buf
+            while len(buf) < n:
+                buf += conn.recv(65536)
+            data, buf = buf[:n], buf[n:]
+            return data
+
+        def send(obj):
+            conn.sendall(cef_debug.encode_frame(0x1, json.dumps(obj).encode(), mask=False))
+
+        metrics_calls = 0
+        while True:
+            b1, b2 = read(2)
+            if b1 & 0x0F == 0x8:
+                break
+            length = b2 & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", read(2))[0]
+            mask = read(4)
+            payload = bytes(c ^ mask[i % 4] for i, c in enumerate(read(length)))
+            msg = json.loads(payload)
+            self.methods.append(msg["method"])
+
+            result = {}
+            if msg["method"] == "Performance.getMetrics":
+                values = self.METRICS[min(metrics_calls, 1)]
+                metrics_calls += 1
+                result = {"metrics": [{"name": k, "value": v} for k, v in values.items()]}
+            send({"id": msg["id"], "result": result})
+            if msg["method"] == "Tracing.end":
+                send({"method": "Tracing.dataCollected", "params": {"value": self.TRACE[:2]}})
+                send({"method": "Tracing.dataCollected", "params": {"value": self.TRACE[2:]}})
+                send({"method": "Tracing.tracingComplete", "params": {}})
+        conn.close()
+        self.listener.close()
+
+
+def test_profile_tab_against_fake_cdp_server(tmp_path):
+    server = FakeCDPServer()
+    tab = {
+        "title": "SharedJSContext",
+        "webSocketDebuggerUrl": f"ws://localhost:{server.port}/devtools/page/ABC",
+    }
+
+    summary = cef_debug.profile_tab(tab, "127.0.0.1", seconds=0, out_dir=str(tmp_path))
+    server.thread.join(timeout=5)
+
+    assert server.methods == [
+        "Performance.enable",
+        "Performance.getMetrics",
+        "Tracing.start",
+        "Performance.getMetrics",
+        "Tracing.end",
+        "Performance.disable",
+    ]
+    assert summary["script_time_ms"] == 250.0
+    assert summary["layout_count"] == 3
+    assert summary["recalc_style_count"] == 2
+    assert summary["js_heap_used_mb"] == 9.0
+    assert summary["js_heap_growth_mb"] == 1.0
+    assert summary["trace_events"] == 4
+    assert summary["trace_script_ms"] == 2.0
+    assert summary["timer_fires"] == 1
+    assert summary["top_events"][0] == {"name": "FunctionCall", "total_ms": 2.0, "count": 2}
+
+    trace = json.loads(Path(summary["trace_path"]).read_text(encoding="utf-8"))
+    assert len(trace["traceEvents"]) == 4
+    assert json.loads(Path(summary["summary_path"]).read_text(encoding="utf-8"))["layout_count"] == 3
@@ -1,3 +1,6 @@
+import asyncio
+import gc
+import hashlib
 import io
 import json
 import os
@@ -147,6 +150,13 @@ async def test_update_plugin_already_current(monkeypatch):
     assert result.get("already_current") is True
 
 
+def _fake_download(data):
+    async def fake_download(url, path, headers=None, throttle=None):
+        Path(path).write_bytes(data)
+        return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "url": url}
+    return fake_download
+
+
 def _make_release_zip(with_root=True):
     bio = io.BytesIO()
     with zipfile.ZipFile(bio, "w", zipfile.ZIP_DEFLATED) as z:
@@ -169,11 +179,9 @@ async def test_update_plugin_extracts_release_zip(tmp_path, monkeypatch, with_ro
     async def fake_latest():
         return {"update_available": True, "current": "1.0.0", "latest": "9.9.9"}
 
-    async def fake_binary(url, headers=None):
-        return _make_release_zip(with_root=with_root)
-
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path / "settings"))
     monkeypatch.setattr(plugin, "get_latest_version", fake_latest)
-    monkeypatch.setattr(main, "http_get_binary", fake_binary)
+    monkeypatch.setattr(main, "http_download", _fake_download(_make_release_zip(with_root=with_root)))
     monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
 
     # seed existing files to ensure overwrite
@@ -199,11 +207,9 @@ async def test_update_plugin_invalid_zip(tmp_path, monkeypatch):
     async def fake_latest():
         return {"update_available": True, "current": "1.0.0", "latest": "9.9.9"}
 
-    async def fake_binary(url, headers=None):
-        return b"not-a-valid-zip"
-
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path / "settings"))
     monkeypatch.setattr(plugin, "get_latest_version", fake_latest)
-    monkeypatch.setattr(main, "http_get_binary", fake_binary)
+    monkeypatch.setattr(main, "http_download", _fake_download(b"not-a-valid-zip"))
     monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
 
     result = await plugin.update_plugin()
@@ -233,3 +239,1399 @@ def test_settings_load_save_merge_defaults(tmp_path, monkeypatch):
 
     reloaded = json.loads(Path(plugin.settings_file).read_text(encoding="utf-8"))
     assert reloaded["offsetY"] == 123
+
+
+@pytest.mark.asyncio
+async def test_profiling_cprofile_writes_stats_and_summary(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_LOG_DIR", str(tmp_path), raising=False)
+    plugin = main.Plugin()
+    plugin.settings_file = str(tmp_path / "settings.json")
+
+    started = await plugin.start_profiling("cprofile", duration=30)
+    assert started["success"] is True
+    assert (await plugin.start_profiling("cprofile"))["success"] is False
+
+    plugin._save_settings()
+    await main.to_thread(plugin._load_settings)
+
+    result = await plugin.stop_profiling(top_n=5)
+    assert result["success"] is True
+    assert result["path"].endswith(".pstats")
+    assert os.path.exists(result["path"])
+    assert 0 < len(result["top"]) <= 5
+    # work offloaded to the thread pool is merged into the same stats
+    dumped = main.pstats.Stats(result["path"])
+    assert any(func == "_load_settings" for (_, _, func) in dumped.stats)
+    assert main._thread_profilers is None
+
+    # A second session in the same second gets its own file
+    assert (await plugin.start_profiling("cprofile"))["success"] is True
+    again = await plugin.stop_profiling()
+    assert again["path"] != result["path"] and os.path.exists(result["path"])
+    assert (await plugin.stop_profiling())["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_profiling_leaves_worker_threads_alone_where_cprofile_is_exclusive(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_LOG_DIR", str(tmp_path), raising=False)
+    monkeypatch.setattr(main, "PROFILE_THREADS", False)
+    plugin = main.Plugin()
+    assert (await plugin.start_profiling("cprofile"))["success"] is True
+    assert main._thread_profilers is None
+    assert await main.to_thread(sum, [1, 2]) == 3
+    assert (await plugin.stop_profiling())["success"] is True
+
+
+@pytest.mark.asyncio
+async def test_profiling_tracemalloc_auto_stops(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_LOG_DIR", str(tmp_path), raising=False)
+    plugin = main.Plugin()
+
+    assert (await plugin.start_profiling("bogus"))["success"] is False
+    started = await plugin.start_profiling("tracemalloc", duration=1)
+    assert started["success"] is True
+
+    blob = [bytes(1024) for _ in range(64)]
+    await plugin._profile["timer"]
+    del blob
+
+    result = await plugin.stop_profiling()
+    assert result["success"] is True
+    assert result["mode"] == "tracemalloc"
+    assert result["path"].endswith(".tracemalloc")
+    assert result["peak_kb"] > 0
+    assert not main.tracemalloc.is_tracing()
+    # The elapsed session's summary is handed out once
+    assert (await plugin.stop_profiling())["success"] is False
+
+
+def _load_seed_builder():
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(
+        "build_seed_index", Path(__file__).resolve().parent.parent / "scripts" / "build_seed_index.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.asyncio
+async def test_get_seed_status_reads_bundled_index(tmp_path, monkeypatch):
+    builder = _load_seed_builder()
+    records = builder.read_records([
+        "# comment",
+        json.dumps({"appid": 1643320, "status": "OFFICIAL", "slug": "stalker-2"}),
+        json.dumps({"appid": 70, "status": "COMMUNITY", "url": "https://kuli.com.ua/half-life"}),
+        json.dumps({"appid": 220, "status": None}),
+        json.dumps({"appid": 400, "status": None, "note": "no search results"}),
+        json.dumps({"appid": 500, "status": None, "note": "exception: timed out"}),
+        json.dumps({"appid": 550, "status": None, "note": "search HTTP 503"}),
+    ])
+    assert builder.SEED_RECORD is main.SEED_RECORD
+    (tmp_path / main.SEED_INDEX_FILE).write_bytes(builder.build_index(records))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+
+    plugin = main.Plugin()
+    assert await plugin.get_seed_status("1643320") == {
+        "status": "OFFICIAL", "slug": "stalker-2", "url": "https://kuli.com.ua/stalker-2",
+    }
+    assert (await plugin.get_seed_status("70"))["slug"] == "half-life"
+    assert await plugin.get_seed_status("220") == {"status": "NONE", "slug": "", "url": None}
+    assert await plugin.get_seed_status("71") is None
+    assert (await plugin.get_seed_status("400"))["status"] == "NONE"
+    assert await plugin.get_seed_status("500") is None and await plugin.get_seed_status("550") is None
+    assert await plugin.get_seed_status("not-a-number") is None
+    plugin._seed.close()
+
+
+@pytest.mark.asyncio
+async def test_update_refreshes_seed_index(tmp_path, monkeypatch):
+    builder = _load_seed_builder()
+    old_index = builder.build_index({10: ("NONE", "")})
+    new_index = builder.build_index({10: ("COMMUNITY", "game-ten")})
+    (tmp_path / main.SEED_INDEX_FILE).write_bytes(old_index)
+
+    bio = io.BytesIO()
+    with zipfile.ZipFile(bio, "w") as z:
+        z.writestr(f"decky-ukr-badge/{main.SEED_INDEX_FILE}", new_index)
+        z.writestr("decky-ukr-badge/plugin.json", json.dumps({"version": "9.9.9"}))
+
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path / "settings"))
+    monkeypatch.setattr(main, "http_download", _fake_download(bio.getvalue()))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+
+    plugin = main.Plugin()
+    assert (await plugin.get_seed_status("10"))["status"] == "NONE"
+    assert (await plugin.force_update_plugin())["success"] is True
+    assert (await plugin.get_seed_status("10"))["status"] == "COMMUNITY"
+    plugin._seed.close()
+
+
+@pytest.mark.asyncio
+async def test_release_cache_reuses_artifacts_and_rolls_back(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "plugin"
+    plugin_dir.mkdir()
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path / "settings"))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(plugin_dir / "main.py"))
+
+    downloads = []
+    v1 = _make_release_zip()
+
+    async def fake_download(url, path, headers=None, throttle=None):
+        downloads.append(url)
+        Path(path).write_bytes(v1)
+        return {
+            "sha256": hashlib.sha256(v1).hexdigest(),
+            "size": len(v1),
+            "url": "https://github.com/yataktyni/decky-ukr-badge/releases/download/v9.9.9/release.zip",
+        }
+
+    monkeypatch.setattr(main, "http_download", fake_download)
+
+    plugin = main.Plugin()
+    first = await plugin.force_update_plugin()
+    second = await plugin.force_update_plugin()
+    assert first["success"] is True and first["tag"] == "v9.9.9"
+    assert second["success"] is True
+    assert len(downloads) == 1
+
+    cached = await plugin.get_cached_releases()
+    assert [c["tag"] for c in cached] == ["v9.9.9"]
+    assert cached[0]["sha256"] == hashlib.sha256(v1).hexdigest()
+
+    (plugin_dir / "main.py").write_text("# something else\n", encoding="utf-8")
+    cache = plugin._get_release_cache()
+    verified = []
+    original_get = cache.get
+    monkeypatch.setattr(cache, "get", lambda tag: verified.append(tag) or original_get(tag))
+    rolled = await plugin.rollback_plugin("v9.9.9")
+    assert rolled["success"] is True
+    assert (plugin_dir / "main.py").read_text(encoding="utf-8") == "# updated backend\n"
+    assert len(downloads) == 1
+    assert verified == ["v9.9.9"]  # hashed once, then installed from that path
+
+    missing = await plugin.rollback_plugin("v0.0.1")
+    assert missing["success"] is False
+
+
+def test_release_cache_evicts_lru_and_drops_corrupt(tmp_path):
+    cache = main.ReleaseCache(str(tmp_path), max_bytes=250)
+    for i, tag in enumerate(["v1.0.0", "v1.1.0", "v1.2.0"]):
+        staged = cache.staging_path()
+        data = bytes([i]) * 100
+        Path(staged).write_bytes(data)
+        cache.put(staged, tag, hashlib.sha256(data).hexdigest(), len(data))
+        if tag == "v1.0.0":
+            assert cache.get("v1.0.0")
+
+    assert cache.get("v1.0.0") is None
+    assert cache.get("v1.2.0") is not None
+
+    Path(cache.get("v1.1.0")).write_bytes(b"tampered")
+    assert cache.get("v1.1.0") is None
+    assert [r["tag"] for r in cache.releases()] == ["v1.2.0"]
+
+
+@pytest.mark.asyncio
+async def test_version_check_prefetches_update_for_offline_apply(tmp_path, monkeypatch):
+    plugin_dir = tmp_path / "plugin"
+    plugin_dir.mkdir()
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path / "settings"))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(plugin_dir / "main.py"))
+    monkeypatch.setattr(main, "PREFETCH_START_DELAY", 0)
+    monkeypatch.setattr(main, "_http_cache", None)
+
+    async def fake_current():
+        return "1.0.0"
+
+    async def fake_http_get(url, headers=None):
+        return json.dumps([{"tag_name": "v9.9.9", "draft": False, "prerelease": False}])
+
+    zip_data = _make_release_zip()
+    throttles = []
+
+    async def fake_download(url, path, headers=None, throttle=None):
+        throttles.append(throttle)
+        Path(path).write_bytes(zip_data)
+        return {"sha256": hashlib.sha256(zip_data).hexdigest(), "size": len(zip_data), "url": url}
+
+    plugin = main.Plugin()
+    monkeypatch.setattr(plugin, "get_current_version", fake_current)
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    monkeypatch.setattr(main, "http_download", fake_download)
+    await plugin._main()
+
+    info = await plugin.get_latest_version()
+    assert info["update_available"] is True
+    assert info["update_staged"] is False
+    await plugin._prefetch["task"]
+
+    assert len(throttles) == 1
+    assert throttles[0].rate_limit == main.PREFETCH_RATE_LIMIT
+    assert (await plugin.get_latest_version())["update_staged"] is True
+
+    async def no_network(*args, **kwargs):
+        raise AssertionError("update should apply from the staged artifact")
+
+    monkeypatch.setattr(main, "http_download", no_network)
+    result = await plugin.update_plugin()
+    assert result["success"] is True
+    assert result["tag"] == "v9.9.9"
+    await plugin._unload()
+
+
+@pytest.mark.asyncio
+async def test_http_get_uses_disk_cache_per_host_rules(tmp_path, monkeypatch):
+    cache = main.HttpCache(str(tmp_path / "http"), ttl={"kuli.com.ua": 60})
+    monkeypatch.setattr(main, "_http_cache", cache)
+
+    fetched = []
+
+    def fake_sync_get(url, headers=None, timeout=None):
+        fetched.append(url)
+        return f"<html>{url}</html>"
+
+    monkeypatch.setattr(main, "_sync_http_get", fake_sync_get)
+
+    kuli = "https://kuli.com.ua/hades"
+    steam = "https://store.steampowered.com/api/appdetails?appids=1"
+    assert await main.http_get(kuli) == f"<html>{kuli}</html>"
+    assert await main.http_get(kuli) == f"<html>{kuli}</html>"
+    assert await main.http_get(steam) is not None
+    assert await main.http_get(steam) is not None
+    assert await main.http_get(kuli, use_cache=False) is not None
+    assert fetched == [kuli, steam, steam, kuli]
+
+    cache.entries[kuli].fetched_at -= 120
+    assert cache.get(kuli) is None
+    assert cache.get(kuli, allow_stale=True) == f"<html>{kuli}</html>".encode()
+
+
+def test_http_cache_dedups_bodies_and_evicts_lru(tmp_path):
+    ttl = {"kuli.com.ua": 3600}
+    cache = main.HttpCache(str(tmp_path), max_bytes=2500, ttl=ttl)
+    blob_a = main.os.urandom(1000)
+    blob_b = main.os.urandom(1000)
+
+    cache.put("https://kuli.com.ua/a", blob_a)
+    cache.put("https://kuli.com.ua/a-alias", blob_a)
+    assert cache.stats()["objects"] == 1
+    assert not os.path.exists(cache.index_path)  # index writes are batched
+
+    cache.put("https://kuli.com.ua/b", blob_b)
+    assert cache.get("https://kuli.com.ua/a") == blob_a
+    cache.put("https://kuli.com.ua/c", main.os.urandom(1000))
+
+    # a-alias goes first but frees nothing (a still references the body), then b
+    assert cache.get("https://kuli.com.ua/a-alias") is None
+    assert cache.get("https://kuli.com.ua/b") is None
+    assert cache.get("https://kuli.com.ua/a") == blob_a
+    assert cache.stats()["bytes"] <= 2500
+
+    reopened = main.HttpCache(str(tmp_path), ttl=ttl)
+    assert reopened.get("https://kuli.com.ua/a") == blob_a
+
+    # Trimming only forgets the in-memory index; bodies and index.json stay
+    cache.flush()
+    assert cache.trim(1.0) == 2 and not cache.entries
+    cache.put("https://kuli.com.ua/d", b"d")
+    cache.flush()
+    read_index = cache._read_index
+    reads = []
+    cache._read_index = lambda: reads.append(1) or read_index()
+    assert cache.get("https://kuli.com.ua/never-cached") is None and reads == []
+    assert cache.get("https://kuli.com.ua/a") == blob_a and len(reads) == 1
+    del cache._read_index
+    assert main.HttpCache(str(tmp_path), ttl=ttl).stats()["entries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_http_get_survives_a_failing_cache_write(tmp_path, monkeypatch):
+    cache = main.HttpCache(str(tmp_path), ttl={"kuli.com.ua": 3600})
+    monkeypatch.setattr(main, "_http_cache", cache)
+    monkeypatch.setattr(main, "_host_health", main.HostHealth())
+    monkeypatch.setattr(main, "_sync_http_get", lambda url, headers=None, timeout=None: "<html>hades</html>")
+
+    def disk_full(url, body):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(cache, "put", disk_full)
+    assert await main.http_get("https://kuli.com.ua/hades") == "<html>hades</html>"
+
+
+def _fake_status_upstream(languages, kuli_pages):
+    requested = []
+
+    async def fake_http_get(url, headers=None):
+        requested.append(url)
+        if url.startswith("https://store.steampowered.com/api/appdetails"):
+            return json.dumps({"620": {"success": True, "data": {"name": "Portal 2", "supported_languages": languages}}})
+        # kuli always answers a search, with no results unless the test says otherwise
+        return kuli_pages.get(url, "" if "games?query=" in url else None)
+
+    return fake_http_get, requested
+
+
+@pytest.mark.asyncio
+async def test_kuli_outage_leaves_the_status_incomplete(monkeypatch):
+    fake_http_get, _ = _fake_status_upstream("English", {})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    result = await main.resolve_badge_status("620", "Portal 2")
+    assert result["status"] == "NONE" and result["complete"] is True
+
+    async def kuli_down(url, headers=None):
+        return None if "kuli.com.ua" in url else await fake_http_get(url, headers)
+
+    monkeypatch.setattr(main, "http_get", kuli_down)
+    result = await main.resolve_badge_status("620", "Portal 2")
+    assert result["status"] == "NONE" and result["complete"] is False
+    assert (await main.resolve_badge_status("Portal 2 (Shortcut)", "Portal 2 (Shortcut)"))["complete"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_badge_status_resolves_in_background_and_emits(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    events = []
+
+    async def fake_emit(event, *args):
+        events.append((event, *args))
+
+    monkeypatch.setattr(decky_stub, "emit", fake_emit, raising=False)
+    community = '<div class="product-details-page"><div class="item__instruction-main"></div></div>'
+    fake_http_get, requested = _fake_status_upstream("English, French", {"https://kuli.com.ua/portal-2": community})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+
+    plugin = main.Plugin()
+    first = await plugin.get_badge_status("620", "Portal 2")
+    second = await plugin.get_badge_status("620", "Portal 2")
+    assert first["pending"] is True and first["status"] is None
+    assert len(plugin._status_tasks) == 1
+    await next(iter(plugin._status_tasks.values()))
+
+    assert events == [("badge_status", {"app_id": "620", "status": "COMMUNITY", "url": "https://kuli.com.ua/portal-2"})]
+    assert second["pending"] is True
+    assert len(requested) == 2
+
+    cached = await main.Plugin().get_badge_status("620", "Portal 2")
+    assert cached == {
+        "app_id": "620", "status": "COMMUNITY", "url": "https://kuli.com.ua/portal-2", "pending": False, "stale": False,
+    }
+    assert len(requested) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_badge_status_revalidates_and_only_emits_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    events = []
+
+    async def fake_emit(event, *args):
+        events.append((event, *args))
+
+    monkeypatch.setattr(decky_stub, "emit", fake_emit, raising=False)
+    plugin = main.Plugin()
+    cache = plugin._get_status_cache()
+    cache.put("620", "NONE", None, "network")
+    cache.entries["620"].resolved_at -= main.STATUS_FRESH_SECONDS + 1
+
+    fake_http_get, _ = _fake_status_upstream("English", {})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    result = await plugin.get_badge_status("620", "Portal 2")
+    assert result["status"] == "NONE" and result["stale"] is True
+    await next(iter(plugin._status_tasks.values()))
+    assert events == []
+    assert cache.is_fresh(cache.get("620"))
+
+    cache.entries["620"].resolved_at -= main.STATUS_FRESH_SECONDS + 1
+    fake_http_get, _ = _fake_status_upstream("English, Ukrainian", {})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    await plugin.get_badge_status("620", "Portal 2")
+    await next(iter(plugin._status_tasks.values()))
+    assert events == [("badge_status", {"app_id": "620", "status": "OFFICIAL", "url": None})]
+
+
+@pytest.mark.asyncio
+async def test_cancel_aborts_lookups_nobody_waits_on(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    monkeypatch.setattr(main, "STATUS_RESOLVE_CONCURRENCY", 1)
+    events = []
+
+    async def fake_emit(event, *args):
+        events.append((event, *args))
+
+    monkeypatch.setattr(decky_stub, "emit", fake_emit, raising=False)
+    release = asyncio.Event()
+    requested = []
+
+    async def fake_http_get(url, headers=None):
+        requested.append(url)
+        await release.wait()
+        return None
+
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    plugin = main.Plugin()
+
+    # Two pages share the in-flight lookup; a third app queues behind it
+    await plugin.get_badge_status("620", "Portal 2", "page-1")
+    await plugin.get_badge_status("620", "Portal 2", "page-2")
+    await plugin.get_badge_status("400", "Portal", "page-3")
+    await asyncio.sleep(0)
+    shared, queued = plugin._status_tasks["620"], plugin._status_tasks["400"]
+    assert len(requested) == 1
+
+    assert await plugin.cancel("page-1") is False
+    assert not shared.cancelled()
+    assert await plugin.cancel("page-3") is True
+    assert await plugin.cancel("page-2") is True
+    await asyncio.gather(shared, queued, return_exceptions=True)
+    assert shared.cancelled() and queued.cancelled()
+    assert len(requested) == 1
+    assert plugin._status_tasks == {} and plugin._status_requests == {}
+    assert await plugin.cancel("page-2") is False
+
+    # Callers without a request id keep the lookup alive
+    await plugin.get_badge_status("620", "Portal 2")
+    await plugin.get_badge_status("620", "Portal 2", "page-4")
+    assert await plugin.cancel("page-4") is False
+    release.set()
+    await plugin._status_tasks["620"]
+    assert events == [("badge_status", {"app_id": "620", "status": "NONE", "url": None})]
+
+
+@pytest.mark.asyncio
+async def test_only_foreground_requests_hold_back_background_downloads(monkeypatch):
+    monkeypatch.setattr(main, "_host_health", main.HostHealth())
+    monkeypatch.setattr(main, "_http_cache", None)
+    release = main.threading.Event()
+    started = []
+
+    def slow_sync_get(url, headers=None, timeout=None):
+        started.append(url)
+        release.wait(5)
+        return "ok"
+
+    monkeypatch.setattr(main, "_sync_http_get", slow_sync_get)
+    throttle = main.DownloadThrottle(yield_to_foreground=True)
+
+    async def revalidate():
+        main.mark_background()
+        return await main.http_get("https://kuli.com.ua/a", hedge=False)
+
+    background = asyncio.create_task(revalidate())
+    while not started:
+        await asyncio.sleep(0.01)
+    assert main._foreground_requests == 0
+    waited = main.time.monotonic()
+    await main.to_thread(throttle.wait, 0, main.time.monotonic())
+    assert main.time.monotonic() - waited < 0.1
+
+    foreground = asyncio.create_task(main.http_get("https://kuli.com.ua/b", hedge=False))
+    while len(started) < 2:
+        await asyncio.sleep(0.01)
+    assert main._foreground_requests == 1
+    release.set()
+    assert await asyncio.gather(background, foreground) == ["ok", "ok"]
+    assert main._foreground_requests == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_lookup_settles_its_half_open_trial(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    health = main.HostHealth(failure_threshold=1, cooldown=60)
+    latency = main.HostLatency(min_samples=1)
+    monkeypatch.setattr(main, "_host_health", health)
+    monkeypatch.setattr(main, "_host_latency", latency)
+    monkeypatch.setattr(main, "_http_cache", None)
+    monkeypatch.setattr(main, "HEDGE_MIN_DELAY", 0.01)
+    steam = "https://store.steampowered.com/api/appdetails?appids=999999991&l=english"
+    latency.record(steam, 0.01)
+    health.record_error(steam, TimeoutError("timed out"))
+    health.mark_reachable("store.steampowered.com")
+
+    release = main.threading.Event()
+    calls = []
+
+    def stuck_sync_get(url, headers=None, timeout=None):
+        calls.append(url)
+        release.wait(5)
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(main, "_sync_http_get", stuck_sync_get)
+    unretrieved = []
+    asyncio.get_running_loop().set_exception_handler(lambda _loop, context: unretrieved.append(context))
+    plugin = main.Plugin()
+
+    await plugin.get_badge_status("999999991", "", "page-1")
+    task = plugin._status_tasks["999999991"]
+    while len(calls) < 2:  # the trial and its hedge are both in flight
+        await asyncio.sleep(0.01)
+    assert not health.allow(steam)
+    assert await plugin.cancel("page-1") is True
+    await asyncio.gather(task, return_exceptions=True)
+    assert task.cancelled()
+
+    assert health.allow(steam)
+    assert main._foreground_requests == 0
+    release.set()
+    await asyncio.sleep(0.05)
+    del task
+    gc.collect()
+    assert unretrieved == []
+
+
+def test_kuli_search_scoring_matches_frontend():
+    html = (
+        '<a href="/portal-2-complete"><h2 class="product-title">Portal 2 Complete Pack</h2></a>'
+        '<a href="/portal-2"><h2 class="product-title">Portal 2</h2></a>'
+        '<a href="/games"><h2 class="product-title">Games</h2></a>'
+    )
+    assert main._best_kuli_match(html, "Portal 2")["slug"] == "portal-2"
+    assert main._best_kuli_match(html, "Stardew Valley Expanded Edition Plus Mods") is None
+    assert main.urlify_game_name("Baldur's Gate 3 (Shortcut)") == "baldurs-gate-3"
+    assert main.urlify_game_name("Tom Clancy’s Rainbow & Six v1.2") == "tom-clancys-rainbow-and-six"
+    assert main.is_steam_app_id("620") and not main.is_steam_app_id("3000000000")
+
+
+@pytest.mark.asyncio
+async def test_target_language_switch_is_answered_from_cached_masks(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    events = []
+
+    async def fake_emit(event, *args):
+        events.append((event, *args))
+
+    monkeypatch.setattr(decky_stub, "emit", fake_emit, raising=False)
+    listed, audio = main.parse_supported_languages(
+        "English<strong>*</strong>, Spanish - Spain, Polish<strong>*</strong>"
+        "<br><strong>*</strong>languages with full audio support"
+    )
+    assert main.language_codes(listed) == ["english", "spanish", "polish"]
+    assert main.language_codes(audio) == ["english", "polish"]
+
+    plugin = main.Plugin()
+    plugin.settings = main.DEFAULT_SETTINGS.copy()
+    plugin.settings_file = str(tmp_path / "settings.json")
+    plugin._get_status_cache().put("620", "COMMUNITY", "https://kuli.com.ua/portal-2", "network", (listed, audio))
+
+    async def no_network(*args, **kwargs):
+        raise AssertionError("language switch must not refetch")
+
+    monkeypatch.setattr(main, "http_get", no_network)
+    assert (await plugin.get_badge_status("620"))["status"] == "COMMUNITY"
+    assert await plugin.set_settings("targetLanguage", "polish") is True
+    assert (await plugin.get_badge_status("620"))["status"] == "OFFICIAL"
+    assert events == [("badge_status", {"app_id": "620", "status": "OFFICIAL", "url": "https://kuli.com.ua/portal-2"})]
+    assert await plugin.get_language_support("620") == {"interface": ["english", "spanish", "polish"], "full_audio": ["english", "polish"]}
+    assert await plugin.set_settings("targetLanguage", "klingon") is False
+
+
+@pytest.mark.asyncio
+async def test_other_target_languages_skip_kuli(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(decky_stub, "emit", lambda *args: asyncio.sleep(0), raising=False)
+    community = '<div class="product-details-page"><div class="item__instruction-main"></div></div>'
+    fake_http_get, requested = _fake_status_upstream("English, Polish", {"https://kuli.com.ua/portal-2": community})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+
+    plugin = main.Plugin()
+    plugin.settings = {**main.DEFAULT_SETTINGS, "targetLanguage": "polish"}
+    plugin.settings_file = str(tmp_path / "settings.json")
+    await plugin.get_badge_status("620", "Portal 2")
+    await next(iter(plugin._status_tasks.values()))
+    assert not any("kuli.com.ua" in url for url in requested)
+    assert (await plugin.get_badge_status("620"))["status"] == "OFFICIAL"
+
+    # Switching to Ukrainian asks kuli once, even though the Steam answer is fresh
+    await plugin.set_settings("targetLanguage", "ukrainian")
+    answer = await plugin.get_badge_status("620", "Portal 2")
+    assert answer["stale"] is True
+    await next(iter(plugin._status_tasks.values()))
+    assert (await plugin.get_badge_status("620"))["status"] == "COMMUNITY"
+    assert any("kuli.com.ua" in url for url in requested)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_and_serves_cached_bodies(tmp_path, monkeypatch):
+    health = main.HostHealth(failure_threshold=2, cooldown=60, offline_threshold=2)
+    cache = main.HttpCache(str(tmp_path / "http"), ttl={"kuli.com.ua": 60})
+    monkeypatch.setattr(main, "_host_health", health)
+    monkeypatch.setattr(main, "_http_cache", cache)
+
+    calls = []
+    behaviour = {"error": None}
+
+    def fake_sync_get(url, headers=None, timeout=None):
+        calls.append(url)
+        if behaviour["error"]:
+            raise behaviour["error"]
+        return "<html>hades</html>"
+
+    monkeypatch.setattr(main, "_sync_http_get", fake_sync_get)
+    kuli = "https://kuli.com.ua/hades"
+    steam = "https://store.steampowered.com/api/appdetails?appids=1"
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    cache.entries[kuli].fetched_at -= 120
+
+    # kuli times out twice: the circuit opens and the stale body is served without a request
+    behaviour["error"] = TimeoutError("timed out")
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    assert len(calls) == 3
+    assert health.snapshot()["hosts"]["kuli.com.ua"]["state"] == "open"
+    assert health.allow(steam)
+
+    # DNS failures put the whole layer offline
+    behaviour["error"] = main.urllib.error.URLError(main.socket.gaierror(-2, "Name or service not known"))
+    assert await main.http_get(steam) is None
+    assert await main.http_get(steam) is None
+    assert health.offline is True
+    assert await main.http_get(steam) is None
+    assert len(calls) == 5
+    assert set(health.hosts_to_probe()) == {"kuli.com.ua", "store.steampowered.com"}
+
+    behaviour["error"] = None
+    health.mark_reachable("kuli.com.ua")
+    assert health.offline is False
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    assert health.snapshot()["hosts"]["kuli.com.ua"]["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_half_open_trial_lets_the_next_request_through(monkeypatch):
+    health = main.HostHealth(failure_threshold=1, cooldown=60)
+    monkeypatch.setattr(main, "_host_health", health)
+    monkeypatch.setattr(main, "_http_cache", None)
+    release = main.threading.Event()
+
+    def slow_sync_get(url, headers=None, timeout=None):
+        release.wait(5)
+        return "<html>hades</html>"
+
+    monkeypatch.setattr(main, "_sync_http_get", slow_sync_get)
+    kuli = "https://kuli.com.ua/hades"
+    health.record_error(kuli, TimeoutError("timed out"))
+    health.mark_reachable("kuli.com.ua")
+
+    trial = asyncio.create_task(main.http_get(kuli))
+    await asyncio.sleep(0.01)
+    assert not health.allow(kuli)
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    release.set()
+
+    assert await main.http_get(kuli) == "<html>hades</html>"
+    assert health.snapshot()["hosts"]["kuli.com.ua"]["state"] == "closed"
+
+    # A probe hands out a fresh trial even if one was still marked as running
+    health.record_error(kuli, TimeoutError("timed out"))
+    health.mark_reachable("kuli.com.ua")
+    assert health.allow(kuli)
+    health.mark_reachable("kuli.com.ua")
+    assert health.allow(kuli)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeouts_and_hedged_get(monkeypatch):
+    latency = main.HostLatency(min_samples=4)
+    monkeypatch.setattr(main, "_host_latency", latency)
+    monkeypatch.setattr(main, "_host_health", main.HostHealth())
+    monkeypatch.setattr(main, "_http_cache", None)
+
+    url = "https://kuli.com.ua/hades"
+    assert latency.timeout_for(url, main.HTTP_TIMEOUT) == main.HTTP_TIMEOUT
+    for seconds in (0.05, 0.05, 0.06, 0.9):
+        latency.record(url, seconds)
+    assert latency.timeout_for(url, main.HTTP_TIMEOUT) == pytest.approx(3.6)
+    latency.samples["kuli.com.ua"].clear()
+    for _ in range(4):
+        latency.record(url, 0.01)
+    assert latency.timeout_for(url, main.HTTP_TIMEOUT) == main.HTTP_MIN_TIMEOUT
+
+    calls = []
+
+    def fake_sync_get(url, headers=None, timeout=None):
+        calls.append(timeout)
+        if len(calls) == 1:
+            main.time.sleep(1.0)
+            return "slow"
+        return "fast"
+
+    monkeypatch.setattr(main, "_sync_http_get", fake_sync_get)
+    started = main.time.monotonic()
+    assert await main.http_get(url) == "fast"
+    assert main.time.monotonic() - started < 0.9
+    assert calls == [main.HTTP_MIN_TIMEOUT, main.HTTP_MIN_TIMEOUT]
+
+    calls.clear()
+    assert await main.http_get(url, hedge=False) == "slow"
+    assert len(calls) == 1
+
+
+def test_plugin_log_is_lazy_rate_limited_and_sampled(monkeypatch):
+    lines = []
+    logger = types.SimpleNamespace(
+        info=lines.append,
+        error=lines.append,
+        isEnabledFor=lambda level: level >= 20,
+    )
+    monkeypatch.setattr(decky_stub, "logger", logger)
+    log = main.PluginLog(window=60, burst=2)
+
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return "payload"
+
+    log.debug("dump %s", Expensive())
+    assert lines == [] and Expensive.formatted == 0
+
+    for i in range(5):
+        log.error("HTTP error for %s: %s", f"https://kuli.com.ua/{i}", "timed out")
+    assert lines == ["HTTP error for https://kuli.com.ua/0: timed out", "HTTP error for https://kuli.com.ua/1: timed out"]
+
+    log._windows["HTTP error for %s: %s"].start -= 61
+    log.error("HTTP error for %s: %s", "https://kuli.com.ua/5", "timed out")
+    assert lines[-1] == "HTTP error for https://kuli.com.ua/5: timed out (+3 similar suppressed)"
+
+    lines.clear()
+    for _ in range(6):
+        log.info("[HEALTH] Serving cached %s", "u", every=3)
+    assert lines == ["[HEALTH] Serving cached u (sampled 1/3)"] * 2
+    log.info("Version check", current="1.0.0", update=False)
+    assert lines[-1] == "Version check current=1.0.0 update=False"
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_returns_cached_state_in_one_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    (tmp_path / "plugin.json").write_text(json.dumps({"version": "1.6.5"}), encoding="utf-8")
+    (tmp_path / "settings.json").write_text(json.dumps({"badgeType": "default"}), encoding="utf-8")
+
+    plugin = main.Plugin()
+    plugin.settings_file = str(tmp_path / "settings.json")
+    plugin._load_settings()
+    plugin._get_status_cache().put("620", "OFFICIAL", None, "network")
+
+    async def no_network(*args, **kwargs):
+        raise AssertionError("bootstrap must not wait on the network")
+
+    monkeypatch.setattr(main, "http_get", no_network)
+    result = await plugin.bootstrap("620", "Portal 2")
+    assert result["settings"]["badgeType"] == "default"
+    assert result["version"] == "1.6.5"
+    assert result["update"] is None
+    assert result["status"]["status"] == "OFFICIAL"
+    assert plugin._update_check_task is None
+
+    checks = []
+
+    async def fake_latest():
+        checks.append(1)
+        plugin._last_update_check = {"current": "1.6.5", "update_available": False, "checked_at": int(main.time.time())}
+        return plugin._last_update_check
+
+    plugin._background_enabled = True
+    monkeypatch.setattr(plugin, "get_latest_version", fake_latest)
+    assert (await plugin.bootstrap())["status"] is None
+    await plugin._update_check_task
+    assert (await plugin.bootstrap())["update"]["current"] == "1.6.5"
+    assert checks == [1]
+
+    # plugin.json and settings.json are read once, not per badge
+    (tmp_path / "plugin.json").write_text(json.dumps({"version": "9.9.9"}), encoding="utf-8")
+    (tmp_path / "settings.json").write_text(json.dumps({"badgeType": "full"}), encoding="utf-8")
+    result = await plugin.bootstrap()
+    assert result["version"] == "1.6.5" and result["settings"]["badgeType"] == "default"
+
+
+@pytest.mark.asyncio
+async def test_status_cache_save_snapshots_on_the_loop(tmp_path):
+    cache = main.StatusCache(str(tmp_path / "status.json"))
+    cache.put("620", "OFFICIAL", None, "network")
+    saving = asyncio.ensure_future(cache.save())
+    await asyncio.sleep(0)  # serialized; the write is in its thread now
+    cache.put("400", "NONE", None, "network")
+    await saving
+
+    assert set(json.loads((tmp_path / "status.json").read_text())) == {"620"}
+    assert cache._dirty and set(cache._unsaved) == {"400"}
+    assert cache.trim(1.0) == 1 and set(cache.entries) == {"400"}
+    await cache.save()
+    assert set(json.loads((tmp_path / "status.json").read_text())) == {"620", "400"}
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_trims_lru_tiers_and_reads_pressure(tmp_path, monkeypatch):
+    cache = main.StatusCache(str(tmp_path / "status.json"))
+    for i in range(40):
+        cache.put(str(i), "".join(["OFFI", "CIAL"]), f"https://kuli.com.ua/game-{i}", "network", (1, 0))
+    assert cache.entries["0"].status is cache.entries["39"].status
+    assert cache.trim(0.5) == 0  # nothing is dropped before it is on disk
+    cache.flush()
+    cache.get("0")
+    before = cache.footprint()
+
+    pressure = {"available_ratio": 0.5, "psi_some_avg10": 0.0, "under_pressure": False}
+    budget = main.MemoryBudget(budget_bytes=before // 2, pressure=lambda: pressure)
+    closed = []
+    budget.register("seed_index", lambda: 4096, lambda f: closed.append(f) or 1, heap=False)
+    budget.register("status", cache.footprint, cache.trim)
+
+    trimmed = budget.enforce()
+    assert trimmed["status"] >= 20 and "seed_index" not in trimmed
+    assert cache.footprint() <= before // 2
+    assert "0" in cache.entries and "1" not in cache.entries
+    assert budget.report()["heap_bytes"] == cache.footprint()
+
+    pressure["under_pressure"] = True
+    remaining = len(cache.entries)
+    trimmed = budget.enforce()
+    assert trimmed == {"seed_index": 1, "status": remaining // 2}
+    assert budget.last_trim["reason"] == "system memory pressure"
+
+    assert not cache._dirty
+    cache.put("40", "NONE", None, "network")
+    cache.flush()
+    reloaded = main.StatusCache(str(tmp_path / "status.json"))
+    assert len(reloaded.get("0").url) > 0 and reloaded.get("1").url.endswith("game-1")
+
+    # Only trimmed apps are read back, all of them in one read off the loop
+    reads = []
+    read = cache._read
+    monkeypatch.setattr(cache, "_read", lambda: reads.append(1) or read())
+    await cache.restore(["40", "999"])
+    assert cache.get("1") is None and cache.get("999") is None and reads == []
+    await cache.restore(["1", "2", "999"])
+    assert cache.get("1").url.endswith("game-1") and cache.get("2") and cache.get("40").status == "NONE"
+    assert len(reads) == 1
+    await cache.restore(["1"])
+    assert len(reads) == 1
+
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal:       16000000 kB\nMemAvailable:    1000000 kB\n", encoding="utf-8")
+    psi = tmp_path / "psi"
+    psi.write_text("some avg10=2.50 avg60=1.00 avg300=0.50 total=100\nfull avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    assert main.read_memory_pressure(str(meminfo), str(psi)) == {
+        "available_ratio": 0.062, "psi_some_avg10": 2.5, "under_pressure": True,
+    }
+    assert main.read_memory_pressure(str(tmp_path / "none"), str(tmp_path / "none"))["under_pressure"] is False
+
+
+@pytest.mark.asyncio
+async def test_version_check_prefers_latest_and_pages_lazily(monkeypatch):
+    plugin = main.Plugin()
+
+    async def fake_current():
+        return "1.0.0"
+
+    requested = []
+    latest = {"tag_name": "v1.4.0", "draft": False, "prerelease": False}
+    prereleases = [{"tag_name": f"v2.0.0-rc{i}", "draft": False, "prerelease": True} for i in range(10)]
+    pages = {
+        1: prereleases,
+        2: [{"tag_name": "v1.3.0", "draft": False, "prerelease": False}] + prereleases[:9],
+        3: [{"tag_name": "v1.2.0", "draft": False, "prerelease": False}],
+    }
+
+    async def fake_http_get(url, headers=None):
+        requested.append(url)
+        if url.endswith("/releases/latest"):
+            return json.dumps(latest) if latest else None
+        page = int(url.rsplit("page=", 1)[1])
+        return json.dumps(pages.get(page, []))
+
+    monkeypatch.setattr(plugin, "get_current_version", fake_current)
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+
+    info = await plugin.debug_version_check()
+    assert info["latest_tag"] == "v1.4.0"
+    assert info["sources"] == ["latest"]
+    assert len(requested) == 1
+
+    latest = None
+    requested.clear()
+    info = await plugin.debug_version_check()
+    assert info["latest_tag"] == "v1.3.0"
+    assert info["sources"] == ["page1", "page2"]
+    assert requested[-1].endswith("?per_page=10&page=2")
+
+
+@pytest.mark.asyncio
+async def test_find_steam_app_uses_local_app_list_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    app_list = {"applist": {"apps": [
+        {"appid": 620, "name": "Portal 2"},
+        {"appid": 400, "name": "Portal"},
+        {"appid": 323180, "name": "Portal 2 - The Final Hours"},
+        {"appid": 489830, "name": "The Elder Scrolls V: Skyrim Special Edition"},
+        {"appid": 72850, "name": "The Elder Scrolls V: Skyrim"},
+        {"appid": 1091500, "name": "Cyberpunk 2077™"},
+        {"appid": 0, "name": "broken"},
+        {"appid": 5, "name": ""},
+    ]}}
+    downloads = []
+    fake_download = _fake_download(json.dumps(app_list).encode("utf-8"))
+
+    async def counting_download(url, path, headers=None, throttle=None):
+        downloads.append(url)
+        return await fake_download(url, path, headers, throttle)
+
+    monkeypatch.setattr(main, "http_download", counting_download)
+    plugin = main.Plugin()
+
+    # The first lookup only starts the build
+    assert await plugin.find_steam_app("Cyberpunk 2077") == {
+        "success": False, "error": "Steam app list unavailable", "pending": True,
+    }
+    assert await plugin._app_index_task is True
+    found = await plugin.find_steam_app("Cyberpunk 2077 (Shortcut)")
+    assert found == {
+        "success": True, "match": "exact", "results": [{"appid": "1091500", "name": "Cyberpunk 2077™"}], "apps": 6,
+    }
+    skyrim = await plugin.find_steam_app("The Elder Scrolls V Skyrim")
+    assert [r["appid"] for r in skyrim["results"]] == ["72850", "489830"]
+
+    prefix = await plugin.find_steam_app("portal 2")
+    assert prefix["match"] == "exact" and prefix["results"][0]["appid"] == "620"
+    prefix = await plugin.find_steam_app("Portal 2 - The Fin")
+    assert prefix["match"] == "prefix" and prefix["results"][0]["appid"] == "323180"
+    fuzzy = await plugin.find_steam_app("Cyberpunk 2070")
+    assert fuzzy["match"] == "fuzzy" and fuzzy["results"][0]["appid"] == "1091500"
+    assert (await plugin.find_steam_app("Half-Life 3"))["match"] is None
+    assert len(downloads) == 1
+
+    # Reopened from disk by a fresh plugin; an old index refreshes in the background
+    index = main.AppListIndex(str(tmp_path / main.APP_INDEX_FILE))
+    assert index.open() and len(index) == 6
+    other = main.Plugin()
+    assert (await other.find_steam_app("Portal"))["results"][0]["appid"] == "400"
+    assert len(downloads) == 1
+    monkeypatch.setattr(other._app_index, "built_at", 0.0)
+    await other.find_steam_app("Portal")
+    await other._app_index_task
+    assert len(downloads) == 2
+    assert other._app_index.built_at > 0
+
+
+def test_app_index_is_built_by_streaming_and_merging_runs(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "APP_LIST_READ_CHUNK", 7)
+    monkeypatch.setattr(main, "APP_INDEX_SORT_RUN", 3)
+    apps = [{"appid": 1000 + i, "name": f"Game {i:03d}"} for i in range(20, 0, -1)]
+    apps += [{"appid": 1005, "name": "Game 005"}, {"appid": "x", "name": "bad"}, {"appid": 7, "name": "  "}]
+    listing = tmp_path / "apps.json"
+    listing.write_text(json.dumps({"applist": {"apps": apps}}, indent=1), encoding="utf-8")
+
+    streamed = list(main.iter_app_list(str(listing)))
+    assert len(streamed) == 21 and streamed[0] == (1020, "Game 020")
+    path = str(tmp_path / main.APP_INDEX_FILE)
+    assert main.write_app_index(iter(streamed), path, 123.0) == 20
+    index = main.AppListIndex(path)
+    assert index.open() and index.built_at == 123.0
+    assert [index.key_at(i) for i in range(len(index))] == [f"game {i:03d}" for i in range(1, 21)]
+    assert index.exact("Game 005") == [{"appid": "1005", "name": "Game 005"}]
+    assert not [p for p in os.listdir(tmp_path) if p.startswith("apps-")]
+
+    listing.write_text('{"applist": {"apps": [{"appid": 1, "name": "A"}, {"appid": 2', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(main.iter_app_list(str(listing)))
+
+
+@pytest.mark.asyncio
+async def test_failed_app_list_builds_back_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    downloads = []
+
+    async def failing_download(url, path, headers=None, throttle=None):
+        downloads.append(url)
+        return None
+
+    monkeypatch.setattr(main, "http_download", failing_download)
+    plugin = main.Plugin()
+    assert (await plugin.find_steam_app("Portal"))["pending"] is True
+    assert await plugin._app_index_task is False
+    assert await plugin.find_steam_app("Portal") == {
+        "success": False, "error": "Steam app list unavailable", "pending": False,
+    }
+    assert len(downloads) == 1 and plugin._app_index_task is None
+    first_retry = plugin._app_index_retry_at - main.time.time()
+    assert main.APP_INDEX_RETRY_SECONDS - 5 < first_retry <= main.APP_INDEX_RETRY_SECONDS
+
+    plugin._app_index_retry_at = 0.0
+    await plugin.find_steam_app("Portal")
+    assert await plugin._app_index_task is False
+    assert len(downloads) == 2
+    assert plugin._app_index_retry_at - main.time.time() > first_retry * 1.5
+
+
+def _shortcuts_vdf(shortcuts):
+    def string(key, value):
+        return b"\x01" + key.encode() + b"\0" + value.encode() + b"\0"
+
+    body = b""
+    for i, (appid, name) in enumerate(shortcuts):
+        body += b"\x00" + str(i).encode() + b"\0"
+        body += b"\x02appid\0" + appid.to_bytes(4, "little", signed=True)
+        body += string("AppName", name) + string("Exe", f'"/games/{i}"')
+        body += b"\x00tags\0\x08\x08"
+    return b"\x00shortcuts\0" + body + b"\x08\x08"
+
+
+def _write_manifest(steamapps, appid, name):
+    (steamapps / f"appmanifest_{appid}.acf").write_text(
+        f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"{name}"\n}}\n', encoding="utf-8"
+    )
+
+
+def test_library_watcher_reports_only_new_and_changed_games(tmp_path):
+    root = tmp_path / ".steam" / "steam"
+    steamapps = root / "steamapps"
+    config = root / "userdata" / "1234" / "config"
+    sdcard = tmp_path / "sdcard"
+    steamapps.mkdir(parents=True)
+    config.mkdir(parents=True)
+    (sdcard / "steamapps").mkdir(parents=True)
+    (steamapps / "libraryfolders.vdf").write_text(
+        f'"libraryfolders"\n{{\n\t"0"\n\t{{\n\t\t"path"\t\t"{root}"\n\t}}\n'
+        f'\t"1"\n\t{{\n\t\t"path"\t\t"{sdcard}"\n\t}}\n}}\n', encoding="utf-8"
+    )
+    _write_manifest(steamapps, 620, "Portal 2")
+    (config / "shortcuts.vdf").write_bytes(_shortcuts_vdf([(-1234567890, "Heroes of Might and Magic III")]))
+
+    assert main.find_steam_root(str(tmp_path)) == str(root.resolve())
+    watcher = main.LibraryWatcher(str(root), lambda games: None)
+    assert watcher.poll() == []
+    assert watcher.poll() == []
+
+    _write_manifest(sdcard / "steamapps", 400, "Portal")
+    (config / "shortcuts.vdf").write_bytes(_shortcuts_vdf([
+        (-1234567890, "Heroes of Might and Magic III"), (-5, "S.T.A.L.K.E.R. (Shortcut)"),
+    ]))
+    assert sorted(watcher.poll()) == [("400", "Portal"), (str(2 ** 32 - 5), "S.T.A.L.K.E.R. (Shortcut)")]
+    assert watcher.poll() == []
+
+    os.utime(steamapps / "appmanifest_620.acf", ns=(1, 1))
+    (steamapps / "appmanifest_570.acf").write_text("half-written", encoding="utf-8")
+    assert sorted(watcher.poll()) == [("570", ""), ("620", "Portal 2")]
+
+
+@pytest.mark.asyncio
+async def test_library_watcher_wakes_on_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "LIBRARY_SETTLE_SECONDS", 0.05)
+    monkeypatch.setattr(main, "LIBRARY_POLL_INTERVAL", 0.05)
+    steamapps = tmp_path / "steamapps"
+    steamapps.mkdir()
+    reported = asyncio.Queue()
+
+    async def on_change(games):
+        await reported.put(games)
+
+    watcher = main.LibraryWatcher(str(tmp_path), on_change)
+    task = asyncio.create_task(watcher.run())
+    try:
+        while watcher.mode == "idle":
+            await asyncio.sleep(0.01)
+        assert watcher.mode in ("inotify", "polling")
+        _write_manifest(steamapps, 620, "Portal 2")
+        assert await asyncio.wait_for(reported.get(), 5) == [("620", "Portal 2")]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+KULI_DETAILS_PAGE = """
+<div class="page product-details-page"><div class="product-essential">
+  <table class="data-table">
+    <tr><td class="spec-name">Автори перекладу</td><td class="spec-value"><a href="/team/ua">UA Team</a>, Іван &amp; Ко</td></tr>
+    <tr><td class="spec-name">Дата оновлення перекладу</td><td class="spec-value">12.03.2025</td></tr>
+  </table>
+  <div class="item__instruction-main">
+    <p><strong>Версія перекладу:</strong> 1.4.2</p>
+    <p><b>Спосіб встановлення:</b> Інсталятор<br></p>
+    <a class="button" href="/download/portal-2-ua.zip">Завантажити українізатор</a>
+  </div>
+</div></div>
+"""
+
+
+@pytest.mark.asyncio
+async def test_kuli_translation_details_are_cached_with_status(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    events = []
+
+    async def fake_emit(event, *args):
+        events.append((event, *args))
+
+    monkeypatch.setattr(decky_stub, "emit", fake_emit, raising=False)
+    fake_http_get, requested = _fake_status_upstream("English", {"https://kuli.com.ua/portal-2": KULI_DETAILS_PAGE})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+
+    plugin = main.Plugin()
+    assert await plugin.get_translation_details("620") is None
+    await plugin.get_badge_status("620", "Portal 2")
+    await next(iter(plugin._status_tasks.values()))
+    details = {
+        "url": "https://kuli.com.ua/portal-2",
+        "authors": ["UA Team", "Іван", "Ко"],
+        "updated": "12.03.2025",
+        "version": "1.4.2",
+        "install": "Інсталятор",
+        "download_url": "https://kuli.com.ua/download/portal-2-ua.zip",
+    }
+    assert await plugin.get_translation_details("620") == details
+    assert len(requested) == 2
+    assert await main.Plugin().get_translation_details("620") == details
+
+    # Revalidation notices a new translation version even when the status stays COMMUNITY
+    cache = plugin._get_status_cache()
+    cache.entries["620"].resolved_at -= main.STATUS_FRESH_SECONDS + 1
+    updated = KULI_DETAILS_PAGE.replace("1.4.2", "1.5.0")
+    fake_http_get, _ = _fake_status_upstream("English", {"https://kuli.com.ua/portal-2": updated})
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    await plugin.get_badge_status("620", "Portal 2")
+    await next(iter(plugin._status_tasks.values()))
+    assert (await plugin.get_translation_details("620"))["version"] == "1.5.0"
+    assert len(events) == 2 and events[0] == events[1]
+
+
+KULI_FULL_PAGE = """<!DOCTYPE html>
+<html lang="uk"><head><title>Portal 2 — Kuli</title></head><body>
+<header class="header">
+  <nav class="header-menu">
+    <a href="/games">Ігри</a>
+    <a href="/app/download">Завантажити застосунок</a>
+    <span><strong>Версія:</strong> 3.2</span>
+  </nav>
+</header>
+<div class="page product-details-page"><div class="product-essential">
+  <h1>Portal 2</h1>
+  <table class="data-table">
+    <tr><td class="spec-name">Версія гри</td><td class="spec-value">2.0.0.1</td></tr>
+    <tr><td class="spec-name">Дата виходу</td><td class="spec-value">19.04.2011</td></tr>
+    <tr><td class="spec-name">Автори перекладу</td><td class="spec-value">UA Team</td></tr>
+  </table>
+  <div class="item__description"><a href="/files/screenshot.png">Download screenshot</a></div>
+  <div class="item__instruction-main">
+    <div class="item__instruction-header"><strong>Версія перекладу:</strong> 1.4.2</div>
+    <p><strong>Дата оновлення:</strong> 12.03.2025</p>
+    <div class="buttons"><a class="button" href="/download/portal-2-ua.zip">Завантажити українізатор</a></div>
+  </div>
+  <div class="related"><a href="/download/portal-ua.zip">Завантажити українізатор Portal</a></div>
+</div></div>
+<footer><a href="https://play.google.com/store/apps/details?id=ua.kuli">Download on Google Play</a></footer>
+</body></html>
+"""
+
+
+def test_kuli_details_ignore_page_chrome_and_game_rows():
+    assert main.parse_kuli_details(KULI_FULL_PAGE, "https://kuli.com.ua/portal-2") == {
+        "authors": ["UA Team"],
+        "version": "1.4.2",
+        "updated": "12.03.2025",
+        "download_url": "https://kuli.com.ua/download/portal-2-ua.zip",
+    }
+    # Without an instruction block there is no translation download to point at
+    bare = KULI_FULL_PAGE.replace("item__instruction-main", "item__notes")
+    assert "download_url" not in main.parse_kuli_details(bare, "https://kuli.com.ua/portal-2")
+
+
+def test_kuli_details_are_empty_for_bare_pages():
+    page = '<div class="product-details-page"><div class="item__instruction-main"></div></div>'
+    assert main.parse_kuli_details(page, "https://kuli.com.ua/x") == {}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_hint_is_budgeted_deduplicated_and_superseded(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    monkeypatch.setattr(main, "PREFETCH_HINT_BUDGET", 2)
+    release = asyncio.Event()
+    started = []
+
+    async def fake_http_get(url, headers=None):
+        if url.startswith("https://store.steampowered.com/api/appdetails"):
+            started.append(url.split("appids=")[1].split("&")[0])
+        await release.wait()
+        return None
+
+    monkeypatch.setattr(main, "http_get", fake_http_get)
+    plugin = main.Plugin()
+    plugin._get_status_cache().put("10", "OFFICIAL", None, "network")
+
+    assert await plugin.prefetch_hint(["10", "20", "20", "4000000000", "30", "40"]) == {"queued": ["20", "30"]}
+    await asyncio.sleep(0.01)
+    assert started == ["20"]
+
+    # The user moved on: the unwatched lookup for 20 is dropped along with 30
+    assert await plugin.prefetch_hint(["50"]) == {"queued": ["50"]}
+    await asyncio.sleep(0.01)
+    assert started == ["20", "50"] and "20" not in plugin._status_tasks
+
+    # A page opened on 50 keeps its lookup alive through the next hint
+    await plugin.get_badge_status("50", "", "page-50")
+    assert await plugin.prefetch_hint(["60"]) == {"queued": ["60"]}
+    await asyncio.sleep(0.01)
+    lookup = plugin._status_tasks["50"]
+    assert not lookup.done()
+    release.set()
+    await plugin._hint_task
+    assert started == ["20", "50", "60"]
+    assert lookup.done() and not lookup.cancelled()
+
+    # Hints that waited too long are dropped unseen
+    monkeypatch.setattr(main, "PREFETCH_HINT_MAX_AGE", -1)
+    assert await plugin.prefetch_hint(["70"]) == {"queued": ["70"]}
+    await plugin._hint_task
+    assert started == ["20", "50", "60"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_hint_lookups_are_cancelled_per_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    releases = {}
+
+    async def blocked_resolve(app_id, app_name="", with_kuli=True):
+        releases[app_id] = asyncio.Event()
+        await releases[app_id].wait()
+        return {"status": "NONE", "url": None, "name": "", "languages": None, "details": None, "complete": True}
+
+    async def no_seed(app_id):
+        return None
+
+    monkeypatch.setattr(main, "resolve_badge_status", blocked_resolve)
+    monkeypatch.setattr(decky_stub, "emit", lambda *args: asyncio.sleep(0), raising=False)
+    plugin = main.Plugin()
+    monkeypatch.setattr(plugin, "get_seed_status", no_seed)
+
+    # A page joins 20's lookup, so the next hint can't cancel it
+    await plugin.prefetch_hint(["20"])
+    await asyncio.sleep(0.01)
+    await plugin.get_badge_status("20", "", "page-20")
+    await plugin.prefetch_hint(["30"])
+    assert set(plugin._status_requests) == {"page-20"}
+    releases["20"].set()
+    await asyncio.sleep(0.01)
+
+    # 30 runs under its own request id, which only its own lookup releases
+    assert plugin._status_requests == {"hint:2:30": "30"}
+    lookup = plugin._status_tasks["30"]
+    await plugin.prefetch_hint(["40"])
+    await asyncio.gather(lookup, return_exceptions=True)
+    assert lookup.cancelled()
+    await asyncio.sleep(0.01)
+    assert plugin._status_requests == {"hint:3:40": "40"}
+    await plugin.prefetch_hint([])
+    await plugin._hint_task
+
+
+@pytest.mark.asyncio
+async def test_prefetch_hint_skips_seeded_apps_without_caching_them(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    plugin = main.Plugin()
+
+    async def fake_seed(app_id):
+        return {"status": "COMMUNITY", "slug": "portal-2", "url": "https://kuli.com.ua/portal-2"} if app_id == "620" else None
+
+    async def never_resolve(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(plugin, "get_seed_status", fake_seed)
+    monkeypatch.setattr(main, "resolve_badge_status", never_resolve)
+    assert await plugin.prefetch_hint(["620", "730"]) == {"queued": ["730"]}
+    cache = plugin._get_status_cache()
+    assert cache.peek("620") is None and not cache._dirty
+    await plugin.prefetch_hint([])
+
+
+@pytest.mark.asyncio
+async def test_data_saver_counts_bytes_and_gates_background_work(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    usage = main.DataUsage(str(tmp_path / "data_usage.json"))
+    monkeypatch.setattr(main, "_data_usage", usage)
+    monkeypatch.setattr(main, "_http_cache", main.HttpCache(str(tmp_path / "http"), ttl={}))
+    fetched = []
+
+    def fake_sync_get(url, headers=None, timeout=None):
+        fetched.append(url)
+        return "x" * 600
+
+    monkeypatch.setattr(main, "_sync_http_get", fake_sync_get)
+    plugin = main.Plugin()
+    plugin.settings = dict(main.DEFAULT_SETTINGS)
+    plugin.settings_file = str(tmp_path / "settings.json")
+
+    assert await main.http_get("https://kuli.com.ua/a") == "x" * 600
+    assert await main.http_get("https://store.steampowered.com/api/x") == "x" * 600
+    report = await plugin.get_data_usage()
+    assert report["today"] == {"kuli.com.ua": 600, "store.steampowered.com": 600}
+    assert report["used_today"] == 1200 and report["data_saver"] is False
+
+    # Data saver: background requests never reach the network
+    assert await plugin.set_settings("dataSaver", True)
+    assert await plugin.set_settings("dataSaverDailyMB", 1)
+    assert usage.saver and usage.daily_bytes == 1024 * 1024
+
+    async def background_get():
+        main.mark_background()
+        return await main.http_get("https://kuli.com.ua/b")
+
+    assert await asyncio.create_task(background_get()) is None
+    assert await main.http_get("https://kuli.com.ua/c") == "x" * 600
+    assert len(fetched) == 3
+
+    # ... and neither do hints or revalidation
+    assert await plugin.prefetch_hint(["620"]) == {"queued": []}
+    cache = plugin._get_status_cache()
+    cache.put("620", "NONE", None, "network")
+    cache.entries["620"].resolved_at -= main.STATUS_FRESH_SECONDS + 1
+    assert (await plugin.get_badge_status("620", "Portal 2"))["stale"] is True
+    assert not plugin._status_tasks
+
+    # Once today's budget is spent, foreground requests stop too
+    usage.record("https://kuli.com.ua/", 1024 * 1024)
+    assert await main.http_get("https://kuli.com.ua/d") is None
+    assert len(fetched) == 3
+
+    usage.flush()
+    reloaded = main.DataUsage(str(tmp_path / "data_usage.json"))
+    reloaded.record("https://kuli.com.ua/", 10)  # counted before the file is read
+    reloaded.load()
+    assert reloaded.used_today() == 1810 + 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_foreground_caller_promotes_a_background_lookup(tmp_path, monkeypatch):
+    monkeypatch.setattr(decky_stub, "DECKY_PLUGIN_SETTINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(main.os.path, "abspath", lambda _: str(tmp_path / "main.py"))
+    release = asyncio.Event()
+    seen = []
+
+    async def fake_resolve(app_id, app_name="", with_kuli=True):
+        seen.append(main.is_background())
+        await release.wait()
+        seen.append(main.is_background())
+        return {"status": "NONE", "url": None, "name": app_name, "languages": None, "details": None, "complete": True}
+
+    monkeypatch.setattr(main, "resolve_badge_status", fake_resolve)
+    plugin = main.Plugin()
+
+    async def library_change():
+        main.mark_background()
+        await plugin.get_badge_status("999999992", "Game")
+
+    await asyncio.create_task(library_change())
+    await asyncio.sleep(0)
+    await plugin.get_badge_status("999999992", "Game", "page-1")
+    release.set()
+    await plugin._status_tasks["999999992"]
+    assert seen == [True, False]
+    assert not main.is_background()
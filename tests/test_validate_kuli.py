@@ -0,0 +1,81 @@
+import importlib.util
+import json
+import types
+from pathlib import Path
+
+import pytest
+
+# validate_kuli talks to kuli through requests, which the plugin itself doesn't need
+pytest.importorskip("requests")
+
+spec = importlib.util.spec_from_file_location(
+    "validate_kuli", Path(__file__).resolve().parent.parent / "scripts" / "validate_kuli.py"
+)
+validate_kuli = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(validate_kuli)
+
+COMMUNITY_PAGE = '<html><body class="html-product-details-page"><div class="item__instruction-main"></div></body></html>'
+
+
+def test_resume_retries_failed_and_torn_records(tmp_path):
+    output = tmp_path / "kuli.jsonl"
+    records = [
+        {"game": "Hades", "status": "COMMUNITY", "url": "https://kuli.com.ua/hades", "note": None},
+        {"game": "ABZU", "status": None, "url": None, "note": "no search results"},
+        {"game": "Factorio", "status": None, "url": None, "note": "exception: Read timed out"},
+        {"game": "Neon Abyss", "status": None, "url": None, "note": "search HTTP 503"},
+    ]
+    lines = [json.dumps(r) for r in records] + ['{"game": "Disco Elys']
+    output.write_text("\n".join(lines), encoding="utf-8")
+
+    assert set(validate_kuli.read_done(str(output))) == {"Hades", "ABZU"}
+
+    # A retried title that succeeds later wins over its failed record
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("\n" + json.dumps({"game": "Factorio", "status": "OFFICIAL", "url": "https://kuli.com.ua/factorio"}) + "\n")
+    assert validate_kuli.read_done(str(output))["Factorio"]["status"] == "OFFICIAL"
+
+
+def test_cassette_replay_round_trip(tmp_path):
+    cassette_path = str(tmp_path / "kuli.cassette.gz")
+    pages = {"https://kuli.com.ua/hades": (200, COMMUNITY_PAGE)}
+    requested = []
+
+    def fake_get(url, timeout=None, headers=None):
+        requested.append(url)
+        status, body = pages.get(url, (404, "missing"))
+        return types.SimpleNamespace(status_code=status, text=body)
+
+    recorder = validate_kuli.Cassette(cassette_path, "record")
+    fetcher = validate_kuli.Fetcher(delay=0, cassette=recorder)
+    fetcher.session.get = fake_get
+    recorded = validate_kuli.run_checks(["Hades"], fetcher, workers=1, verbose=False)
+    recorder.close()
+    assert recorded["Hades"]["status"] == "COMMUNITY"
+
+    player = validate_kuli.Cassette(cassette_path, "replay")
+    replayed = validate_kuli.run_checks(
+        ["Hades", "Factorio"], validate_kuli.Fetcher(cassette=player), workers=2, verbose=False
+    )
+    assert replayed["Hades"]["status"] == recorded["Hades"]["status"]
+    assert replayed["Hades"]["url"] == "https://kuli.com.ua/hades"
+    assert len(requested) == 1 and player.hits == 1
+    assert replayed["Factorio"]["note"].startswith("not in cassette")
+    assert validate_kuli.lookup_failed(replayed["Factorio"])
+
+
+def test_cassette_keys_on_method_url_and_varying_headers(tmp_path):
+    cassette_path = str(tmp_path / "kuli.cassette.gz")
+    url = "https://kuli.com.ua/hades"
+    recorder = validate_kuli.Cassette(cassette_path, "record")
+    recorder.record("GET", url, {"Accept": "text/html", "User-Agent": "a"}, 200, "html")
+    recorder.record("GET", url, {"Accept": "application/json"}, 200, "json")
+    recorder.close()
+
+    player = validate_kuli.Cassette(cassette_path, "replay")
+    assert player.lookup("GET", url, {"Accept": "text/html", "User-Agent": "b"}) == (200, "html")
+    assert player.lookup("GET", url, {"accept": "application/json"}) == (200, "json")
+    with pytest.raises(validate_kuli.CassetteMiss):
+        player.lookup("HEAD", url, {"Accept": "text/html"})
+    with pytest.raises(validate_kuli.CassetteMiss):
+        player.lookup("GET", url)
@@ -8,20 +8,37 @@ const searchKuliMock = vi.fn();
 const fetchWithTimeoutMock = vi.fn();
 const isSteamAppIdMock = vi.fn();
 const callBackendMock = vi.fn();
+const eventListeners: Record<string, (...args: any[]) => void> = {};
 
 vi.mock("@decky/api", () => ({
   fetchNoCors: (...args: any[]) => fetchNoCorsMock(...args),
+  addEventListener: (event: string, listener: (...args: any[]) => void) => {
+    eventListeners[event] = listener;
+    return listener;
+  },
+  removeEventListener: (event: string) => {
+    delete eventListeners[event];
+  },
 }));
 
-vi.mock("../src/hooks/useSettings", () => ({
-  callBackend: (method: string, ...args: unknown[]) => callBackendMock(method, ...args),
-}));
+vi.mock("../src/hooks/useSettings", async () => {
+  const { BehaviorSubject } = await import("rxjs");
+  return {
+    bootstrap: async (...args: unknown[]) => {
+      const status = await callBackendMock("bootstrap", ...args);
+      return status === undefined ? undefined : { status };
+    },
+    cancelRequest: (...args: unknown[]) => callBackendMock("cancel", ...args),
+    SettingsContext: new BehaviorSubject({ targetLanguage: "ukrainian" }),
+  };
+});
 
 vi.mock("../src/utils", () => ({
   cleanNonSteamName: (...args: any[]) => cleanNonSteamNameMock(...args),
   searchKuli: (...args: any[]) => searchKuliMock(...args),
   fetchWithTimeout: (...args: any[]) => fetchWithTimeoutMock(...args),
   isSteamAppId: (...args: any[]) => isSteamAppIdMock(...args),
+  supportsLanguage: (languages: string, language: string) => languages.toLowerCase().includes(language),
 }));
 
 vi.mock("../src/logger", () => ({
@@ -35,6 +52,7 @@ vi.mock("../src/logger", () => ({
 }));
 
 import { useBadgeStatus } from "../src/hooks/useBadgeStatus";
+import { SettingsContext } from "../src/hooks/useSettings";
 
 function HookProbe(props: { appId?: string; appName?: string; onState: (s: any) => void }) {
   const state = useBadgeStatus(props.appId, props.appName);
@@ -75,6 +93,32 @@ describe("useBadgeStatus", () => {
     });
   });
 
+  it("answers other target languages from Steam alone", async () => {
+    SettingsContext.next({ targetLanguage: "polish" } as any);
+    isSteamAppIdMock.mockReturnValue(true);
+    fetchNoCorsMock.mockResolvedValue({});
+    fetchWithTimeoutMock.mockResolvedValue({
+      json: async () => ({
+        "124": {
+          success: true,
+          data: { name: "GameName", supported_languages: "English, Polish, Ukrainian" },
+        },
+      }),
+    });
+
+    let latest: any;
+    try {
+      render(React.createElement(HookProbe, { appId: "124", appName: "Game", onState: (s: any) => (latest = s) }));
+      await waitFor(() => {
+        expect(latest.loading).toBe(false);
+        expect(latest.status).toBe("OFFICIAL");
+      });
+      expect(searchKuliMock).not.toHaveBeenCalled();
+    } finally {
+      SettingsContext.next({ targetLanguage: "ukrainian" } as any);
+    }
+  });
+
   it("returns COMMUNITY with kuli url when steam is not official", async () => {
     isSteamAppIdMock.mockReturnValue(true);
     fetchNoCorsMock.mockResolvedValue({});
@@ -98,6 +142,56 @@ describe("useBadgeStatus", () => {
     });
   });
 
+  it("uses the backend status without fetching", async () => {
+    isSteamAppIdMock.mockReturnValue(true);
+    callBackendMock.mockResolvedValue({ app_id: "777", status: "COMMUNITY", url: "https://kuli.com.ua/seeded-game", pending: false });
+
+    let latest: any;
+    render(React.createElement(HookProbe, { appId: "777", appName: "Seeded", onState: (s: any) => (latest = s) }));
+
+    await waitFor(() => {
+      expect(latest.loading).toBe(false);
+      expect(latest.status).toBe("COMMUNITY");
+      expect(latest.url).toBe("https://kuli.com.ua/seeded-game");
+    });
+    expect(callBackendMock).toHaveBeenCalledWith("bootstrap", "777", "Seeded", expect.any(String));
+    expect(fetchWithTimeoutMock).not.toHaveBeenCalled();
+    expect(searchKuliMock).not.toHaveBeenCalled();
+  });
+
+  it("waits for a pushed badge_status event while the backend resolves", async () => {
+    isSteamAppIdMock.mockReturnValue(true);
+    callBackendMock.mockResolvedValue({ app_id: "888", status: null, url: null, pending: true });
+
+    let latest: any;
+    render(React.createElement(HookProbe, { appId: "888", appName: "Pending", onState: (s: any) => (latest = s) }));
+
+    await waitFor(() => expect(callBackendMock).toHaveBeenCalled());
+    expect(latest.loading).toBe(true);
+
+    eventListeners["badge_status"]({ app_id: "111", status: "OFFICIAL", url: null });
+    eventListeners["badge_status"]({ app_id: "888", status: "OFFICIAL", url: null });
+
+    await waitFor(() => {
+      expect(latest.loading).toBe(false);
+      expect(latest.status).toBe("OFFICIAL");
+    });
+    expect(fetchWithTimeoutMock).not.toHaveBeenCalled();
+  });
+
+  it("cancels its pending backend lookup on unmount", async () => {
+    isSteamAppIdMock.mockReturnValue(true);
+    callBackendMock.mockResolvedValue({ app_id: "555", status: null, url: null, pending: true });
+
+    const view = render(React.createElement(HookProbe, { appId: "555", appName: "Scrolled Past", onState: () => {} }));
+    await waitFor(() => expect(callBackendMock).toHaveBeenCalled());
+    const requestId = callBackendMock.mock.calls[0][3];
+    view.unmount();
+
+    await waitFor(() => expect(callBackendMock).toHaveBeenCalledWith("cancel", requestId));
+    expect(fetchWithTimeoutMock).not.toHaveBeenCalled();
+  });
+
   it("returns NONE on hard error path", async () => {
     isSteamAppIdMock.mockImplementation(() => {
       throw new Error("boom");
@@ -18,7 +18,7 @@ vi.mock("../src/logger", () => ({
   },
 }));
 
-import { loadSettings, useSettings, callBackend } from "../src/hooks/useSettings";
+import { loadSettings, useSettings, callBackend, VersionContext } from "../src/hooks/useSettings";
 
 function HookProbe(props: { onSnapshot: (v: any) => void }) {
   const state = useSettings();
@@ -40,16 +40,22 @@ describe("useSettings / loadSettings", () => {
 
   it("loadSettings populates values from backend", async () => {
     callMock.mockResolvedValueOnce({
-      badgeType: "default",
-      badgePosition: "top-left",
-      offsetX: 12,
-      offsetY: 34,
-      showOnStore: false,
-      storeOffsetX: 7,
-      storeOffsetY: 9,
+      settings: {
+        badgeType: "default",
+        badgePosition: "top-left",
+        offsetX: 12,
+        offsetY: 34,
+        showOnStore: false,
+        storeOffsetX: 7,
+        storeOffsetY: 9,
+      },
+      version: "1.6.5",
+      update: null,
+      status: null,
     });
 
     loadSettings();
+    expect(callMock).toHaveBeenCalledWith("bootstrap", "", "", "");
 
     const snapshots: any[] = [];
     render(React.createElement(HookProbe, { onSnapshot: (v: any) => snapshots.push(v) }));
@@ -61,17 +67,23 @@ describe("useSettings / loadSettings", () => {
       expect(last.settings.badgePosition).toBe("top-left");
       expect(last.settings.offsetX).toBe(12);
     });
+    expect(VersionContext.value.version).toBe("1.6.5");
   });
 
   it("setter updates local state and persists via set_settings", async () => {
     callMock.mockResolvedValueOnce({
-      badgeType: "full",
-      badgePosition: "top-right",
-      offsetX: 20,
-      offsetY: 90,
-      showOnStore: true,
-      storeOffsetX: 0,
-      storeOffsetY: 20,
+      settings: {
+        badgeType: "full",
+        badgePosition: "top-right",
+        offsetX: 20,
+        offsetY: 90,
+        showOnStore: true,
+        storeOffsetX: 0,
+        storeOffsetY: 20,
+      },
+      version: "1.6.5",
+      update: null,
+      status: null,
     });
 
     loadSettings();